@@ -0,0 +1,223 @@
+# benchmarks/asr_benchmark.py
+"""
+Offline ASR benchmark / regression harness.
+
+Runs a directory of 16 kHz mono WAV files through the same Vosk
+recognizer path the GUI uses (modules/speech_to_text_vosk.py) and
+reports real-time factor, per-utterance latency percentiles, word
+error rate and peak RSS.
+
+Corpus layout: every `name.wav` has its reference transcript in
+`name.txt` next to it.
+
+Usage:
+    python benchmarks/asr_benchmark.py path/to/corpus --mode batch
+    python benchmarks/asr_benchmark.py path/to/corpus --mode stream --chunk-ms 200
+    python benchmarks/asr_benchmark.py path/to/corpus --mode both --json report.json
+"""
+
+import os
+import re
+import time
+import wave
+import argparse
+
+from bench_utils import latency_summary, peak_rss_mb, write_report
+
+from modules import speech_to_text_vosk as stt
+
+
+# -----------------------------
+# CORPUS
+# -----------------------------
+def load_corpus(corpus_dir):
+    """
+    Returns a list of (name, pcm_bytes, duration_s, reference_text).
+    Files that are not 16 kHz mono int16 are skipped with a warning.
+    """
+    items = []
+    for fname in sorted(os.listdir(corpus_dir)):
+        if not fname.lower().endswith(".wav"):
+            continue
+        stem = os.path.splitext(fname)[0]
+        wav_path = os.path.join(corpus_dir, fname)
+        ref_path = os.path.join(corpus_dir, stem + ".txt")
+        if not os.path.exists(ref_path):
+            print(f"Skipping {fname}: no {stem}.txt reference")
+            continue
+
+        with wave.open(wav_path, "rb") as wf:
+            if (wf.getframerate() != stt.SAMPLE_RATE or wf.getnchannels() != 1
+                    or wf.getsampwidth() != 2):
+                print(f"Skipping {fname}: need {stt.SAMPLE_RATE} Hz mono 16-bit")
+                continue
+            frames = wf.getnframes()
+            pcm = wf.readframes(frames)
+
+        with open(ref_path, "r") as f:
+            reference = f.read()
+
+        items.append((stem, pcm, frames / stt.SAMPLE_RATE, reference))
+    return items
+
+
+# -----------------------------
+# WORD ERROR RATE
+# -----------------------------
+def normalize_words(text):
+    text = text.lower().replace("'", "")
+    return re.sub(r"[^a-z0-9 ]+", " ", text).split()
+
+
+def word_edit_distance(ref, hyp):
+    """
+    Levenshtein distance over word lists (substitution, insertion, deletion).
+    """
+    prev = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        cur = [i] + [0] * len(hyp)
+        for j, h in enumerate(hyp, 1):
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (r != h))
+        prev = cur
+    return prev[-1]
+
+
+# -----------------------------
+# FEEDING MODES
+# -----------------------------
+def run_batch(pcm):
+    """
+    Whole buffer at once, like the GUI after `sd.rec` returns.
+    Latency is the time from end-of-audio to transcript.
+    """
+    start = time.perf_counter()
+    text = stt.transcribe_bytes(pcm)
+    elapsed = time.perf_counter() - start
+    return text, elapsed, elapsed
+
+
+def run_stream(pcm, chunk_ms):
+    """
+    Chunked feeding, like a live microphone stream. Compute is spread
+    over the utterance; latency is only the work left after the last
+    chunk (final chunk + FinalResult).
+    """
+    chunk_bytes = int(stt.SAMPLE_RATE * chunk_ms / 1000) * 2
+    chunks = [pcm[i:i + chunk_bytes] for i in range(0, len(pcm), chunk_bytes)]
+    if not chunks:
+        chunks = [b""]
+
+    marks = {}
+
+    def feed():
+        for i, chunk in enumerate(chunks):
+            if i == len(chunks) - 1:
+                marks["tail"] = time.perf_counter()
+            yield chunk
+
+    start = time.perf_counter()
+    text = stt.transcribe_stream(feed())
+    end = time.perf_counter()
+    return text, end - start, end - marks["tail"]
+
+
+def benchmark(items, mode, chunk_ms):
+    per_utt = []
+    total_audio = 0.0
+    total_compute = 0.0
+    total_edits = 0
+    total_ref_words = 0
+    latencies = []
+
+    for name, pcm, duration, reference in items:
+        if mode == "batch":
+            text, compute, latency = run_batch(pcm)
+        else:
+            text, compute, latency = run_stream(pcm, chunk_ms)
+
+        ref_words = normalize_words(reference)
+        hyp_words = normalize_words(text)
+        edits = word_edit_distance(ref_words, hyp_words)
+
+        total_audio += duration
+        total_compute += compute
+        total_edits += edits
+        total_ref_words += len(ref_words)
+        latencies.append(latency)
+
+        per_utt.append({
+            "name": name,
+            "audio_s": round(duration, 3),
+            "compute_s": round(compute, 4),
+            "latency_ms": round(latency * 1000, 2),
+            "rtf": round(compute / duration, 4) if duration else 0.0,
+            "wer": round(edits / len(ref_words), 4) if ref_words else float(bool(hyp_words)),
+            "reference": reference.strip(),
+            "hypothesis": text,
+        })
+
+    return {
+        "mode": mode,
+        "chunk_ms": chunk_ms if mode == "stream" else None,
+        "utterances": len(items),
+        "audio_s": round(total_audio, 3),
+        "compute_s": round(total_compute, 3),
+        "rtf": round(total_compute / total_audio, 4) if total_audio else 0.0,
+        "wer": round(total_edits / total_ref_words, 4) if total_ref_words else 0.0,
+        "latency": latency_summary(latencies),
+        "per_utterance": per_utt,
+    }
+
+
+def print_summary(result):
+    lat = result["latency"]
+    print(f"[{result['mode']}] {result['utterances']} utterances, "
+          f"{result['audio_s']:.1f}s audio")
+    print(f"  RTF: {result['rtf']:.3f}   WER: {result['wer'] * 100:.2f}%")
+    print(f"  latency p50 {lat['p50_ms']:.1f} ms  p95 {lat['p95_ms']:.1f} ms  "
+          f"max {lat['max_ms']:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline Vosk ASR benchmark")
+    parser.add_argument("corpus", help="directory of .wav files with matching .txt references")
+    parser.add_argument("--mode", choices=["batch", "stream", "both"], default="both")
+    parser.add_argument("--chunk-ms", type=int, default=200,
+                        help="chunk size for streaming mode (default 200 ms)")
+    parser.add_argument("--json", dest="json_path",
+                        help="write the full report as JSON ('-' for stdout)")
+    parser.add_argument("--max-wer", type=float,
+                        help="exit non-zero if WER exceeds this (regression gate)")
+    args = parser.parse_args()
+
+    items = load_corpus(args.corpus)
+    if not items:
+        raise SystemExit(f"No usable WAV/TXT pairs in {args.corpus}")
+
+    start = time.perf_counter()
+    stt.load_model()
+    model_load_s = time.perf_counter() - start
+
+    modes = ["batch", "stream"] if args.mode == "both" else [args.mode]
+    results = [benchmark(items, mode, args.chunk_ms) for mode in modes]
+
+    report = {
+        "corpus": os.path.abspath(args.corpus),
+        "model_load_s": round(model_load_s, 3),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "results": results,
+    }
+
+    print(f"Model load: {model_load_s:.2f}s   Peak RSS: {report['peak_rss_mb']:.1f} MB")
+    for result in results:
+        print_summary(result)
+
+    if args.json_path:
+        write_report(report, args.json_path)
+
+    if args.max_wer is not None and any(r["wer"] > args.max_wer for r in results):
+        raise SystemExit(f"WER regression: above {args.max_wer}")
+
+
+if __name__ == "__main__":
+    main()
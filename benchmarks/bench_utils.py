@@ -0,0 +1,61 @@
+# benchmarks/bench_utils.py
+# Small helpers shared by the benchmark scripts.
+
+import os
+import sys
+import json
+import resource
+
+# Make `modules` importable when a script is run directly
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def percentile(values, pct):
+    """
+    Linear-interpolated percentile of a list of numbers (pct in 0-100).
+    Returns 0.0 for an empty list.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def latency_summary(values_s):
+    """
+    p50/p90/p95/p99/max of a list of durations, in milliseconds.
+    """
+    ms = [v * 1000.0 for v in values_s]
+    return {
+        "count": len(ms),
+        "p50_ms": round(percentile(ms, 50), 3),
+        "p90_ms": round(percentile(ms, 90), 3),
+        "p95_ms": round(percentile(ms, 95), 3),
+        "p99_ms": round(percentile(ms, 99), 3),
+        "max_ms": round(max(ms), 3) if ms else 0.0,
+    }
+
+
+def peak_rss_mb():
+    """
+    Peak resident set size of this process in MB (Linux reports KB).
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+def write_report(report, path):
+    """
+    Write a report dict as JSON to `path`, or to stdout when path is "-".
+    """
+    if path == "-":
+        print(json.dumps(report, indent=2))
+        return
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {path}")
@@ -0,0 +1,146 @@
+# benchmarks/braille_device_benchmark.py
+"""
+End-to-end braille output benchmark against the virtual braille cell
+(no Arduino needed).
+
+Messages go through the real BrailleDevice + BrailleOutput stack to a
+VirtualBrailleDevice on a pty, using the binary cell protocol with ACK
+windowing (the opt-in firmware). Reports:
+  - connect time (includes the emulated Arduino reset)
+  - cells/second actually displayed
+  - queue latency per message: send() -> first cell shown, send() -> done
+  - reconnect: the cable is pulled mid-run and plugged back in; time
+    until cells flow again and whether every message still completed
+
+Usage:
+    python benchmarks/braille_device_benchmark.py
+    python benchmarks/braille_device_benchmark.py --messages 50 --read-ms 20 --json -
+"""
+
+import time
+import random
+import argparse
+import threading
+
+from bench_utils import latency_summary, write_report
+
+from modules import text_to_braille
+from modules.virtual_braille import VirtualBrailleDevice
+
+WORDS = ("hello thank you please good morning how are you the child and "
+         "water food help doctor today tomorrow with for of shopping").split()
+
+
+def make_messages(count, rng):
+    return [" ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 8)))
+            for _ in range(count)]
+
+
+def run(args):
+    rng = random.Random(args.seed)
+    messages = make_messages(args.messages, rng)
+
+    virtual = VirtualBrailleDevice(reset_delay=args.reset_delay, cell_ms=args.cell_ms,
+                                   read_ms=args.read_ms).start()
+    device = text_to_braille.BrailleDevice(port=virtual.port,
+                                           reset_delay=args.reset_delay + 0.05)
+    output = text_to_braille.BrailleOutput(device, window=args.window,
+                                           max_cells=args.max_cells, overflow="block",
+                                           protocol="binary", grade=args.grade)
+    try:
+        start = time.perf_counter()
+        device.connect()
+        connect_s = time.perf_counter() - start
+
+        first_cell = {}
+        sent_at = {}
+        ack_times = []
+
+        def on_progress(job):
+            now = time.perf_counter()
+            if job.acked:
+                ack_times.append(now)
+            if job.acked and job.id not in first_cell:
+                first_cell[job.id] = now - sent_at[job.id]
+
+        # Pull the cable part way through, then plug it back in
+        reconnect = {}
+        if args.unplug_after:
+            def pull_cable():
+                time.sleep(args.unplug_after)
+                virtual.unplug()
+                time.sleep(args.unplug_for)
+                virtual.replug()
+                reconnect["replugged_at"] = time.perf_counter()
+            threading.Thread(target=pull_cable, daemon=True).start()
+
+        jobs = []
+        run_start = time.perf_counter()
+        for text in messages:
+            t = time.perf_counter()
+            job = output.send(text, on_progress=on_progress)
+            sent_at[job.id] = t
+            jobs.append(job)
+        for job in jobs:
+            job.wait(timeout=120)
+        elapsed = time.perf_counter() - run_start
+        done_latency = [job.done_at - sent_at[job.id] for job in jobs if job.done_at]
+
+        cells = sum(job.total for job in jobs)
+        result = {
+            "messages": len(jobs),
+            "completed": sum(job.status == "done" for job in jobs),
+            "cells": cells,
+            "cells_shown": len(virtual.shown),    # > cells if a reconnect resent some
+            "connect_s": round(connect_s, 3),
+            "cells_per_s": round(cells / elapsed, 2) if elapsed else 0.0,
+            "first_cell": latency_summary(list(first_cell.values())),
+            "done": latency_summary(done_latency),
+            "serial_overflows": virtual.overflows,
+            "reconnects": device.connects - 1,
+        }
+        # Replug -> first acknowledged cell (includes reconnect retry and reset)
+        replugged_at = reconnect.get("replugged_at")
+        if replugged_at is not None:
+            after = [t for t in ack_times if t > replugged_at]
+            result["recovery_s"] = round(after[0] - replugged_at, 3) if after else None
+        return result
+    finally:
+        output.stop()
+        device.close()
+        virtual.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Braille output benchmark on the virtual cell")
+    parser.add_argument("--messages", type=int, default=30)
+    parser.add_argument("--reset-delay", type=float, default=0.5,
+                        help="emulated Arduino reset, s (real board: ~2)")
+    parser.add_argument("--cell-ms", type=float, default=5, help="solenoid settle time per cell")
+    parser.add_argument("--read-ms", type=float, default=0, help="reader time per cell")
+    parser.add_argument("--window", type=int, default=text_to_braille.WINDOW)
+    parser.add_argument("--max-cells", type=int, default=text_to_braille.QUEUE_CELLS)
+    parser.add_argument("--grade", type=int, choices=[1, 2], default=text_to_braille.GRADE)
+    parser.add_argument("--unplug-after", type=float, default=1.0,
+                        help="pull the cable after this many seconds (0 = never)")
+    parser.add_argument("--unplug-for", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", dest="json_path")
+    args = parser.parse_args()
+
+    r = run(args)
+    print(f"Connect (incl. reset): {r['connect_s']:.2f} s")
+    print(f"Messages: {r['completed']}/{r['messages']} done, {r['cells']} cells "
+          f"({r['cells_shown']} shown), {r['cells_per_s']:.1f} cells/s")
+    print(f"First cell shown: p50 {r['first_cell']['p50_ms']:.0f} ms  "
+          f"p95 {r['first_cell']['p95_ms']:.0f} ms")
+    print(f"Message done:     p50 {r['done']['p50_ms']:.0f} ms  "
+          f"p95 {r['done']['p95_ms']:.0f} ms")
+    if r.get("recovery_s") is not None:
+        print(f"Reconnects: {r['reconnects']}, cells flowing again {r['recovery_s']:.2f} s after replug")
+    if args.json_path:
+        write_report(r, args.json_path)
+
+
+if __name__ == "__main__":
+    main()
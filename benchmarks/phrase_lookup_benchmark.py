@@ -0,0 +1,114 @@
+# benchmarks/phrase_lookup_benchmark.py
+"""
+Fuzzy phrase lookup benchmark.
+
+Builds the phrase index from ISL_Gifs/, then pads it with synthetic
+phrases to show how best_match() lookup time grows with the phrase
+list. Queries are real phrases with one recognizer-style spelling slip;
+accuracy is the share mapped back to the right phrase.
+
+On a desktop CPU, going from the ~90 real phrases to 10k: p50 about
+80 -> 140 us, p95 about 0.35 -> 0.75 ms, accuracy 0.99 -> 0.98. The
+max is 1-3 ms, from the first lookup of a word (uncached spelling
+candidates). Expect several times that on a Pi.
+
+Usage:
+    python benchmarks/phrase_lookup_benchmark.py
+    python benchmarks/phrase_lookup_benchmark.py --sizes 100 1000 10000 --json -
+"""
+
+import time
+import random
+import argparse
+
+from bench_utils import latency_summary, write_report
+
+from modules.phrase_index import PhraseIndex
+
+
+def noisy(phrase, rng):
+    """Recognizer-style slip: drop, double or swap one letter of one word"""
+    words = phrase.split()
+    i = rng.randrange(len(words))
+    w = words[i]
+    if len(w) >= 4:
+        j = rng.randrange(1, len(w) - 1)
+        op = rng.choice(["drop", "double", "swap"])
+        if op == "drop":
+            w = w[:j] + w[j + 1:]
+        elif op == "double":
+            w = w[:j] + w[j] + w[j:]
+        else:
+            w = w[:j - 1] + w[j] + w[j - 1] + w[j + 1:]
+    words[i] = w
+    return " ".join(words)
+
+
+def synthetic_word(rng):
+    return "".join(rng.choice("bcdfghklmnprstvz") + rng.choice("aeiou")
+                   for _ in range(rng.randint(2, 4)))
+
+
+def run(size, queries, vocab, rng):
+    """
+    Grow the index to `size` phrases. New phrases mix real words with
+    new made-up ones, so the vocabulary grows too, like adding GIFs.
+    """
+    index = PhraseIndex()
+    build_start = time.perf_counter()
+    while len(index) < size:
+        words = [rng.choice(vocab) if rng.random() < 0.6 else synthetic_word(rng)
+                 for _ in range(rng.randint(1, 6))]
+        index.add(" ".join(words), None)
+    build_s = time.perf_counter() - build_start
+
+    timings = []
+    hits = 0
+    for original, query in queries:
+        start = time.perf_counter()
+        key, score = index.best_match(query)
+        timings.append(time.perf_counter() - start)
+        hits += key == original
+
+    return {
+        "phrases": len(index),
+        "vocabulary": len(index.words),
+        "build_s": round(build_s, 3),
+        "queries": len(queries),
+        "accuracy": round(hits / len(queries), 4),
+        "lookup": latency_summary(timings),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fuzzy phrase lookup benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[0, 500, 1000, 5000, 10000])
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", dest="json_path")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    base = PhraseIndex()
+    real_phrases = sorted(base.phrases)
+    vocab = sorted(base.words)
+    queries = []
+    for _ in range(args.queries):
+        phrase = rng.choice(real_phrases)
+        queries.append((phrase, noisy(phrase, rng)))
+
+    results = []
+    print(f"{'phrases':>8} {'vocab':>6} {'acc':>6} {'p50 us':>8} {'p95 us':>8} {'max us':>8}")
+    for size in args.sizes:
+        r = run(max(size, len(real_phrases)), queries, vocab, random.Random(args.seed))
+        results.append(r)
+        lat = r["lookup"]
+        print(f"{r['phrases']:>8} {r['vocabulary']:>6} {r['accuracy']:>6.2f} "
+              f"{lat['p50_ms'] * 1000:>8.1f} {lat['p95_ms'] * 1000:>8.1f} {lat['max_ms'] * 1000:>8.1f}")
+
+    if args.json_path:
+        write_report({"queries": args.queries, "results": results}, args.json_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+# benchmarks/service_load_benchmark.py
+"""
+Load test for the headless service (modules/service.py) over loopback.
+
+Starts the service in this process on a free port (or targets a running
+one with --url) and drives it with concurrent keep-alive clients:
+
+  http    POST /sign/plan with rotating sentences (the phrase index, no
+          hardware) from --clients connections for --seconds
+  health  GET /health, the bare request/response overhead
+  stream  --ws-clients subscribers on /ws/sign?frames=1, fed by the
+          synthetic sign pipeline: frame and prediction rate per client
+          and prediction latency (frame captured -> message received)
+
+Reports requests/s and p50/p95/p99 latency per scenario. The local
+service writes its session history and traces to a temporary directory
+(removed afterwards), so a run never rotates the real
+output/history.jsonl away. With --url the target service's own logs
+are used.
+
+Usage:
+    python benchmarks/service_load_benchmark.py
+    python benchmarks/service_load_benchmark.py --clients 16 --seconds 20 --json -
+    python benchmarks/service_load_benchmark.py --url http://127.0.0.1:8765 --scenarios http
+"""
+
+import os
+import json
+import time
+import base64
+import asyncio
+import argparse
+import tempfile
+import threading
+from urllib.parse import urlsplit
+
+from bench_utils import latency_summary, peak_rss_mb, write_report
+
+# Every request records history and a trace: keep them out of output/.
+# Set before the modules are imported, which read the paths once.
+SCRATCH = tempfile.TemporaryDirectory(prefix="bridge-service-bench-")
+os.environ.setdefault("BRIDGE_HISTORY_PATH", os.path.join(SCRATCH.name, "history.jsonl"))
+os.environ.setdefault("BRIDGE_TRACE_PATH", os.path.join(SCRATCH.name, "traces.jsonl"))
+
+from modules import service
+
+SENTENCES = [
+    "good morning how are you",
+    "thank you",
+    "what is your name",
+    "i am going to the market tomorrow",
+    "please help me",
+    "nice to meet you",
+]
+
+
+def start_local_service(synthetic_ms):
+    """Run a Service on its own event loop thread; returns (host, port)"""
+    ready = threading.Event()
+    address = {}
+
+    def run():
+        async def serve():
+            svc = await service.Service(port=0,
+                                        sign_options={"synthetic_ms": synthetic_ms}).start()
+            address["host"], address["port"] = svc.host, svc.port
+            ready.set()
+            await asyncio.Event().wait()
+        asyncio.run(serve())
+
+    threading.Thread(target=run, name="service", daemon=True).start()
+    if not ready.wait(10):
+        raise RuntimeError("service did not start")
+    return address["host"], address["port"]
+
+
+# -----------------------------
+# HTTP CLIENT
+# -----------------------------
+async def http_request(reader, writer, method, path, payload=None):
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write((f"{method} {path} HTTP/1.1\r\nHost: bench\r\n"
+                  f"Content-Type: application/json\r\n"
+                  f"Content-Length: {len(body)}\r\n\r\n").encode() + body)
+    await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split()[1])
+    length = next(int(l.split(":", 1)[1]) for l in lines[1:]
+                  if l.lower().startswith("content-length"))
+    return status, await reader.readexactly(length)
+
+
+async def http_client(host, port, method, path, make_payload, end, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    n = 0
+    try:
+        while time.perf_counter() < end:
+            started = time.perf_counter()
+            status, _ = await http_request(reader, writer, method, path, make_payload(n))
+            latencies.append(time.perf_counter() - started)
+            if status != 200:
+                errors.append(status)
+            n += 1
+    finally:
+        writer.close()
+
+
+async def run_http(host, port, args, method, path, make_payload):
+    latencies, errors = [], []
+    # One request first so index building is not counted
+    reader, writer = await asyncio.open_connection(host, port)
+    await http_request(reader, writer, method, path, make_payload(0))
+    writer.close()
+
+    started = time.perf_counter()
+    end = started + args.seconds
+    await asyncio.gather(*(http_client(host, port, method, path, make_payload, end,
+                                       latencies, errors) for _ in range(args.clients)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "requests_per_s": round(len(latencies) / elapsed, 1),
+        "latency": latency_summary(latencies),
+    }
+
+
+# -----------------------------
+# WEBSOCKET CLIENT
+# -----------------------------
+async def ws_client(host, port, path, start, end, stats):
+    """Subscribe now; count what arrives between start and end"""
+    reader, writer = await asyncio.open_connection(host, port)
+    key = base64.b64encode(os.urandom(16)).decode()
+    writer.write((f"GET {path} HTTP/1.1\r\nHost: bench\r\nUpgrade: websocket\r\n"
+                  f"Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\n"
+                  f"Sec-WebSocket-Version: 13\r\n\r\n").encode())
+    await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    if b" 101 " not in head.split(b"\r\n")[0]:
+        raise RuntimeError(f"upgrade refused: {head[:60]!r}")
+    try:
+        while True:
+            remaining = end - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                opcode, payload = await asyncio.wait_for(
+                    service.ws_read_frame(reader, max_size=1 << 24), remaining)
+            except asyncio.TimeoutError:
+                break
+            if time.perf_counter() < start and opcode != service.OP_CLOSE:
+                continue
+            if opcode == service.OP_BINARY:
+                stats["frames"] += 1
+                stats["frame_bytes"] += len(payload)
+            elif opcode == service.OP_TEXT:
+                message = json.loads(payload)
+                if message.get("type") == "prediction":
+                    stats["predictions"] += 1
+                    stats["latency_s"].append(message["latency_ms"] / 1000)
+            elif opcode == service.OP_CLOSE:
+                break
+        writer.write(service.ws_frame(service.OP_CLOSE, b"\x03\xe8", mask=True))
+        await writer.drain()
+    finally:
+        writer.close()
+
+
+async def run_stream(host, port, args):
+    stats = {"frames": 0, "frame_bytes": 0, "predictions": 0, "latency_s": []}
+    # The pipeline child spawns on the first subscriber: let it warm up
+    start = time.perf_counter() + args.warmup
+    end = start + args.seconds
+    await asyncio.gather(*(ws_client(host, port, "/ws/sign?frames=1", start, end, stats)
+                           for _ in range(args.ws_clients)))
+    clients = max(1, args.ws_clients)
+    return {
+        "clients": args.ws_clients,
+        "frames_per_s_per_client": round(stats["frames"] / args.seconds / clients, 1),
+        "frame_kb": round(stats["frame_bytes"] / max(1, stats["frames"]) / 1024, 1),
+        "predictions": stats["predictions"],
+        "prediction_latency": latency_summary(stats["latency_s"]),
+    }
+
+
+async def run_all(host, port, args):
+    results = {}
+    for name in args.scenarios:
+        if name == "http":
+            results[name] = await run_http(host, port, args, "POST", "/sign/plan",
+                                           lambda n: {"text": SENTENCES[n % len(SENTENCES)]})
+        elif name == "health":
+            results[name] = await run_http(host, port, args, "GET", "/health", lambda n: None)
+        elif name == "stream":
+            results[name] = await run_stream(host, port, args)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Loopback load test of the BRIDGE service")
+    parser.add_argument("--url", help="target a running service instead of starting one")
+    parser.add_argument("--scenarios", nargs="+", default=["health", "http", "stream"],
+                        choices=["health", "http", "stream"])
+    parser.add_argument("--clients", type=int, default=8, help="concurrent HTTP connections")
+    parser.add_argument("--ws-clients", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--warmup", type=float, default=3.0,
+                        help="seconds the sign pipeline gets to start before measuring")
+    parser.add_argument("--synthetic-ms", type=float, default=30.0,
+                        help="per-frame work of the synthetic sign model")
+    parser.add_argument("--json", help="write the report here ('-' for stdout)")
+    args = parser.parse_args()
+
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or service.PORT
+    else:
+        host, port = start_local_service(args.synthetic_ms)
+
+    results = asyncio.run(run_all(host, port, args))
+    report = {"config": vars(args), "results": results, "peak_rss_mb": round(peak_rss_mb(), 1)}
+
+    for name, result in results.items():
+        if name == "stream":
+            lat = result["prediction_latency"]
+            print(f"{name:7s} {result['clients']} clients  "
+                  f"{result['frames_per_s_per_client']:5.1f} frames/s each "
+                  f"({result['frame_kb']} KB)  {result['predictions']} predictions  "
+                  f"latency p50 {lat['p50_ms']:.1f} ms  p95 {lat['p95_ms']:.1f} ms")
+        else:
+            lat = result["latency"]
+            print(f"{name:7s} {result['requests_per_s']:8.1f} req/s  "
+                  f"p50 {lat['p50_ms']:6.2f} ms  p95 {lat['p95_ms']:6.2f} ms  "
+                  f"p99 {lat['p99_ms']:6.2f} ms  errors {result['errors']}")
+
+    if args.json:
+        write_report(report, args.json)
+
+
+if __name__ == "__main__":
+    main()
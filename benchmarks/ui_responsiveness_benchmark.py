@@ -0,0 +1,158 @@
+# benchmarks/ui_responsiveness_benchmark.py
+"""
+How much the sign recognition pipeline slows the GUI thread, with the
+pipeline on a thread in the same process vs in a child process
+(modules/sign_process).
+
+A stand-in for the Tk main loop ticks every --tick-ms and, like the
+Sign → Text page, pulls the newest frame from the ring and shrinks it
+for the preview every --preview-ms. Tick lateness is what a touch
+would wait for. Without --camera the pipeline uses generated frames and
+a pure-Python model that holds the GIL for --infer-ms per frame.
+
+Modes:
+  idle     no pipeline (baseline)
+  thread   pipeline thread inside this process
+  process  pipeline in a supervised child process
+
+--crash-test also kills the child once and reports how long the
+supervisor took to get frames flowing again.
+
+Usage:
+    python benchmarks/ui_responsiveness_benchmark.py
+    python benchmarks/ui_responsiveness_benchmark.py --infer-ms 60 --seconds 20 --json -
+    python benchmarks/ui_responsiveness_benchmark.py --camera --modes thread process
+"""
+
+import time
+import argparse
+import threading
+
+from bench_utils import latency_summary, write_report
+
+from modules import sign_process
+
+
+def ui_loop(pipeline, seconds, tick_ms, preview_ms):
+    """Tick like Tk's after() and read preview frames; returns lateness list (s)"""
+    lateness = []
+    previews = 0
+    last_seq = -1
+    tick = tick_ms / 1000
+    next_tick = time.perf_counter() + tick
+    next_preview = time.perf_counter()
+    end = time.perf_counter() + seconds
+    while next_tick < end:
+        delay = next_tick - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        now = time.perf_counter()
+        lateness.append(max(0.0, now - next_tick))
+        next_tick += tick
+        if pipeline is not None and now >= next_preview:
+            next_preview = now + preview_ms / 1000
+            seq, frame = pipeline.latest_frame(last_seq)
+            if frame is not None:
+                last_seq = seq
+                # What the GUI does before handing the frame to PIL
+                frame[::2, ::2, ::-1].copy()
+                previews += 1
+    return lateness, previews
+
+
+def run_mode(name, args):
+    options = dict(fps=args.fps, synthetic_ms=0 if args.camera else args.infer_ms)
+    pipeline = None
+    if name == "thread":
+        pipeline = sign_process.SignThread(**options).start()
+    elif name == "process":
+        pipeline = sign_process.SignProcess(**options).start()
+    try:
+        if pipeline is not None:
+            time.sleep(args.warmup)
+        lateness, previews = ui_loop(pipeline, args.seconds, args.tick_ms, args.preview_ms)
+    finally:
+        metrics = pipeline.last_metrics if pipeline is not None else None
+        if pipeline is not None:
+            pipeline.stop()
+
+    result = {
+        "tick_lateness": latency_summary(lateness),
+        "ticks_over_16ms": sum(1 for v in lateness if v > 0.016),
+        "preview_fps": round(previews / args.seconds, 1),
+    }
+    if metrics:
+        result["pipeline_fps"] = metrics["fps"]
+        result["infer_ms"] = metrics["infer_ms"]
+    return result
+
+
+def crash_test(args):
+    """Kill the child once; time from its death to the next new frame"""
+    events = {}
+    restarted = threading.Event()
+
+    def on_state(state, detail):
+        if state == "restarting" and "died_at" not in events:
+            events["died_at"] = time.perf_counter()
+            restarted.set()
+
+    pipeline = sign_process.SignProcess(fps=args.fps,
+                                        synthetic_ms=0 if args.camera else args.infer_ms,
+                                        on_state=on_state).start()
+    try:
+        time.sleep(args.warmup)
+        seq_before = pipeline.ring.latest_seq()
+        pipeline.proc.kill()
+        if not restarted.wait(10):
+            return {"recovered": False}
+        while pipeline.ring.latest_seq() <= seq_before:
+            if time.perf_counter() - events["died_at"] > 30:
+                return {"recovered": False}
+            time.sleep(0.005)
+        return {
+            "recovered": True,
+            "recovery_s": round(time.perf_counter() - events["died_at"], 3),
+            "restarts": pipeline.restarts,
+        }
+    finally:
+        pipeline.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GUI responsiveness with the sign pipeline "
+                                                 "in a thread vs a child process")
+    parser.add_argument("--modes", nargs="+", default=["idle", "thread", "process"],
+                        choices=["idle", "thread", "process"])
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--warmup", type=float, default=2.0,
+                        help="seconds to let the pipeline start before measuring")
+    parser.add_argument("--fps", type=int, default=sign_process.CAMERA_FPS)
+    parser.add_argument("--infer-ms", type=float, default=40.0,
+                        help="GIL-holding work per frame of the synthetic model")
+    parser.add_argument("--camera", action="store_true",
+                        help="use the real camera and sign model instead")
+    parser.add_argument("--tick-ms", type=float, default=10.0)
+    parser.add_argument("--preview-ms", type=float, default=66.0)
+    parser.add_argument("--crash-test", action="store_true")
+    parser.add_argument("--json", help="write the report here ('-' for stdout)")
+    args = parser.parse_args()
+
+    report = {"config": vars(args), "modes": {}}
+    for name in args.modes:
+        result = report["modes"][name] = run_mode(name, args)
+        lat = result["tick_lateness"]
+        print(f"{name:8s} tick lateness p50 {lat['p50_ms']:6.2f} ms  p95 {lat['p95_ms']:6.2f} ms  "
+              f"p99 {lat['p99_ms']:6.2f} ms  max {lat['max_ms']:6.1f} ms  "
+              f">16ms {result['ticks_over_16ms']:4d}  preview {result['preview_fps']:4.1f} fps")
+
+    if args.crash_test:
+        report["crash_test"] = crash_test(args)
+        print(f"crash test: {report['crash_test']}")
+
+    if args.json:
+        write_report(report, args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,16 +5,38 @@ Designed for Raspberry Pi 4 touchscreen (800x480)
 """
 
 import tkinter as tk
-from tkinter import Canvas, Label, Frame, Text, Entry, Button, Scrollbar
+from tkinter import Canvas, Label, Frame, Text, Entry, Button, Scrollbar, Listbox
 from PIL import Image, ImageTk
-import pygame
 import os
 import sys
 import threading
+import time
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from modules import startup
+from modules import metrics
+from modules import resource_scheduler
+from modules import tracing
+from modules import history
+from modules.sign_player import SignPlaybackSurface
+from modules import tasks
+from gui.page_manager import PageManager
+from gui.ui_queue import UIQueue
+
+timeline = startup.get_timeline()
+timeline.mark("imports")
+
+# Playback speeds the Speed button cycles through
+SIGN_SPEEDS = (1.0, 1.5, 2.0, 0.5)
+
+# Sign → Text camera preview refresh (ms)
+SIGN_PREVIEW_MS = 66
+
+# Metrics overlay refresh (ms)
+METRICS_OVERLAY_MS = 1000
+
 
 class BRIDGEApp:
     """Main application class for BRIDGE accessibility system"""
@@ -26,37 +48,172 @@ class BRIDGEApp:
         self.root.resizable(False, False)
         self.root.configure(bg="#FADDEA")
         
-        # Initialize pygame for audio (optional - won't crash if audio unavailable)
-        try:
-            pygame.mixer.init()
-        except Exception as e:
-            print(f"Audio initialization warning: {e}")
-        
+        # Audio and mascot images are loaded by the warm-up after the home
+        # screen is up; until then clicks are silent and the mascot is blank
         self.click_sound = None
-        self.load_click_sound()
         
         # Asset paths
         self.assets_dir = os.path.join(os.path.dirname(__file__), "assets")
         
-        # Load mascot images
         self.mascot_normal = None
         self.mascot_smile = None
         self.mascot_wink = None
-        self.load_mascot_images()
+        self.mascot_label = None
         
-        # Current page tracker
+        # Current page tracker; pages are built once and cached
         self.current_page = None
+        self.pages = PageManager(self.root)
+        
+        # Feature tasks run on the shared executor (one handle per feature,
+        # device slots decide what may run side by side); worker threads
+        # update widgets only through the UI queue
+        self.tasks = tasks.get_executor()
+        self.ui = UIQueue(self.root)
         
-        # Running module tracker (prevents double execution)
-        self.module_running = False
-        self.stop_speech_to_sign = False  # Flag to stop speech to sign loop
+        # Per-stage metrics overlay: F11 toggles it (and metrics recording)
+        self.metrics_label = Label(self.root, text="", font=("Courier", 8), bg="#333",
+                                   fg="#7CFC00", justify=tk.LEFT, anchor="nw", padx=4)
+        self.metrics_job = None
+        self.root.bind_all("<F11>", lambda event: self.toggle_metrics_overlay())
+        if metrics.enabled():
+            metrics.enable()
+            self.toggle_metrics_overlay()
         
-        # Show home screen
-        self.show_home_screen()
+        # Show home screen first; everything heavy waits for the warm-up
+        with timeline.span("home_screen"):
+            self.show_home_screen()
+        self.root.after_idle(self.on_interactive)
+    
+    def toggle_metrics_overlay(self):
+        """Show/hide the metrics overlay; metrics are recorded only while it is shown"""
+        if self.metrics_job is not None:
+            self.root.after_cancel(self.metrics_job)
+            self.metrics_job = None
+            self.metrics_label.place_forget()
+            if not os.environ.get("BRIDGE_METRICS"):
+                metrics.disable()
+            return
+        metrics.enable()
+        self.metrics_label.place(relx=1.0, rely=0.0, anchor="ne")
+        self.refresh_metrics_overlay()
+    
+    def refresh_metrics_overlay(self):
+        snap = metrics.snapshot()
+        lines = ["stage           p50     p95   n"]
+        stages = snap["stages"]
+        for name in list(metrics.STAGES) + sorted(set(stages) - set(metrics.STAGES)):
+            stage = stages.get(name)
+            if stage and "p50_ms" in stage:
+                lines.append(f"{name:14s}{stage['p50_ms']:6.1f}{stage['p95_ms']:8.1f}"
+                             f"{stage['count']:5d}")
+        gauges = snap["gauges"]
+        if "cpu_temp_c" in gauges:
+            lines.append(f"cpu {gauges['cpu_temp_c']:.1f}°C  load {gauges.get('load_1m', 0):.2f}")
+        if "rss_mb" in gauges:
+            lines.append(f"rss {gauges['rss_mb']} MB  free {gauges.get('mem_available_mb', 0)} MB")
+        queues = [f"{name} {value}" for name, value in sorted(gauges.items())
+                  if name.endswith(("_queue", "_cells", "_fps"))]
+        if queues:
+            lines.append("  ".join(queues))
+        for name, value in sorted(snap["counters"].items()):
+            lines.append(f"{name}: {value}")
+        self.metrics_label.config(text="\n".join(lines))
+        self.metrics_label.lift()
+        self.metrics_job = self.root.after(METRICS_OVERLAY_MS, self.refresh_metrics_overlay)
+    
+    def on_interactive(self):
+        """First idle moment after the home screen is drawn"""
+        timeline.mark("interactive")
+        # Thermal/load budget for the camera, ASR and animation
+        resource_scheduler.get_scheduler().start()
+        self.start_warm_up()
+    
+    def start_warm_up(self):
+        """Load the heavy subsystems in the background, most urgent first"""
+        warm_up = startup.WarmUp(timeline)
+        # What the home screen needs, then the features in order of how
+        # soon a user can reach them
+        warm_up.add("mascot", self.prepare_mascot_images, priority=0)
+        warm_up.add("history", self.load_history, priority=1)
+        warm_up.add("audio", self.init_audio, priority=1)
+        warm_up.add("microphone", self.probe_microphone, priority=2)
+        warm_up.add("letters", self.preload_letters, priority=3)
+        warm_up.add("vosk", self.load_vosk, priority=4)
+        warm_up.add("tts", self.start_tts, priority=5)
+        # Includes the Arduino's ~2 s reset wait
+        warm_up.add("braille", self.connect_braille, priority=6)
+        warm_up.add("sign_model", self.load_sign_model, priority=7)
+        
+        handle = self.tasks.submit("warm_up", warm_up.run)
+        handle.add_done_callback(lambda h: self.write_startup_report())
+    
+    def write_startup_report(self):
+        try:
+            report = timeline.write()
+            print(f"Startup: interactive after {report['time_to_interactive_ms']:.0f} ms, "
+                  f"warm after {report['warm_up_done_ms']:.0f} ms")
+        except Exception as e:
+            print(f"Startup report warning: {e}")
+    
+    def init_audio(self):
+        """Initialize pygame for audio (optional - won't crash if audio unavailable)"""
+        try:
+            import pygame
+            pygame.mixer.init()
+        except Exception as e:
+            print(f"Audio initialization warning: {e}")
+            return
+        self.load_click_sound()
+    
+    def load_history(self):
+        """Start the history writer and read back the recent entries"""
+        history.get_history().loaded.wait(5)
+    
+    def load_vosk(self):
+        """Load the shared Vosk model used by every speech feature"""
+        from modules import speech_to_text_vosk as stt
+        stt.load_model()
+    
+    def start_tts(self):
+        """Start the TTS engine so the first Speak is not an engine start"""
+        from modules import text_to_speech
+        text_to_speech.get_worker().ready.wait(10)
+    
+    def load_sign_model(self):
+        """Unpickle the sign classifier and import MediaPipe (in-process mode only)"""
+        from modules import sign_process
+        if sign_process.mode() == "thread":
+            from modules import sign_to_text
+            sign_to_text.load()
+    
+    def probe_microphone(self):
+        """Pick and persist the input device used by all speech features"""
+        try:
+            from modules import audio_input
+            audio_input.get_manager().select_device()
+        except Exception as e:
+            print(f"Microphone probe warning: {e}")
+    
+    def connect_braille(self):
+        """Open the long-lived braille connection (auto-detected port)"""
+        try:
+            from modules import text_to_braille
+            text_to_braille.get_device().connect()
+        except Exception as e:
+            print(f"Braille device warning: {e}")
+    
+    def preload_letters(self):
+        """Fill the letter atlas so spelling never waits on disk"""
+        try:
+            from modules import sign_player
+            sign_player.get_atlas().load()
+        except Exception as e:
+            print(f"Letter preload warning: {e}")
     
     def load_click_sound(self):
         """Load button click sound"""
         try:
+            import pygame
             sound_path = os.path.join(os.path.dirname(__file__), "assets", "click.wav")
             if os.path.exists(sound_path):
                 self.click_sound = pygame.mixer.Sound(sound_path)
@@ -73,42 +230,41 @@ class BRIDGEApp:
             # Silently fail if audio not available
             pass
     
-    def load_mascot_images(self):
-        """Load and resize mascot images"""
+    def prepare_mascot_images(self):
+        """Load and resize mascot images (warm-up thread; PIL only)"""
+        images = {}
         try:
-            normal_path = os.path.join(self.assets_dir, "mascot_normal.png")
-            smile_path = os.path.join(self.assets_dir, "mascot_smile.png")
-            wink_path = os.path.join(self.assets_dir, "mascot_wink.png")
-            
-            if os.path.exists(normal_path):
-                img = Image.open(normal_path)
-                img = img.resize((300, 300), Image.Resampling.LANCZOS)
-                self.mascot_normal = ImageTk.PhotoImage(img)
-            
-            if os.path.exists(smile_path):
-                img = Image.open(smile_path)
-                img = img.resize((300, 300), Image.Resampling.LANCZOS)
-                self.mascot_smile = ImageTk.PhotoImage(img)
-            
-            if os.path.exists(wink_path):
-                img = Image.open(wink_path)
-                img = img.resize((300, 300), Image.Resampling.LANCZOS)
-                self.mascot_wink = ImageTk.PhotoImage(img)
+            for mood in ("normal", "smile", "wink"):
+                path = os.path.join(self.assets_dir, f"mascot_{mood}.png")
+                if os.path.exists(path):
+                    img = Image.open(path)
+                    images[mood] = img.resize((300, 300), Image.Resampling.LANCZOS)
         except Exception as e:
             print(f"Could not load mascot images: {e}")
+        # PhotoImages belong to the Tk thread
+        self.ui.call(self.install_mascot_images, images)
     
-    def clear_screen(self):
-        """Clear all widgets from the screen"""
-        for widget in self.root.winfo_children():
-            widget.destroy()
+    def install_mascot_images(self, images):
+        """Turn the resized mascots into PhotoImages and show Rubi"""
+        if "normal" in images:
+            self.mascot_normal = ImageTk.PhotoImage(images["normal"])
+        if "smile" in images:
+            self.mascot_smile = ImageTk.PhotoImage(images["smile"])
+        if "wink" in images:
+            self.mascot_wink = ImageTk.PhotoImage(images["wink"])
+        if self.mascot_label is not None and self.mascot_normal:
+            self.mascot_label.config(image=self.mascot_normal)
+        timeline.mark("mascot_shown")
     
     def show_home_screen(self):
         """Display the main home screen with mascot and buttons"""
-        self.clear_screen()
         self.current_page = "home"
-        
+        self.pages.show("home", self.build_home_screen)
+    
+    def build_home_screen(self, page_frame):
+        """Build the home screen (first visit only)"""
         # Main container
-        main_frame = Frame(self.root, bg="#FADDEA")
+        main_frame = Frame(page_frame, bg="#FADDEA")
         main_frame.pack(fill=tk.BOTH, expand=True)
         
         # Left side - Mascot
@@ -129,6 +285,7 @@ class BRIDGEApp:
         # Mascot label with animation
         mascot_label = Label(left_frame, bg="#FADDEA", image=self.mascot_normal)
         mascot_label.pack(expand=True)
+        self.mascot_label = mascot_label
         
         # Mascot animation bindings
         def on_mascot_enter(event):
@@ -169,18 +326,23 @@ class BRIDGEApp:
             ("Text → Braille", self.open_text_to_braille),
             ("Speech → Text", self.open_speech_to_text),
             ("Text → Speech", self.open_text_to_speech),
-            ("User Profile", self.open_profile)
         ]
         
         # Create buttons
         for text, command in buttons:
             btn = self.create_rounded_button(right_frame, text, command)
             btn.pack(pady=5)
+        
+        # History and User Profile share the last row to fit the 480 px screen
+        last_row = Frame(right_frame, bg="#FADDEA")
+        last_row.pack(pady=5)
+        for text, command in [("History", self.open_history), ("User Profile", self.open_profile)]:
+            btn = self.create_rounded_button(last_row, text, command, width=150)
+            btn.pack(side=tk.LEFT, padx=5)
     
-    def create_rounded_button(self, parent, text, command):
+    def create_rounded_button(self, parent, text, command, width=320):
         """Create a rounded button using Canvas"""
         # Button dimensions
-        width = 320
         height = 45
         
         # Create canvas for button
@@ -216,7 +378,8 @@ class BRIDGEApp:
         # Initial button
         rect = draw_rounded_rect(canvas, 5, 5, width-5, height-5, 20, "#FF9ECF")
         text_id = canvas.create_text(width//2, height//2, text=text, 
-                                     font=("Arial", 12, "bold"), fill="white")
+                                     font=("Arial", 12, "bold"), fill="white",
+                                     tags="label")
         
         # Hover effects
         def on_enter(event):
@@ -243,11 +406,20 @@ class BRIDGEApp:
         return canvas
     
     def create_tool_page(self, title, content_frame_setup=None):
-        """Create a generic tool page with back button and content area"""
-        self.clear_screen()
+        """
+        Show the tool page for self.current_page: a generic page with back
+        button and content area, built on the first visit and raised from
+        the page cache after that.
+        """
+        def build(page_frame):
+            self.build_tool_page(page_frame, title, content_frame_setup)
         
+        return self.pages.show(self.current_page, build)
+    
+    def build_tool_page(self, page_frame, title, content_frame_setup=None):
+        """Build a generic tool page with back button and content area"""
         # Main container
-        main_frame = Frame(self.root, bg="#FADDEA")
+        main_frame = Frame(page_frame, bg="#FADDEA")
         main_frame.pack(fill=tk.BOTH, expand=True)
         
         # Header with back button
@@ -274,43 +446,151 @@ class BRIDGEApp:
         
         return content_frame
     
+    def create_sign_surface(self, parent, controls):
+        """
+        Embed the page's sign playback surface, plus a Speed button in
+        `controls` that cycles SIGN_SPEEDS.
+        """
+        surface = SignPlaybackSurface(parent, speed=SIGN_SPEEDS[0])
+        
+        def cycle_speed():
+            speed = SIGN_SPEEDS[(SIGN_SPEEDS.index(surface.speed) + 1) % len(SIGN_SPEEDS)]
+            surface.set_speed(speed)
+            speed_btn.itemconfig("label", text=f"Speed {speed:g}x")
+        
+        speed_btn = self.create_rounded_button(controls, f"Speed {surface.speed:g}x",
+                                               cycle_speed, width=120)
+        speed_btn.pack(side=tk.LEFT, padx=5)
+        return surface
+    
     def open_sign_to_text(self):
-        """Open Sign to Text module page - runs in separate OpenCV window"""
+        """
+        Open Sign to Text module page. The camera pipeline runs in a
+        child process and its frames are previewed here; with
+        BRIDGE_SIGN_MODE=thread it runs in-process in an OpenCV window.
+        """
         self.current_page = "sign_to_text"
         
         def setup_content(content_frame):
-            info_label = Label(content_frame, 
-                             text="Sign to Text Converter\n\nPress 'Start Camera' to begin.\nPress 'Q' in the camera window to stop.",
+            from modules import sign_process
+            opencv_window = sign_process.mode() == "thread"
+            
+            if opencv_window:
+                info_text = ("Sign to Text Converter\n\nPress 'Start Camera' to begin.\n"
+                             "Press 'Q' in the camera window to stop.")
+            else:
+                info_text = "Sign to Text Converter - press 'Start Camera' to begin."
+            info_label = Label(content_frame, text=info_text,
                              font=("Arial", 14), bg="#FADDEA", fg="#333",
                              justify=tk.CENTER)
-            info_label.pack(pady=30)
+            info_label.pack(pady=30 if opencv_window else 2)
+            
+            button_frame = Frame(content_frame, bg="#FADDEA")
+            button_frame.pack(pady=2)
+            
+            # Half-size camera preview and the recognized sign
+            preview_label = Label(content_frame, bg="#FADDEA")
+            prediction_label = Label(content_frame, text="", font=("Arial", 20, "bold"),
+                                     bg="#FADDEA", fg="#FF1493")
+            if not opencv_window:
+                preview_label.pack()
+                prediction_label.pack()
             
             status_label = Label(content_frame, text="Status: Ready", 
                                font=("Arial", 12), bg="#FADDEA", fg="#666")
-            status_label.pack(pady=10)
+            status_label.pack(pady=10 if opencv_window else 2)
+            
+            # Touched only on the Tk thread
+            preview = {"pipeline": None, "seq": -1}
+            
+            def refresh_preview():
+                pipeline = preview["pipeline"]
+                if pipeline is None:
+                    return
+                seq, frame = pipeline.latest_frame(preview["seq"])
+                if frame is not None:
+                    preview["seq"] = seq
+                    photo = ImageTk.PhotoImage(Image.fromarray(frame[::2, ::2, ::-1].copy()))
+                    preview_label.config(image=photo)
+                    preview_label.image = photo
+                self.root.after(SIGN_PREVIEW_MS, refresh_preview)
+            
+            def show_preview(pipeline):
+                preview["pipeline"] = pipeline
+                preview["seq"] = -1
+                if pipeline is not None:
+                    refresh_preview()
+            
+            def on_state(state, detail):
+                if state == "restarting":
+                    self.ui.config(status_label, text="Status: Camera crashed, restarting...")
+                elif state == "running":
+                    self.ui.config(status_label, text="Status: Camera Running")
+            
+            def on_prediction(message):
+                self.ui.config(prediction_label, text=message["label"] or "")
+                if message["new_sign"]:
+                    history.record("sign", message["label"], src="sign_to_text")
+                trace = message["trace"]
+                self.ui.call(lambda: trace.step("display").finish())
+            
+            def run_pipeline(handle):
+                pipeline = sign_process.SignProcess(on_prediction=on_prediction,
+                                                    on_state=on_state)
+                pipeline.start()
+                self.ui.call(show_preview, pipeline)
+                try:
+                    while not handle.sleep(0.2):
+                        if pipeline.state == "failed":
+                            raise RuntimeError(pipeline.last_error or "camera keeps crashing")
+                finally:
+                    # Detach the preview on the Tk thread before the ring is unmapped
+                    detached = threading.Event()
+                    self.ui.call(show_preview, None)
+                    self.ui.call(detached.set)
+                    detached.wait(1.0)
+                    pipeline.stop()
+            
+            def run_in_process(handle):
+                from modules import sign_to_text
+                sign_to_text.run(should_stop=handle.cancelled)
             
             def start_module():
-                if self.module_running:
+                if self.tasks.running("sign_to_text"):
                     status_label.config(text="Already running! Please wait...")
                     return
                 
-                self.module_running = True
-                status_label.config(text="Status: Camera Running (Press Q to stop)")
+                if opencv_window:
+                    status_label.config(text="Status: Camera Running (Press Q to stop)")
+                else:
+                    status_label.config(text="Status: Starting camera...")
                 
-                def run_thread():
-                    try:
-                        from modules import sign_to_text
-                        sign_to_text.run()
-                    except Exception as e:
-                        status_label.config(text=f"Error: {str(e)[:50]}")
-                    finally:
-                        self.module_running = False
-                        status_label.config(text="Status: Camera Stopped")
+                def finished(handle):
+                    if handle.error is not None:
+                        self.ui.config(status_label, text=f"Error: {str(handle.error)[:50]}")
+                    else:
+                        self.ui.config(status_label, text="Status: Camera Stopped")
+                    self.ui.config(prediction_label, text="")
                 
-                threading.Thread(target=run_thread, daemon=True).start()
+                handle = self.tasks.submit("sign_to_text",
+                                           run_in_process if opencv_window else run_pipeline,
+                                           devices=("camera",))
+                handle.add_done_callback(finished)
             
-            start_btn = self.create_rounded_button(content_frame, "Start Camera", start_module)
-            start_btn.pack(pady=10)
+            def stop_module():
+                if self.tasks.running("sign_to_text"):
+                    self.tasks.cancel("sign_to_text")
+                    status_label.config(text="Status: Stopping...")
+            
+            start_btn = self.create_rounded_button(button_frame, "Start Camera", start_module,
+                                                   width=240)
+            start_btn.pack(side=tk.LEFT, padx=5)
+            
+            stop_btn = self.create_rounded_button(button_frame, "Stop", stop_module, width=240)
+            stop_btn.pack(side=tk.LEFT, padx=5)
+            
+            # The camera is released when the user leaves the page
+            self.pages.add_hooks(on_hide=stop_module)
         
         self.create_tool_page("Sign → Text", setup_content)
     
@@ -319,78 +599,63 @@ class BRIDGEApp:
         self.current_page = "speech_to_sign"
         
         def setup_content(content_frame):
-            info_label = Label(content_frame,
-                             text="Speech to Sign Language\n\nClick 'Start Listening' and speak.\nClick 'Stop' to exit.",
-                             font=("Arial", 14), bg="#FADDEA", fg="#333",
-                             justify=tk.CENTER)
-            info_label.pack(pady=30)
+            button_frame = Frame(content_frame, bg="#FADDEA")
+            button_frame.pack(pady=2)
             
-            status_label = Label(content_frame, text="Status: Ready", 
+            status_label = Label(content_frame,
+                               text="Status: Ready - click 'Start Listening' and speak",
                                font=("Arial", 12), bg="#FADDEA", fg="#666")
-            status_label.pack(pady=10)
-            
-            button_frame = Frame(content_frame, bg="#FADDEA")
-            button_frame.pack(pady=10)
+            status_label.pack(pady=2)
             
             def start_module():
-                if self.module_running:
+                if self.tasks.running("speech_to_sign"):
                     status_label.config(text="Already running! Please wait...")
                     return
                 
-                self.module_running = True
-                self.stop_speech_to_sign = False
                 status_label.config(text="Status: Listening... (Say 'goodbye' or click Stop)")
                 
-                def run_thread():
+                def run_task(handle):
+                    mic = None
                     try:
-                        # Import the function components directly
-                        import numpy as np
-                        import matplotlib.pyplot as plt
-                        import cv2
-                        from PIL import Image, ImageTk
-                        from itertools import count
-                        import tkinter as tk
                         import string
                         import json
-                        import sounddevice as sd
-                        from vosk import Model, KaldiRecognizer
+                        from modules import phrase_index
+                        from modules import audio_input
+                        from modules import speech_to_text_vosk as stt
                         
-                        # Load Vosk model
-                        vosk_model_path = os.path.join(
-                            os.path.dirname(os.path.dirname(__file__)),
-                            "models", "vosk-model"
-                        )
-                        vosk_model = Model(vosk_model_path)
-                        recognizer = KaldiRecognizer(vosk_model, 16000)
+                        # Shared Vosk model
+                        recognizer = stt.new_recognizer()
                         
-                        # Record audio function
-                        def record_audio(seconds=4, samplerate=16000):
-                            print("Listening...")
-                            audio = sd.rec(int(seconds * samplerate), samplerate=samplerate,
-                                         channels=1, dtype='int16')
-                            sd.wait()
-                            return audio.tobytes()
+                        # Keep one subscription on the shared mic stream for the
+                        # whole session so no audio is lost between chunks
+                        mic = audio_input.get_manager().subscribe("speech_to_sign")
                         
-                        # GIF list
-                        isl_gif = ['any questions', 'are you angry', 'are you busy', 'are you hungry', 
-                                  'hello', 'thank you', 'please', 'sorry', 'good morning', 'good night']
+                        def record_audio():
+                            # Longer chunks (fewer decodes) when the Pi runs hot
+                            return mic.record(resource_scheduler.current_budget().asr_chunk_s)
                         
-                        arr = list(string.ascii_lowercase)
+                        index = phrase_index.get_index()
                         
-                        # Main loop with stop flag
-                        while not self.stop_speech_to_sign:
+                        # Main loop until the task is cancelled
+                        while not handle.cancelled():
+                            trace = tracing.start("speech_to_sign")
                             try:
                                 data = record_audio()
+                                trace.step("capture")
                                 
-                                if self.stop_speech_to_sign:
+                                if handle.cancelled():
                                     break
                                 
-                                if recognizer.AcceptWaveform(data):
+                                t0 = metrics.clock()
+                                final = recognizer.AcceptWaveform(data)
+                                if final:
                                     result = json.loads(recognizer.Result())
                                     a = result.get("text", "")
                                 else:
                                     result = json.loads(recognizer.PartialResult())
                                     a = result.get("partial", "")
+                                metrics.record_since("vosk_decode", t0)
+                                trace.step("recognize")
                                 
                                 a = a.lower()
                                 print("You Said:", a)
@@ -400,89 +665,59 @@ class BRIDGEApp:
                                 
                                 if a in ["goodbye", "good bye", "bye"]:
                                     print("Exiting...")
-                                    status_label.config(text="Status: Stopped (goodbye)")
-                                    break
+                                    trace.finish("goodbye")
+                                    return "goodbye"
                                 
-                                # Show GIF or letters
-                                if a in isl_gif:
-                                    class ImageLabel(tk.Label):
-                                        def load(self, im):
-                                            if isinstance(im, str):
-                                                im = Image.open(im)
-                                            self.frames = []
-                                            try:
-                                                for i in count(1):
-                                                    self.frames.append(ImageTk.PhotoImage(im.copy()))
-                                                    im.seek(i)
-                                            except EOFError:
-                                                pass
-                                            self.delay = im.info.get('duration', 100)
-                                            if len(self.frames) == 1:
-                                                self.config(image=self.frames[0])
-                                            else:
-                                                self.next_frame()
-                                        
-                                        def next_frame(self):
-                                            if self.frames:
-                                                self.loc = (getattr(self, 'loc', 0) + 1) % len(self.frames)
-                                                self.config(image=self.frames[self.loc])
-                                                self.after(self.delay, self.next_frame)
-                                    
-                                    root = tk.Toplevel()
-                                    root.title(f"Sign: {a}")
-                                    lbl = ImageLabel(root)
-                                    lbl.pack()
-                                    
-                                    gif_path = os.path.join(
-                                        os.path.dirname(os.path.dirname(__file__)),
-                                        "ISL_Gifs", f"{a}.gif"
-                                    )
-                                    
-                                    if os.path.exists(gif_path):
-                                        lbl.load(gif_path)
-                                else:
-                                    for ch in a:
-                                        if ch in arr:
-                                            img_path = os.path.join(
-                                                os.path.dirname(os.path.dirname(__file__)),
-                                                "letters", f"{ch}.jpg"
-                                            )
-                                            if os.path.exists(img_path):
-                                                img = Image.open(img_path)
-                                                img_np = np.asarray(img)
-                                                plt.imshow(img_np)
-                                                plt.draw()
-                                                plt.pause(0.8)
+                                # Partials repeat as the utterance grows: only
+                                # the final result goes into the history
+                                if final:
+                                    history.record("speech", a, src="speech_to_sign")
+                                # Phrase GIFs + spelled-out remainder, queued
+                                # behind whatever is still playing
+                                plan = index.plan(a)
+                                trace.step("lookup")
+                                surface.submit(plan, trace=trace)
                             
                             except Exception as e:
                                 print("Error:", e)
-                                if self.stop_speech_to_sign:
+                                trace.finish("failed")
+                                if handle.cancelled():
                                     break
-                            
-                            plt.close()
-                        
-                    except Exception as e:
-                        status_label.config(text=f"Error: {str(e)[:50]}")
-                        print(f"Full error: {e}")
                     finally:
-                        self.module_running = False
-                        self.stop_speech_to_sign = False
-                        status_label.config(text="Status: Stopped")
+                        if mic is not None:
+                            mic.close()
+                
+                def finished(handle):
+                    if handle.error is not None:
+                        self.ui.config(status_label, text=f"Error: {str(handle.error)[:50]}")
+                    elif handle.result == "goodbye":
+                        self.ui.config(status_label, text="Status: Stopped (goodbye)")
+                    else:
+                        self.ui.config(status_label, text="Status: Stopped")
                 
-                threading.Thread(target=run_thread, daemon=True).start()
+                handle = self.tasks.submit("speech_to_sign", run_task, devices=("mic",))
+                handle.add_done_callback(finished)
             
             def stop_module():
-                if self.module_running:
-                    self.stop_speech_to_sign = True
+                surface.clear()
+                if self.tasks.running("speech_to_sign"):
+                    self.tasks.cancel("speech_to_sign")
                     status_label.config(text="Status: Stopping...")
                 else:
                     status_label.config(text="Nothing is running")
             
-            start_btn = self.create_rounded_button(button_frame, "Start Listening", start_module)
+            start_btn = self.create_rounded_button(button_frame, "Start Listening", start_module,
+                                                   width=240)
             start_btn.pack(side=tk.LEFT, padx=5)
             
-            stop_btn = self.create_rounded_button(button_frame, "Stop", stop_module)
+            stop_btn = self.create_rounded_button(button_frame, "Stop", stop_module, width=240)
             stop_btn.pack(side=tk.LEFT, padx=5)
+            
+            surface = self.create_sign_surface(content_frame, button_frame)
+            surface.pack(pady=2)
+            
+            # Leaving the page stops listening and playback
+            self.pages.add_hooks(on_hide=stop_module)
         
         self.create_tool_page("Speech → Sign", setup_content)
     
@@ -491,133 +726,60 @@ class BRIDGEApp:
         self.current_page = "text_to_sign"
         
         def setup_content(content_frame):
-            info_label = Label(content_frame,
-                             text="Text to Sign Language\n\nType text below and click 'Show Sign'",
-                             font=("Arial", 14), bg="#FADDEA", fg="#333",
-                             justify=tk.CENTER)
-            info_label.pack(pady=20)
-            
-            # Text input
+            # Text input, Show Sign and Speed on one row
             input_frame = Frame(content_frame, bg="#FADDEA")
-            input_frame.pack(pady=10)
+            input_frame.pack(pady=2)
             
-            text_entry = Entry(input_frame, font=("Arial", 14), width=40)
-            text_entry.pack(pady=5)
+            text_entry = Entry(input_frame, font=("Arial", 14), width=26)
+            text_entry.pack(side=tk.LEFT, padx=5)
             
-            status_label = Label(content_frame, text="", 
+            status_label = Label(content_frame, text="Type text and click 'Show Sign'",
                                font=("Arial", 11), bg="#FADDEA", fg="#666")
-            status_label.pack(pady=5)
             
-            def show_sign():
-                if self.module_running:
-                    status_label.config(text="Already showing signs! Please wait...")
+            def report_when_done():
+                if not surface.wait_idle(0):
+                    content_frame.after(200, report_when_done)
                     return
-                
+                from modules import frame_cache
+                stats = frame_cache.get_cache().stats()
+                status_label.config(text=f"Done! (cache: {stats['hits']} hits, "
+                                         f"{stats['misses']} misses, "
+                                         f"{stats['bytes'] // (1024 * 1024)} MB)")
+            
+            def show_sign():
                 text = text_entry.get().strip()
                 if not text:
                     status_label.config(text="Please enter some text!")
                     return
                 
-                self.module_running = True
-                status_label.config(text=f"Showing signs for: {text}")
-                
-                # Run sign display in thread
-                def run_thread():
-                    try:
-                        import string
-                        from PIL import Image, ImageTk
-                        import numpy as np
-                        import matplotlib
-                        matplotlib.use('TkAgg')  # Use TkAgg backend
-                        import matplotlib.pyplot as plt
-                        from itertools import count
-                        
-                        text_lower = text.lower()
-                        
-                        # Check if it's a full phrase GIF
-                        isl_gif_list = ['any questions', 'are you angry', 'are you busy', 'are you hungry', 
-                                       'are you sick', 'be careful', 'hello', 'thank you', 'please', 
-                                       'sorry', 'good morning', 'good night', 'good afternoon', 
-                                       'good evening', 'yes', 'no']
-                        
-                        if text_lower in isl_gif_list:
-                            # Show GIF in separate window
-                            gif_path = os.path.join(
-                                os.path.dirname(os.path.dirname(__file__)),
-                                "ISL_Gifs",
-                                f"{text_lower}.gif"
-                            )
-                            
-                            if os.path.exists(gif_path):
-                                class ImageLabel(tk.Label):
-                                    def load(self, im):
-                                        if isinstance(im, str):
-                                            im = Image.open(im)
-                                        self.frames = []
-                                        try:
-                                            for i in count(1):
-                                                self.frames.append(ImageTk.PhotoImage(im.copy()))
-                                                im.seek(i)
-                                        except EOFError:
-                                            pass
-                                        self.delay = im.info.get('duration', 100)
-                                        if len(self.frames) == 1:
-                                            self.config(image=self.frames[0])
-                                        else:
-                                            self.next_frame()
-                                    
-                                    def next_frame(self):
-                                        if self.frames:
-                                            self.loc = (getattr(self, 'loc', 0) + 1) % len(self.frames)
-                                            self.config(image=self.frames[self.loc])
-                                            self.after(self.delay, self.next_frame)
-                                
-                                win = tk.Toplevel()
-                                win.title(f"Sign: {text}")
-                                lbl = ImageLabel(win)
-                                lbl.pack()
-                                lbl.load(gif_path)
-                                status_label.config(text="Showing GIF...")
-                            else:
-                                status_label.config(text=f"GIF not found: {text_lower}.gif")
-                        else:
-                            # Show letter by letter using matplotlib
-                            for ch in text_lower:
-                                if ch == ' ':
-                                    continue  # Skip spaces
-                                if ch in string.ascii_lowercase:
-                                    img_path = os.path.join(
-                                        os.path.dirname(os.path.dirname(__file__)),
-                                        "letters",
-                                        f"{ch}.jpg"
-                                    )
-                                    
-                                    if os.path.exists(img_path):
-                                        img = Image.open(img_path)
-                                        img_np = np.asarray(img)
-                                        
-                                        plt.figure(figsize=(6, 6))
-                                        plt.imshow(img_np)
-                                        plt.axis('off')
-                                        plt.title(f"Letter: {ch.upper()}", fontsize=16)
-                                        plt.tight_layout()
-                                        plt.show(block=False)
-                                        plt.pause(1.5)
-                                        plt.close()
-                                    else:
-                                        print(f"Letter image not found: {ch}.jpg")
-                        
-                        status_label.config(text="Done!")
-                    except Exception as e:
-                        status_label.config(text=f"Error: {str(e)[:50]}")
-                        print(f"Full error: {e}")
-                    finally:
-                        self.module_running = False
-                
-                threading.Thread(target=run_thread, daemon=True).start()
+                trace = tracing.start("text_to_sign")
+                try:
+                    from modules import phrase_index
+                    
+                    # Longest-match phrase GIFs, letters for the rest;
+                    # a new sentence replaces whatever is still playing
+                    plan = phrase_index.get_index().plan(text)
+                    trace.step("lookup")
+                    phrases = [item.text for item in plan if item.kind == "phrase"]
+                    status_label.config(text=f"Showing: {', '.join(phrases)}" if phrases
+                                        else f"Spelling: {text}")
+                    surface.submit(plan, replace=True, trace=trace)
+                    history.record("text_sign", text)
+                    content_frame.after(200, report_when_done)
+                except Exception as e:
+                    trace.finish("failed")
+                    status_label.config(text=f"Error: {str(e)[:50]}")
+                    print(f"Full error: {e}")
             
-            show_btn = self.create_rounded_button(content_frame, "Show Sign", show_sign)
-            show_btn.pack(pady=10)
+            show_btn = self.create_rounded_button(input_frame, "Show Sign", show_sign, width=200)
+            show_btn.pack(side=tk.LEFT, padx=5)
+            text_entry.bind("<Return>", lambda event: show_sign())
+            
+            surface = self.create_sign_surface(content_frame, input_frame)
+            surface.pack(pady=2)
+            status_label.pack(pady=2)
+            
+            self.pages.add_hooks(on_hide=surface.clear)
         
         self.create_tool_page("Text → Sign", setup_content)
     
@@ -643,36 +805,71 @@ class BRIDGEApp:
                                font=("Arial", 11), bg="#FADDEA", fg="#666")
             status_label.pack(pady=5)
             
+            def show_progress(job):
+                # Called on the braille writer thread
+                if job.status == "sending":
+                    self.ui.config(status_label, text=f"Reading: {job.acked}/{job.total} cells")
+                elif job.status == "done":
+                    self.ui.config(status_label, text=f"Read: {job.text}")
+                else:
+                    self.ui.config(status_label, text=f"Braille message {job.status}")
+            
             def send_braille():
-                if self.module_running:
-                    status_label.config(text="Already sending! Please wait...")
-                    return
-                
                 text = text_entry.get().strip()
                 if not text:
                     status_label.config(text="Please enter some text!")
                     return
                 
-                self.module_running = True
-                status_label.config(text="Sending to Arduino...")
-                
-                def run_thread():
-                    try:
-                        from modules import text_to_braille
-                        text_to_braille.send_to_braille(text)
-                        status_label.config(text=f"Sent: {text}")
-                    except Exception as e:
-                        status_label.config(text=f"Error: {str(e)[:50]}")
-                    finally:
-                        self.module_running = False
-                
-                threading.Thread(target=run_thread, daemon=True).start()
+                # Queued behind earlier messages; one writer owns the port
+                from modules import text_to_braille
+                try:
+                    text_to_braille.get_output().send(text, on_progress=show_progress,
+                                                      trace=tracing.start("text_to_braille"))
+                    history.record("braille", text, src="text_to_braille")
+                except Exception as e:
+                    status_label.config(text=f"Error: {str(e)[:50]}")
+                    return
+                pending = text_to_braille.get_output().pending_cells()
+                status_label.config(text=f"Queued: {text} ({pending} cells to read)")
             
             send_btn = self.create_rounded_button(content_frame, "Send to Braille", send_braille)
             send_btn.pack(pady=10)
         
         self.create_tool_page("Text → Braille", setup_content)
     
+    def attach_level_meter(self, canvas, bar, width):
+        """
+        Drive a canvas bar from the shared microphone level while the
+        page being built is on screen.
+        """
+        from modules import audio_input
+        meter = audio_input.LevelMeter()
+        job = None
+        
+        def update():
+            nonlocal job
+            canvas.coords(bar, 0, 0, int(meter.level * width), 10)
+            job = canvas.after(100, update)
+        
+        def start():
+            try:
+                audio_input.get_manager().add_callback(meter)
+            except Exception as e:
+                print(f"Level meter unavailable: {e}")
+                return
+            update()
+        
+        def stop():
+            nonlocal job
+            audio_input.get_manager().remove_callback(meter)
+            if job is not None:
+                canvas.after_cancel(job)
+                job = None
+            meter.level = 0.0
+            canvas.coords(bar, 0, 0, 0, 10)
+        
+        self.pages.add_hooks(on_show=start, on_hide=stop)
+    
     def open_speech_to_text(self):
         """Open Speech to Text module page"""
         self.current_page = "speech_to_text"
@@ -700,66 +897,51 @@ class BRIDGEApp:
                                font=("Arial", 11), bg="#FADDEA", fg="#666")
             status_label.pack(pady=5)
             
+            # Microphone level meter (another consumer of the shared stream)
+            meter_canvas = Canvas(content_frame, width=300, height=10,
+                                  bg="white", highlightthickness=0)
+            meter_canvas.pack(pady=2)
+            meter_bar = meter_canvas.create_rectangle(0, 0, 0, 10, fill="#FF9ECF", width=0)
+            self.attach_level_meter(meter_canvas, meter_bar, 300)
+            
             def start_listening():
-                if self.module_running:
+                if self.tasks.running("speech_to_text"):
                     status_label.config(text="Already listening! Please wait...")
                     return
                 
-                self.module_running = True
                 status_label.config(text="Status: Listening... (5 seconds)")
                 output_text.insert(tk.END, "Listening...\n")
                 
-                def run_thread():
-                    try:
-                        import json
-                        import sounddevice as sd
-                        from vosk import Model, KaldiRecognizer
-                        
-                        # Load Vosk model
-                        vosk_model_path = os.path.join(
-                            os.path.dirname(os.path.dirname(__file__)),
-                            "models", "vosk-model"
-                        )
-                        
-                        if not os.path.exists(vosk_model_path):
-                            raise FileNotFoundError("Vosk model missing in models/vosk-model/")
-                        
-                        model = Model(vosk_model_path)
-                        rec = KaldiRecognizer(model, 16000)
-                        fs = 16000
-                        duration = 5
-                        
-                        # Record audio
-                        recording = sd.rec(int(duration * fs),
-                                         samplerate=fs,
-                                         channels=1,
-                                         dtype="int16")
-                        sd.wait()
-                        data = recording.tobytes()
-                        
-                        # Process with Vosk
-                        if rec.AcceptWaveform(data):
-                            res = json.loads(rec.Result())
-                        else:
-                            res = json.loads(rec.FinalResult())
-                        
-                        transcribed_text = res.get("text", "")
-                        
-                        if transcribed_text:
-                            output_text.insert(tk.END, f"You said: {transcribed_text}\n\n")
-                            status_label.config(text="Status: Done!")
-                        else:
-                            output_text.insert(tk.END, "No speech detected. Please try again.\n\n")
-                            status_label.config(text="Status: No speech detected")
-                        
-                    except Exception as e:
-                        status_label.config(text=f"Error: {str(e)[:50]}")
-                        output_text.insert(tk.END, f"Error: {e}\n\n")
-                        print(f"Full error: {e}")
-                    finally:
-                        self.module_running = False
+                trace = tracing.start("speech_to_text")
+                
+                def run_task(handle):
+                    from modules import speech_to_text_vosk as stt
+                    
+                    # Shared model + same recognizer path as the ASR benchmark
+                    stt.load_model()
+                    data = stt.record(duration=5)
+                    trace.step("capture")
+                    text = stt.transcribe_bytes(data)
+                    trace.step("recognize")
+                    return text
+                
+                def finished(handle):
+                    if handle.error is not None:
+                        trace.finish("failed")
+                        self.ui.config(status_label, text=f"Error: {str(handle.error)[:50]}")
+                        self.ui.append(output_text, f"Error: {handle.error}\n\n")
+                    elif handle.result:
+                        history.record("speech", handle.result, src="speech_to_text")
+                        self.ui.append(output_text, f"You said: {handle.result}\n\n")
+                        self.ui.config(status_label, text="Status: Done!")
+                        self.ui.call(lambda: trace.step("display").finish())
+                    else:
+                        trace.finish("empty")
+                        self.ui.append(output_text, "No speech detected. Please try again.\n\n")
+                        self.ui.config(status_label, text="Status: No speech detected")
                 
-                threading.Thread(target=run_thread, daemon=True).start()
+                handle = self.tasks.submit("speech_to_text", run_task, devices=("mic",))
+                handle.add_done_callback(finished)
             
             start_btn = self.create_rounded_button(content_frame, "Start Listening", start_listening)
             start_btn.pack(pady=10)
@@ -788,47 +970,125 @@ class BRIDGEApp:
                                font=("Arial", 11), bg="#FADDEA", fg="#666")
             status_label.pack(pady=5)
             
+            # Start the shared TTS engine now, while the user is typing, and
+            # fill the speech cache with the ISL phrases once it is idle
+            from modules import text_to_speech, tts_cache
+            worker = text_to_speech.get_worker()
+            worker.prewarm(tts_cache.vocabulary())
+            
+            def on_done(utt):
+                # Called on the TTS worker thread
+                if utt.status == "done":
+                    self.ui.config(status_label, text=f"Done! (first audio "
+                                                      f"{utt.first_audio_ms or 0:.0f} ms, {utt.source})")
+                elif utt.status == "failed":
+                    self.ui.config(status_label, text=f"Error: {str(worker.error)[:50]}")
+                elif not worker.busy():
+                    self.ui.config(status_label, text="Stopped")
+            
             def speak():
-                if self.module_running:
-                    status_label.config(text="Already speaking! Please wait...")
-                    return
-                
                 text = text_input.get("1.0", tk.END).strip()
                 if not text:
                     status_label.config(text="Please enter some text!")
                     return
                 
-                self.module_running = True
-                status_label.config(text="Speaking...")
-                
-                def run_thread():
-                    try:
-                        import pyttsx3
-                        
-                        # Initialize TTS engine
-                        engine = pyttsx3.init()
-                        engine.setProperty("rate", 150)
-                        engine.setProperty("volume", 1.0)
-                        
-                        # Speak the text
-                        print(f"Speaking: {text}")
-                        engine.say(text)
-                        engine.runAndWait()
-                        
-                        status_label.config(text="Done!")
-                    except Exception as e:
-                        status_label.config(text=f"Error: {str(e)[:50]}")
-                        print(f"Full TTS error: {e}")
-                    finally:
-                        self.module_running = False
-                
-                threading.Thread(target=run_thread, daemon=True).start()
+                # Queued behind anything still being spoken
+                ahead = worker.busy()
+                worker.say(text, on_done=on_done, trace=tracing.start("text_to_speech"))
+                history.record("spoken", text, src="text_to_speech")
+                status_label.config(text="Queued..." if ahead else "Speaking...")
+            
+            def stop():
+                worker.interrupt()
+                status_label.config(text="Stopped")
             
-            speak_btn = self.create_rounded_button(content_frame, "Speak", speak)
-            speak_btn.pack(pady=10)
+            button_frame = Frame(content_frame, bg="#FADDEA")
+            button_frame.pack(pady=10)
+            
+            speak_btn = self.create_rounded_button(button_frame, "Speak", speak, width=240)
+            speak_btn.pack(side=tk.LEFT, padx=5)
+            
+            stop_btn = self.create_rounded_button(button_frame, "Stop", stop, width=240)
+            stop_btn.pack(side=tk.LEFT, padx=5)
         
         self.create_tool_page("Text → Speech", setup_content)
     
+    def open_history(self):
+        """Open the session history page: search and replay past entries"""
+        self.current_page = "history"
+        
+        def setup_content(content_frame):
+            search_frame = Frame(content_frame, bg="#FADDEA")
+            search_frame.pack(pady=2)
+            
+            search_entry = Entry(search_frame, font=("Arial", 14), width=30)
+            search_entry.pack(side=tk.LEFT, padx=5)
+            
+            # Results, newest first
+            list_frame = Frame(content_frame, bg="white", relief=tk.SUNKEN, borderwidth=2)
+            list_frame.pack(pady=5, fill=tk.BOTH, expand=True)
+            
+            scrollbar = Scrollbar(list_frame)
+            scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+            
+            results = Listbox(list_frame, font=("Arial", 12), height=8,
+                              yscrollcommand=scrollbar.set, activestyle="none")
+            results.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+            scrollbar.config(command=results.yview)
+            
+            status_label = Label(content_frame, text="", font=("Arial", 11),
+                                 bg="#FADDEA", fg="#666")
+            
+            shown = []
+            kind_names = {"sign": "Sign", "speech": "Heard", "spoken": "Spoke",
+                          "braille": "Braille", "text_sign": "Signed"}
+            
+            def refresh():
+                entries = history.get_history().search(search_entry.get(), limit=100)
+                shown[:] = entries
+                results.delete(0, tk.END)
+                for entry in entries:
+                    stamp = time.strftime("%H:%M", time.localtime(entry["t"]))
+                    results.insert(tk.END, f"{stamp}  {kind_names.get(entry['k'], entry['k']):8s}"
+                                           f"  {entry['x']}")
+                status_label.config(text=f"{len(entries)} entries" if entries
+                                    else "Nothing found")
+            
+            def replay(target):
+                selection = results.curselection()
+                if not selection:
+                    status_label.config(text="Select an entry first")
+                    return
+                entry = shown[selection[0]]
+                try:
+                    history.get_history().replay(entry["id"], target)
+                except Exception as e:
+                    status_label.config(text=f"Error: {str(e)[:50]}")
+                    return
+                status_label.config(text=("Speaking: " if target == "speech" else "Braille: ")
+                                         + entry["x"])
+            
+            search_btn = self.create_rounded_button(search_frame, "Search", refresh, width=140)
+            search_btn.pack(side=tk.LEFT, padx=5)
+            search_entry.bind("<Return>", lambda event: refresh())
+            
+            button_frame = Frame(content_frame, bg="#FADDEA")
+            button_frame.pack(pady=2)
+            
+            speak_btn = self.create_rounded_button(button_frame, "Speak",
+                                                   lambda: replay("speech"), width=200)
+            speak_btn.pack(side=tk.LEFT, padx=5)
+            
+            braille_btn = self.create_rounded_button(button_frame, "Braille",
+                                                     lambda: replay("braille"), width=200)
+            braille_btn.pack(side=tk.LEFT, padx=5)
+            status_label.pack(pady=2)
+            
+            # Newest entries every time the page is shown
+            self.pages.add_hooks(on_show=refresh)
+        
+        self.create_tool_page("History", setup_content)
+    
     def open_profile(self):
         """Open User Profile Setup page"""
         self.current_page = "profile"
@@ -857,7 +1117,11 @@ def main():
     """Main entry point for BRIDGE application"""
     root = tk.Tk()
     app = BRIDGEApp(root)
-    root.mainloop()
+    try:
+        root.mainloop()
+    finally:
+        # Let running features see their cancel flag and release devices
+        app.tasks.shutdown()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,131 @@
+"""
+BRIDGE - Page Manager
+Builds each screen once, on first visit, and keeps every page stacked in
+the same grid cell; navigating just raises the cached frame.
+"""
+
+import os
+import time
+import tkinter as tk
+from collections import deque
+from tkinter import Frame, Label
+
+
+class Page:
+    """One cached screen and its show/hide hooks"""
+
+    def __init__(self, name, frame):
+        self.name = name
+        self.frame = frame
+        self.on_show = []
+        self.on_hide = []
+        self.build_ms = 0.0
+
+
+class PageManager:
+    """
+    Lazily built page stack for the 800x480 touchscreen.
+
+    Pages register hooks while they are being built:
+        pages.add_hooks(on_show=start_meter, on_hide=stop_meter)
+    on_show runs every time the page is raised, on_hide when another
+    page replaces it - use them to start and stop devices.
+    """
+
+    def __init__(self, root, bg="#FADDEA"):
+        self.root = root
+        self.container = Frame(root, bg=bg)
+        self.container.pack(fill=tk.BOTH, expand=True)
+        self.container.grid_rowconfigure(0, weight=1)
+        self.container.grid_columnconfigure(0, weight=1)
+
+        self.pages = {}
+        self.current = None
+        self.building = None
+
+        # Recent navigation times (ms), newest last
+        self.nav_ms = deque(maxlen=100)
+
+        # Debug overlay: F12 toggles it, BRIDGE_DEBUG=1 starts with it on
+        self.overlay = Label(root, text="", font=("Courier", 9),
+                             bg="#333", fg="#7CFC00", padx=4)
+        self.overlay_on = bool(os.environ.get("BRIDGE_DEBUG"))
+        root.bind_all("<F12>", lambda event: self.toggle_overlay())
+
+    def add_hooks(self, on_show=None, on_hide=None):
+        """Attach hooks to the page currently being built"""
+        if self.building is None:
+            raise RuntimeError("add_hooks() is only valid while a page is being built")
+        if on_show:
+            self.building.on_show.append(on_show)
+        if on_hide:
+            self.building.on_hide.append(on_hide)
+
+    def show(self, name, build):
+        """
+        Raise page `name`, calling build(frame) first if it has never
+        been shown. Returns the page frame.
+        """
+        start = time.perf_counter()
+        page = self.pages.get(name)
+        built = page is None
+        if built:
+            frame = Frame(self.container, bg=self.container.cget("bg"))
+            frame.grid(row=0, column=0, sticky="nsew")
+            page = self.pages[name] = Page(name, frame)
+            self.building = page
+            try:
+                build(frame)
+            except Exception:
+                # Half-built pages are not cached; the next visit retries
+                del self.pages[name]
+                frame.destroy()
+                raise
+            finally:
+                self.building = None
+            page.build_ms = (time.perf_counter() - start) * 1000
+
+        previous = self.current
+        if previous is not None and previous is not page:
+            self._run_hooks(previous.on_hide)
+        self.current = page
+        page.frame.tkraise()
+        if previous is not page:
+            self._run_hooks(page.on_show)
+
+        # Count layout and drawing, which is what the user waits for
+        self.root.update_idletasks()
+        elapsed = (time.perf_counter() - start) * 1000
+        self.nav_ms.append(elapsed)
+        self._update_overlay(previous, page, elapsed, built)
+        return page.frame
+
+    def _run_hooks(self, hooks):
+        for hook in hooks:
+            try:
+                hook()
+            except Exception as e:
+                print(f"Page hook error: {e}")
+
+    # -----------------------------
+    # DEBUG OVERLAY
+    # -----------------------------
+    def toggle_overlay(self):
+        self.overlay_on = not self.overlay_on
+        if not self.overlay_on:
+            self.overlay.place_forget()
+        elif self.nav_ms:
+            self._place_overlay()
+
+    def _place_overlay(self):
+        self.overlay.place(relx=1.0, rely=1.0, anchor="se")
+        self.overlay.lift()
+
+    def _update_overlay(self, previous, page, elapsed, built):
+        avg = sum(self.nav_ms) / len(self.nav_ms)
+        source = previous.name if previous is not None else "-"
+        how = f"built {page.build_ms:.0f} ms" if built else "cached"
+        self.overlay.config(text=f"{source} → {page.name}: {elapsed:.1f} ms ({how}) "
+                                 f"| avg {avg:.1f} ms, {len(self.pages)} pages")
+        if self.overlay_on:
+            self._place_overlay()
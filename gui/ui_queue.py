@@ -0,0 +1,72 @@
+"""
+BRIDGE - UI Update Queue
+Worker threads never touch Tk widgets directly. They post updates here
+and the Tk thread applies them on an after() tick, in posting order.
+Repeated config() calls for the same widget are merged until the next
+call() is posted, so a chatty worker costs one redraw per tick, and a
+config never jumps ahead of a call posted before it (e.g. a page switch
+followed by a label update).
+"""
+
+import threading
+import tkinter as tk
+
+
+class UIQueue:
+    """Thread-safe widget updates drained on the Tk thread"""
+
+    def __init__(self, root, interval_ms=30):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.lock = threading.Lock()
+        self.ops = []          # ("config", widget, options) / ("call", fn, args, kwargs), in order
+        self.configs = {}      # widget -> options of its config op since the last call
+        self.coalesced = 0
+        self.root.after(self.interval_ms, self._drain)
+
+    def config(self, widget, **options):
+        """widget.config(**options) on the Tk thread; later values win"""
+        with self.lock:
+            pending = self.configs.get(widget)
+            if pending is None:
+                pending = self.configs[widget] = dict(options)
+                self.ops.append(("config", widget, pending))
+            else:
+                pending.update(options)
+                self.coalesced += 1
+
+    def append(self, text_widget, text, see_end=True):
+        """Insert text at the end of a Text widget, in posting order"""
+        def insert():
+            text_widget.insert(tk.END, text)
+            if see_end:
+                text_widget.see(tk.END)
+        self.call(insert)
+
+    def call(self, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) on the Tk thread"""
+        with self.lock:
+            self.ops.append(("call", fn, args, kwargs))
+            # Configs posted from here on must run after this call
+            self.configs = {}
+
+    def _drain(self):
+        with self.lock:
+            ops, self.ops = self.ops, []
+            self.configs = {}
+
+        for op in ops:
+            if op[0] == "config":
+                _, widget, options = op
+                try:
+                    if widget.winfo_exists():
+                        widget.config(**options)
+                except tk.TclError as e:
+                    print(f"UI update dropped: {e}")
+            else:
+                _, fn, args, kwargs = op
+                try:
+                    fn(*args, **kwargs)
+                except Exception as e:
+                    print(f"UI call error: {e}")
+        self.root.after(self.interval_ms, self._drain)
@@ -0,0 +1,21 @@
+# main.py
+# BRIDGE entry point: the touchscreen GUI, or with --headless the local
+# HTTP/WebSocket service (modules/service.py) with no window.
+#
+#     python3 main.py
+#     python3 main.py --headless [--port 8765] [--synthetic-sign MS]
+
+import sys
+
+
+def main():
+    if "--headless" in sys.argv[1:]:
+        from modules import service
+        service.main([arg for arg in sys.argv[1:] if arg != "--headless"])
+    else:
+        from gui import main_ui
+        main_ui.main()
+
+
+if __name__ == "__main__":
+    main()
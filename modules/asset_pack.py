@@ -0,0 +1,273 @@
+# modules/asset_pack.py
+"""
+Precompiled sign-animation asset pack.
+
+The build step transcodes every ISL_Gifs/*.gif once on the desktop (or
+on the Pi, once) into:
+
+    ISL_Pack/signs.pack   frames already scaled to display size, stored
+                          as 8-bit palette indices, one 768-byte RGB
+                          palette per clip; between keyframes each frame
+                          is XORed with the previous one (unchanged
+                          pixels become 0) and zlib-compressed
+    ISL_Pack/signs.json   index: phrase -> offset, frame count, delay,
+                          size and per-frame (offset, length) table
+
+The pack is memory-mapped at runtime and frames are rebuilt with
+Image.frombuffer, so playback never goes through PIL's GIF decoder.
+
+Build (and print size / decode-time comparison with the GIF path):
+    python3 -m modules.asset_pack build
+    python3 -m modules.asset_pack build --no-compress
+    python3 -m modules.asset_pack report
+"""
+
+import os
+import sys
+import json
+import mmap
+import time
+import zlib
+import argparse
+import threading
+import numpy as np
+
+from PIL import Image
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from modules import utils
+from modules.frame_cache import DISPLAY_SIZE, Clip, decode_gif
+from modules.phrase_index import GIF_DIR, normalize
+
+PACK_DIR = utils.abs_path("ISL_Pack")
+PACK_PATH = os.path.join(PACK_DIR, "signs.pack")
+INDEX_PATH = os.path.join(PACK_DIR, "signs.json")
+
+MAGIC = b"BRSP"
+VERSION = 1
+PALETTE_BYTES = 768
+PALETTE_COLOURS = 128     # plenty for the sign videos, ~15% smaller than 256
+KEYFRAME_INTERVAL = 10    # random access decodes at most this many frames
+
+
+# -----------------------------
+# BUILD
+# -----------------------------
+def _clip_palette(frames):
+    """
+    One adaptive palette per clip, taken from a strip of a
+    few evenly spaced frames so later frames are represented too.
+    """
+    picks = frames[::max(1, len(frames) // 4)][:4]
+    w, h = picks[0].size
+    strip = Image.new("RGB", (w * len(picks), h))
+    for i, frame in enumerate(picks):
+        strip.paste(frame, (i * w, 0))
+    return strip.quantize(PALETTE_COLOURS, method=Image.Quantize.MEDIANCUT)
+
+
+def build(gif_dir=GIF_DIR, pack_path=PACK_PATH, index_path=INDEX_PATH,
+          max_size=DISPLAY_SIZE, compress=True):
+    """
+    Transcode every GIF in gif_dir into the pack. Returns the index dict.
+    """
+    utils.ensure_dir(os.path.dirname(pack_path))
+    index = {
+        "version": VERSION,
+        "display_size": list(max_size),
+        "compression": "zlib" if compress else "none",
+        "clips": {},
+    }
+    tmp_path = pack_path + ".tmp"
+    with open(tmp_path, "wb") as pack:
+        pack.write(MAGIC + bytes([VERSION]))
+        for fname in sorted(os.listdir(gif_dir)):
+            stem, ext = os.path.splitext(fname)
+            key = normalize(stem)
+            if ext.lower() != ".gif" or key in index["clips"]:
+                continue
+
+            clip = decode_gif(os.path.join(gif_dir, fname), max_size)
+            palette_img = _clip_palette(clip.frames)
+            palette = bytes(palette_img.getpalette()[:PALETTE_BYTES]).ljust(PALETTE_BYTES, b"\0")
+
+            offset = pack.tell()
+            pack.write(palette)
+            table = []
+            prev = None
+            for i, frame in enumerate(clip.frames):
+                indices = np.frombuffer(
+                    frame.quantize(palette=palette_img, dither=Image.Dither.NONE).tobytes(),
+                    dtype=np.uint8)
+                if compress and i % KEYFRAME_INTERVAL:
+                    data = zlib.compress((indices ^ prev).tobytes(), 6)
+                elif compress:
+                    data = zlib.compress(indices.tobytes(), 6)
+                else:
+                    data = indices.tobytes()
+                table.append([pack.tell(), len(data)])
+                pack.write(data)
+                prev = indices
+
+            index["clips"][key] = {
+                "offset": offset,
+                "frames": len(clip.frames),
+                "delay": clip.delay,
+                "size": list(clip.frames[0].size),
+                "table": table,
+            }
+            print(f"  {key}: {len(clip.frames)} frames {clip.frames[0].size}")
+    os.replace(tmp_path, pack_path)
+    with open(index_path, "w") as f:
+        json.dump(index, f)
+    return index
+
+
+# -----------------------------
+# READ
+# -----------------------------
+class AssetPack:
+    """Memory-mapped, read-only view of a built pack"""
+
+    def __init__(self, pack_path=PACK_PATH, index_path=INDEX_PATH):
+        with open(index_path, "r") as f:
+            self.index = json.load(f)
+        self.clips = self.index["clips"]
+        self.compressed = self.index["compression"] == "zlib"
+        self.file = open(pack_path, "rb")
+        self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._last = (None, -1, None)   # (key, frame, indices) for delta decoding
+        if self.mm[:4] != MAGIC:
+            raise ValueError(f"{pack_path} is not a BRIDGE asset pack")
+
+    def __contains__(self, key):
+        return key in self.clips
+
+    def frame_count(self, key):
+        return self.clips[key]["frames"]
+
+    def _indices(self, key, i):
+        """Palette indices of frame i, undoing the XOR delta chain"""
+        meta = self.clips[key]
+        offset, length = meta["table"][i]
+        data = self.mm[offset:offset + length]
+        if not self.compressed:
+            return data
+        data = np.frombuffer(zlib.decompress(data), dtype=np.uint8)
+        if i % KEYFRAME_INTERVAL == 0:
+            return data
+        last_key, last_i, last = self._last
+        if last_key != key or last_i != i - 1:
+            last = self._indices(key, i - 1)
+        return data ^ last
+
+    def frame(self, key, i):
+        """Frame i of a clip as a palette ('P') image"""
+        meta = self.clips[key]
+        indices = self._indices(key, i)
+        if self.compressed:
+            self._last = (key, i, indices)
+            indices = indices.tobytes()
+        img = Image.frombuffer("P", tuple(meta["size"]), indices, "raw", "P", 0, 1)
+        palette = meta.get("_palette")
+        if palette is None:
+            palette = meta["_palette"] = self.mm[meta["offset"]:meta["offset"] + PALETTE_BYTES]
+        img.putpalette(palette)
+        return img
+
+    def clip(self, key):
+        """Whole clip, in the same form the frame cache stores"""
+        meta = self.clips[key]
+        frames = [self.frame(key, i) for i in range(meta["frames"])]
+        w, h = meta["size"]
+        return Clip(frames, meta["delay"], w * h * len(frames))
+
+    def close(self):
+        self.mm.close()
+        self.file.close()
+
+
+_pack = None
+_pack_checked = False
+_pack_lock = threading.Lock()
+
+
+def get_pack():
+    """Shared pack, or None if it has not been built"""
+    global _pack, _pack_checked
+    with _pack_lock:
+        if not _pack_checked:
+            _pack_checked = True
+            if os.path.exists(PACK_PATH) and os.path.exists(INDEX_PATH):
+                try:
+                    _pack = AssetPack()
+                except Exception as e:
+                    print(f"Asset pack unavailable: {e}")
+        return _pack
+
+
+# -----------------------------
+# REPORT
+# -----------------------------
+def dir_size(path):
+    return sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path)
+               if f.lower().endswith(".gif"))
+
+
+def report(gif_dir=GIF_DIR, sample=10):
+    """
+    Compare pack size and per-frame decode time with the raw GIF path.
+    """
+    pack = AssetPack()
+    keys = sorted(pack.clips)[:sample]
+    paths = {normalize(os.path.splitext(f)[0]): os.path.join(gif_dir, f)
+             for f in os.listdir(gif_dir) if f.lower().endswith(".gif")}
+
+    gif_time = gif_frames = 0
+    pack_time = pack_frames = 0
+    for key in keys:
+        start = time.perf_counter()
+        clip = decode_gif(paths[key])
+        gif_time += time.perf_counter() - start
+        gif_frames += len(clip.frames)
+
+        start = time.perf_counter()
+        for i in range(pack.frame_count(key)):
+            pack.frame(key, i).load()
+        pack_time += time.perf_counter() - start
+        pack_frames += pack.frame_count(key)
+
+    result = {
+        "gif_dir_mb": round(dir_size(gif_dir) / 1e6, 1),
+        "pack_mb": round(os.path.getsize(PACK_PATH) / 1e6, 1),
+        "compression": pack.index["compression"],
+        "clips": len(pack.clips),
+        "gif_ms_per_frame": round(gif_time / gif_frames * 1000, 3),
+        "pack_ms_per_frame": round(pack_time / pack_frames * 1000, 3),
+    }
+    print(f"GIFs: {result['gif_dir_mb']} MB   pack: {result['pack_mb']} MB "
+          f"({result['compression']}, {result['clips']} clips)")
+    print(f"Decode per frame: GIF {result['gif_ms_per_frame']} ms   "
+          f"pack {result['pack_ms_per_frame']} ms")
+    pack.close()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build / inspect the sign asset pack")
+    parser.add_argument("command", choices=["build", "report"])
+    parser.add_argument("--no-compress", action="store_true",
+                        help="store raw palette indices (bigger pack, no inflate step)")
+    parser.add_argument("--sample", type=int, default=10,
+                        help="clips to time in the report")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        start = time.perf_counter()
+        build(compress=not args.no_compress)
+        print(f"Built {PACK_PATH} in {time.perf_counter() - start:.1f}s")
+    report(sample=args.sample)
+
+
+if __name__ == "__main__":
+    main()
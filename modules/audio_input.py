@@ -0,0 +1,248 @@
+# modules/audio_input.py
+# Shared microphone manager: one PortAudio stream for the whole app,
+# fanned out to every subscribed consumer (Speech→Text, Speech→Sign,
+# level meter).
+
+import queue
+import threading
+import numpy as np
+
+from modules import metrics, utils
+
+SAMPLE_RATE = 16000
+BLOCK_MS = 100
+BLOCK_SIZE = SAMPLE_RATE * BLOCK_MS // 1000
+
+PROFILE_KEY = "audio_input"     # settings section: device_index, device_name
+
+
+class AudioSubscription:
+    """Queue of raw int16 mono blocks delivered to one consumer"""
+
+    def __init__(self, manager, name, max_blocks=100):
+        self.manager = manager
+        self.name = name
+        self.blocks = queue.Queue(maxsize=max_blocks)
+        self.dropped = 0
+
+    def _push(self, data):
+        # Runs on the PortAudio thread: never block, drop oldest instead
+        try:
+            self.blocks.put_nowait(data)
+        except queue.Full:
+            try:
+                self.blocks.get_nowait()
+            except queue.Empty:
+                pass
+            self.dropped += 1
+            self.blocks.put_nowait(data)
+
+    def read(self, timeout=None):
+        """Next audio block as bytes, or None on timeout"""
+        try:
+            return self.blocks.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def record(self, seconds):
+        """Collect `seconds` of audio from the live stream and return bytes"""
+        needed = int(seconds * SAMPLE_RATE) * 2
+        chunks = []
+        got = 0
+        while got < needed:
+            block = self.read(timeout=2.0)
+            if block is None:
+                raise RuntimeError("Microphone stream stalled")
+            chunks.append(block)
+            got += len(block)
+        return b"".join(chunks)[:needed]
+
+    def close(self):
+        self.manager.unsubscribe(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class LevelMeter:
+    """Consumer that keeps the RMS level (0.0-1.0) of the latest block"""
+
+    def __init__(self):
+        self.level = 0.0
+
+    def __call__(self, data):
+        samples = np.frombuffer(data, dtype=np.int16).astype(np.float32)
+        if samples.size:
+            self.level = min(1.0, float(np.sqrt(np.mean(samples * samples))) / 32768.0 * 4)
+
+
+class AudioInputManager:
+    """Owns the single input stream and the list of consumers"""
+
+    def __init__(self):
+        self.device = None
+        self.device_name = None
+        self.stream = None
+        self.subscriptions = []
+        self.callbacks = []
+        self.lock = threading.Lock()
+
+    # -----------------------------
+    # DEVICE SELECTION
+    # -----------------------------
+    def probe_devices(self):
+        """
+        List input devices that accept 16 kHz mono int16.
+        Returns [(index, name), ...].
+        """
+        import sounddevice as sd
+
+        usable = []
+        for index, info in enumerate(sd.query_devices()):
+            if info["max_input_channels"] < 1:
+                continue
+            try:
+                sd.check_input_settings(device=index, channels=1,
+                                        dtype="int16", samplerate=SAMPLE_RATE)
+            except Exception:
+                continue
+            usable.append((index, info["name"]))
+        return usable
+
+    def select_device(self):
+        """
+        Pick the saved device if it is still present (matched by name,
+        since ALSA indices move between boots), else the system default,
+        else the first usable input. The choice is saved to the profile.
+        """
+        import sounddevice as sd
+
+        usable = self.probe_devices()
+        if not usable:
+            raise RuntimeError("No usable microphone found")
+
+        saved = utils.get_settings().section(PROFILE_KEY)
+        chosen = None
+        for index, name in usable:
+            if name == saved.get("device_name"):
+                chosen = (index, name)
+                break
+        if chosen is None:
+            default_in = sd.default.device[0]
+            chosen = next((d for d in usable if d[0] == default_in), usable[0])
+
+        self.device, self.device_name = chosen
+        if saved.get("device_name") != self.device_name or saved.get("device_index") != self.device:
+            self.save_device()
+        print(f"🎙 Microphone: [{self.device}] {self.device_name}")
+        return chosen
+
+    def save_device(self):
+        utils.get_settings().set(PROFILE_KEY, device_index=self.device,
+                                 device_name=self.device_name)
+
+    def _on_settings(self, values):
+        """The saved microphone was changed elsewhere: switch to it if open"""
+        name = values.get("device_name")
+        if self.stream is None or not name or name == self.device_name:
+            return
+        index = next((i for i, n in self.probe_devices() if n == name), None)
+        if index is None:
+            print(f"Saved microphone {name!r} not found, keeping {self.device_name!r}")
+            return
+        self.set_device(index)
+
+    def set_device(self, index):
+        """Switch to another input device and persist it"""
+        usable = dict(self.probe_devices())
+        if index not in usable:
+            raise ValueError(f"Device {index} is not a usable input")
+        self.close()
+        self.device, self.device_name = index, usable[index]
+        self.save_device()
+        self.start()
+
+    # -----------------------------
+    # STREAM
+    # -----------------------------
+    def start(self):
+        """Open the input stream once; later calls are no-ops"""
+        import sounddevice as sd
+
+        with self.lock:
+            if self.stream is not None and self.stream.active:
+                return
+            if self.device is None:
+                self.select_device()
+            self.stream = sd.RawInputStream(samplerate=SAMPLE_RATE,
+                                            blocksize=BLOCK_SIZE,
+                                            device=self.device,
+                                            channels=1,
+                                            dtype="int16",
+                                            callback=self._on_audio)
+            self.stream.start()
+
+    def _on_audio(self, indata, frames, time_info, status):
+        t0 = metrics.clock()
+        if status:
+            print(f"Audio input status: {status}")
+            metrics.count("audio_status_errors")
+        data = bytes(indata)
+        for sub in self.subscriptions:
+            sub._push(data)
+        for callback in self.callbacks:
+            try:
+                callback(data)
+            except Exception as e:
+                print(f"Audio consumer error: {e}")
+        metrics.record_since("audio_capture", t0)
+
+    def close(self):
+        with self.lock:
+            if self.stream is not None:
+                self.stream.stop()
+                self.stream.close()
+                self.stream = None
+
+    # -----------------------------
+    # CONSUMERS
+    # -----------------------------
+    def subscribe(self, name, max_blocks=100):
+        """Queue-based consumer (ASR). Starts the stream if needed."""
+        sub = AudioSubscription(self, name, max_blocks)
+        self.subscriptions = self.subscriptions + [sub]
+        self.start()
+        return sub
+
+    def unsubscribe(self, sub):
+        self.subscriptions = [s for s in self.subscriptions if s is not sub]
+
+    def add_callback(self, callback):
+        """Lightweight consumer called on the audio thread (level meter)"""
+        self.callbacks = self.callbacks + [callback]
+        self.start()
+
+    def remove_callback(self, callback):
+        self.callbacks = [c for c in self.callbacks if c is not callback]
+
+    def record(self, seconds, name="record"):
+        """One-shot recording through a temporary subscription"""
+        with self.subscribe(name) as sub:
+            return sub.record(seconds)
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_manager():
+    """The process-wide audio input manager"""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = AudioInputManager()
+            utils.get_settings().subscribe(PROFILE_KEY, _manager._on_settings)
+        return _manager
@@ -0,0 +1,176 @@
+# modules/braille_translate.py
+"""
+Text -> 6-bit braille cells for the Arduino braille cell.
+
+A cell is one int, bit n-1 set when dot n is raised:
+
+    1 4
+    2 5
+    3 6
+
+Grade 1 spells letters, digits (after a number sign) and common
+punctuation one cell at a time. Grade 2 adds the UEB wordsigns and
+groupsigns ("the", "and", "ing", "ch", ...) so the reader has fewer
+cells to press through. The Grade 2 rules are the simple ones: whole-word
+signs for standalone words and greedy longest-first groupsigns inside
+words, without UEB's finer syllable-boundary exceptions.
+
+On the wire each cell is one byte, CELL_FLAG | pattern (0x40-0x7F), so it
+can never be confused with the "\\n" that ends a message.
+"""
+
+import re
+
+CELL_FLAG = 0x40
+
+
+def dots(*numbers):
+    """Cell pattern with the given dots (1-6) raised"""
+    cell = 0
+    for n in numbers:
+        cell |= 1 << (n - 1)
+    return cell
+
+
+LETTERS = {
+    "a": dots(1), "b": dots(1, 2), "c": dots(1, 4), "d": dots(1, 4, 5),
+    "e": dots(1, 5), "f": dots(1, 2, 4), "g": dots(1, 2, 4, 5), "h": dots(1, 2, 5),
+    "i": dots(2, 4), "j": dots(2, 4, 5), "k": dots(1, 3), "l": dots(1, 2, 3),
+    "m": dots(1, 3, 4), "n": dots(1, 3, 4, 5), "o": dots(1, 3, 5), "p": dots(1, 2, 3, 4),
+    "q": dots(1, 2, 3, 4, 5), "r": dots(1, 2, 3, 5), "s": dots(2, 3, 4), "t": dots(2, 3, 4, 5),
+    "u": dots(1, 3, 6), "v": dots(1, 2, 3, 6), "w": dots(2, 4, 5, 6), "x": dots(1, 3, 4, 6),
+    "y": dots(1, 3, 4, 5, 6), "z": dots(1, 3, 5, 6),
+}
+
+NUMBER_SIGN = dots(3, 4, 5, 6)
+LETTER_SIGN = dots(5, 6)     # "a"-"j" right after a number are letters
+DIGITS = {d: LETTERS[ch] for d, ch in zip("1234567890", "abcdefghij")}
+
+PUNCTUATION = {
+    " ": (0,),
+    ",": (dots(2),),
+    ";": (dots(2, 3),),
+    ":": (dots(2, 5),),
+    ".": (dots(2, 5, 6),),
+    "!": (dots(2, 3, 5),),
+    "?": (dots(2, 3, 6),),
+    "'": (dots(3),),
+    "-": (dots(3, 6),),
+    '"': (dots(5), dots(2, 3, 6)),
+    "(": (dots(5), dots(1, 2, 6)),
+    ")": (dots(5), dots(3, 4, 5)),
+    "/": (dots(4, 5, 6), dots(3, 4)),
+    "&": (dots(4), dots(1, 2, 3, 4, 6)),
+    "@": (dots(4), dots(1)),
+}
+
+# Grade 2: signs that stand for a whole word only
+WORDSIGNS = {
+    "but": "b", "can": "c", "do": "d", "every": "e", "from": "f", "go": "g",
+    "have": "h", "just": "j", "knowledge": "k", "like": "l", "more": "m",
+    "not": "n", "people": "p", "quite": "q", "rather": "r", "so": "s",
+    "that": "t", "us": "u", "very": "v", "will": "w", "it": "x", "you": "y",
+    "as": "z",
+}
+WORDSIGNS = {word: (LETTERS[ch],) for word, ch in WORDSIGNS.items()}
+WORDSIGNS.update({
+    "child": (dots(1, 6),), "shall": (dots(1, 4, 6),), "this": (dots(1, 4, 5, 6),),
+    "which": (dots(1, 5, 6),), "out": (dots(1, 2, 5, 6),), "still": (dots(3, 4),),
+    "in": (dots(3, 5),), "enough": (dots(2, 6),), "be": (dots(2, 3),),
+    "were": (dots(2, 3, 5, 6),), "his": (dots(2, 3, 6),), "was": (dots(3, 5, 6),),
+})
+
+# Grade 2: signs usable anywhere in a word (longest match wins)
+GROUPSIGNS = {
+    "and": dots(1, 2, 3, 4, 6), "for": dots(1, 2, 3, 4, 5, 6), "of": dots(1, 2, 3, 5, 6),
+    "the": dots(2, 3, 4, 6), "with": dots(2, 3, 4, 5, 6), "ing": dots(3, 4, 6),
+    "ch": dots(1, 6), "gh": dots(1, 2, 6), "sh": dots(1, 4, 6), "th": dots(1, 4, 5, 6),
+    "wh": dots(1, 5, 6), "ed": dots(1, 2, 4, 6), "er": dots(1, 2, 4, 5, 6),
+    "ou": dots(1, 2, 5, 6), "ow": dots(2, 4, 6), "st": dots(3, 4), "ar": dots(3, 4, 5),
+    "en": dots(2, 6), "in": dots(3, 5),
+}
+_GROUP_LENGTHS = sorted({len(g) for g in GROUPSIGNS}, reverse=True)
+
+_TOKEN_RE = re.compile(r"[a-z]+|[0-9]+(?:[.,][0-9]+)*|.", re.S)
+
+
+class BrailleTranslator:
+    """
+    Text -> cell patterns using precomputed tables. Word translations
+    are cached, since messages repeat the same everyday words.
+    """
+
+    def __init__(self, grade=1, cache_size=4096):
+        if grade not in (1, 2):
+            raise ValueError("grade must be 1 or 2")
+        self.grade = grade
+        self.cache_size = cache_size
+        self._words = {}
+
+    def word(self, word):
+        """Cells for one lowercase alphabetic word"""
+        cells = self._words.get(word)
+        if cells is not None:
+            return cells
+        if self.grade == 2 and word in WORDSIGNS:
+            cells = WORDSIGNS[word]
+        elif self.grade == 2:
+            out = []
+            i = 0
+            while i < len(word):
+                for n in _GROUP_LENGTHS:
+                    sign = GROUPSIGNS.get(word[i:i + n])
+                    if sign is not None:
+                        out.append(sign)
+                        i += n
+                        break
+                else:
+                    out.append(LETTERS[word[i]])
+                    i += 1
+            cells = tuple(out)
+        else:
+            cells = tuple(LETTERS[ch] for ch in word)
+        if len(self._words) >= self.cache_size:
+            self._words.clear()
+        self._words[word] = cells
+        return cells
+
+    def translate(self, text):
+        """List of cell patterns (0-63) for a message"""
+        cells = []
+        after_number = False
+        for token in _TOKEN_RE.findall(text.lower()):
+            first = token[0]
+            if "a" <= first <= "z":
+                if after_number and first <= "j":
+                    cells.append(LETTER_SIGN)
+                cells.extend(self.word(token))
+                after_number = False
+            elif "0" <= first <= "9":
+                cells.append(NUMBER_SIGN)
+                cells.extend(DIGITS[ch] if ch in DIGITS else PUNCTUATION[ch][0]
+                             for ch in token)
+                after_number = True
+            else:
+                # Unknown symbols are skipped, as the old firmware did
+                cells.extend(PUNCTUATION.get(token, ()))
+                after_number = False
+        return cells
+
+    def encode(self, text):
+        """Wire bytes, one per cell"""
+        return pack(self.translate(text))
+
+
+def pack(cells):
+    return bytes(CELL_FLAG | cell for cell in cells)
+
+
+def unpack(data):
+    """Cell patterns from wire bytes (anything outside 0x40-0x7F is dropped)"""
+    return [b & 0x3F for b in data if b & 0xC0 == CELL_FLAG]
+
+
+def to_unicode(cells):
+    """Cells as Unicode braille (U+2800 block), handy for logs and tests"""
+    return "".join(chr(0x2800 + cell) for cell in cells)
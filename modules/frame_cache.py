@@ -0,0 +1,178 @@
+# modules/frame_cache.py
+# Bounded LRU cache of decoded, display-sized sign clip frames, so
+# repeated phrases ("hello", "thank you") start playing instantly.
+
+import threading
+from collections import OrderedDict, namedtuple
+
+from PIL import Image
+
+from modules import metrics
+
+# Largest frame size the sign area shows (window is 800x480); bigger
+# GIFs are scaled down once at decode time, smaller ones are left alone
+DISPLAY_SIZE = (480, 270)
+CACHE_BUDGET_MB = 128
+
+# frames: list of PIL images (RGB, or P from the asset pack), delay: ms per frame
+Clip = namedtuple("Clip", ["frames", "delay", "nbytes"])
+
+
+def frame_bytes(frame):
+    return frame.width * frame.height * len(frame.getbands())
+
+
+def _gif_frames(path, max_size):
+    """Yield (RGB frame, delay_ms) one at a time, scaled to fit max_size"""
+    im = Image.open(path)
+    delay = im.info.get("duration", 100) or 100
+    index = 0
+    while True:
+        t0 = metrics.clock()
+        frame = im.convert("RGB")
+        if frame.width > max_size[0] or frame.height > max_size[1]:
+            frame.thumbnail(max_size, Image.Resampling.BILINEAR)
+        metrics.record_since("gif_decode", t0)
+        yield frame, delay
+        index += 1
+        try:
+            im.seek(index)
+        except EOFError:
+            break
+
+
+def decode_gif(path, max_size=DISPLAY_SIZE):
+    """
+    Decode every frame of a GIF (or a single still image) to RGB,
+    scaled to fit max_size.
+    """
+    frames = []
+    delay = 100
+    for frame, delay in _gif_frames(path, max_size):
+        frames.append(frame)
+    return Clip(frames, delay, sum(frame_bytes(f) for f in frames))
+
+
+def iter_frames(key, path, max_size=DISPLAY_SIZE):
+    """
+    Yield (frame, delay_ms) for a phrase one frame at a time, from the
+    asset pack when it has the clip, else from the GIF. Lets playback
+    start on frame 0 without decoding the rest first.
+    """
+    from modules import asset_pack
+
+    pack = asset_pack.get_pack()
+    if pack is not None and key in pack:
+        delay = pack.clips[key]["delay"]
+        for i in range(pack.frame_count(key)):
+            yield pack.frame(key, i), delay
+        return
+    yield from _gif_frames(path, max_size)
+
+
+def clip_info(key, path):
+    """(frame count, delay_ms) without decoding pixel data"""
+    from modules import asset_pack
+
+    pack = asset_pack.get_pack()
+    if pack is not None and key in pack:
+        return pack.frame_count(key), pack.clips[key]["delay"]
+    im = Image.open(path)
+    return getattr(im, "n_frames", 1), im.info.get("duration", 100) or 100
+
+
+def load_clip(key, path, max_size=DISPLAY_SIZE):
+    """
+    Frames for a phrase: from the prebuilt asset pack when it has the
+    clip (no GIF decoding), else decoded from the GIF.
+    """
+    from modules import asset_pack
+
+    pack = asset_pack.get_pack()
+    if pack is not None and key in pack:
+        return pack.clip(key)
+    return decode_gif(path, max_size)
+
+
+class FrameCache:
+    """LRU of decoded clips keyed by phrase, bounded by a byte budget"""
+
+    def __init__(self, budget_bytes=CACHE_BUDGET_MB * 1024 * 1024, max_size=DISPLAY_SIZE):
+        self.budget_bytes = budget_bytes
+        self.max_size = max_size
+        self.clips = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def peek(self, key, count=True):
+        """Cached clip or None, counting the hit/miss unless count=False"""
+        with self.lock:
+            clip = self.clips.get(key)
+            if clip is None:
+                self.misses += count
+                return None
+            self.clips.move_to_end(key)
+            self.hits += count
+            return clip
+
+    def get(self, key, path):
+        """Cached clip for `key`, decoding `path` on a miss"""
+        clip = self.peek(key)
+        if clip is None:
+            clip = load_clip(key, path, self.max_size)
+            self.put(key, clip)
+        return clip
+
+    def __contains__(self, key):
+        with self.lock:
+            return key in self.clips
+
+    def put(self, key, clip):
+        """
+        Insert a clip, evicting least recently used ones to stay within
+        budget. A clip larger than the whole budget is not cached.
+        """
+        if clip.nbytes > self.budget_bytes:
+            return
+        with self.lock:
+            old = self.clips.pop(key, None)
+            if old is not None:
+                self.bytes -= old.nbytes
+            self.clips[key] = clip
+            self.bytes += clip.nbytes
+            while self.bytes > self.budget_bytes:
+                _, evicted = self.clips.popitem(last=False)
+                self.bytes -= evicted.nbytes
+                self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.clips.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "clips": len(self.clips),
+                "bytes": self.bytes,
+                "budget_bytes": self.budget_bytes,
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """Shared frame cache for all sign playback"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = FrameCache()
+        return _cache
@@ -0,0 +1,310 @@
+# modules/history.py
+"""
+Session history: every recognised sign, speech transcript and piece of
+text spoken, brailled or signed, in one append-only log.
+
+    from modules import history
+    history.record("speech", "good morning", src="speech_to_sign")
+    entries = history.get_history().search("morning", kind="speech")
+    history.get_history().replay(entries[0]["id"], "braille")
+
+record() never touches the disk: the entry goes into a small in-memory
+index (the newest INDEX_SIZE entries, searched by the UI) and onto a
+queue that one writer thread drains in batches. The log is
+output/history.jsonl, one compact JSON line per entry:
+
+    {"id":1700000000123,"t":1700000000.12,"k":"speech","x":"good morning","src":"speech_to_sign"}
+
+To spare the SD card, the file is fsynced at most every FSYNC_INTERVAL
+seconds (and on close), so a power cut loses at most that much. Past
+MAX_KB it rolls over to history.jsonl.1 .. .KEEP.
+
+Kinds: "sign" (recognised sign), "speech" (transcript), "spoken" (TTS),
+"braille" (sent to the cell), "text_sign" (typed text shown as signs).
+
+    python3 -m modules.history                 # newest entries
+    python3 -m modules.history --search hello --kind speech
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+import argparse
+import threading
+from collections import deque
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from modules import utils
+
+# BRIDGE_HISTORY_PATH points the log elsewhere (load tests, scratch runs)
+LOG_PATH = os.environ.get("BRIDGE_HISTORY_PATH") or utils.abs_path("output", "history.jsonl")
+MAX_KB = 1024            # rolled over past this
+KEEP = 3                 # rolled-over files kept (history.jsonl.1 .. .3)
+FSYNC_INTERVAL = 5.0     # seconds between fsyncs while entries arrive
+INDEX_SIZE = 500         # newest entries kept in memory for search
+MAX_PENDING = 5000       # queued entries before the oldest are dropped (disk gone)
+
+KINDS = ("sign", "speech", "spoken", "braille", "text_sign")
+
+
+class HistoryLog:
+    """In-memory index of recent entries plus a background append-only writer"""
+
+    def __init__(self, path=LOG_PATH, max_kb=MAX_KB, keep=KEEP,
+                 fsync_interval=FSYNC_INTERVAL, index_size=INDEX_SIZE):
+        self.path = path
+        self.max_bytes = max_kb * 1024
+        self.keep = keep
+        self.fsync_interval = fsync_interval
+        self.index = deque(maxlen=index_size)
+        self.pending = deque()
+        self.dropped = 0
+        self.last_id = 0
+        self.written_id = 0      # newest entry handed to the OS
+        self.synced_id = 0       # newest entry known to be on disk
+        self.sync_requested = False
+        self.cond = threading.Condition()
+        self.loaded = threading.Event()
+        self.running = False
+        self.thread = None
+        self.file = None
+        self.synced_at = 0.0
+
+    # -----------------------------
+    # PUBLIC API
+    # -----------------------------
+    def start(self):
+        with self.cond:
+            if self.running:
+                return self
+            self.running = True
+        self.thread = threading.Thread(target=self._run, name="history-writer", daemon=True)
+        self.thread.start()
+        return self
+
+    def record(self, kind, text, **extra):
+        """Add an entry (never blocks on I/O). Returns it, or None for empty text."""
+        text = (text or "").strip()
+        if not text:
+            return None
+        now = time.time()
+        with self.cond:
+            # Millisecond ids: increasing, and unique across restarts
+            self.last_id = max(int(now * 1000), self.last_id + 1)
+            entry = {"id": self.last_id, "t": round(now, 2), "k": kind, "x": text}
+            entry.update(extra)
+            self.index.append(entry)
+            if len(self.pending) >= MAX_PENDING:
+                self.pending.popleft()
+                self.dropped += 1
+            self.pending.append(entry)
+            self.cond.notify_all()
+        return entry
+
+    def search(self, query="", kind=None, limit=50):
+        """Newest-first entries whose text contains `query` (any case)"""
+        self.loaded.wait(2.0)
+        query = query.lower().strip()
+        with self.cond:
+            entries = list(self.index)
+        found = []
+        for entry in reversed(entries):
+            if kind and entry["k"] != kind:
+                continue
+            if query and query not in entry["x"].lower():
+                continue
+            found.append(entry)
+            if len(found) >= limit:
+                break
+        return found
+
+    def get(self, entry_id):
+        with self.cond:
+            return next((e for e in self.index if e["id"] == entry_id), None)
+
+    def replay(self, entry_id, target):
+        """
+        Say an entry again ("speech") or send it to the braille cell
+        ("braille"). Returns the Utterance / BrailleJob; raises
+        KeyError for an unknown id, RuntimeError if braille is full.
+        """
+        entry = self.get(entry_id)
+        if entry is None:
+            raise KeyError(f"No history entry {entry_id}")
+        if target == "speech":
+            from modules import text_to_speech
+            utt = text_to_speech.get_worker().say(entry["x"])
+            self.record("spoken", entry["x"], src="replay", of=entry_id)
+            return utt
+        if target == "braille":
+            from modules import text_to_braille
+            job = text_to_braille.get_output().send(entry["x"])
+            self.record("braille", entry["x"], src="replay", of=entry_id)
+            return job
+        raise ValueError("target must be 'speech' or 'braille'")
+
+    def flush(self, timeout=5.0):
+        """Block until everything recorded so far is written and fsynced"""
+        with self.cond:
+            target = self.last_id
+            self.sync_requested = True
+            self.cond.notify_all()
+            return self.cond.wait_for(lambda: self.synced_id >= target or not self.running,
+                                      timeout)
+
+    def close(self):
+        self.flush()
+        with self.cond:
+            self.running = False
+            self.cond.notify_all()
+        if self.thread is not None:
+            self.thread.join(timeout=2)
+
+    # -----------------------------
+    # WRITER THREAD
+    # -----------------------------
+    def _tail(self, path):
+        """Parsed entries from the end of one log file"""
+        span = self.index.maxlen * 256        # enough for INDEX_SIZE short lines
+        try:
+            with open(path, "rb") as f:
+                size = f.seek(0, os.SEEK_END)
+                f.seek(max(0, size - span))
+                lines = f.read().decode("utf-8", "replace").splitlines()
+        except OSError:
+            return []
+        if size > span:
+            lines = lines[1:]                 # the first line is probably cut
+        entries = []
+        for line in lines:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                pass                          # torn line after a power cut
+        return entries
+
+    def _load(self):
+        """Fill the index from the end of the log (and the last rolled-over file)"""
+        old = self._tail(self.path)
+        if len(old) < self.index.maxlen:
+            old = self._tail(self.path + ".1") + old
+        with self.cond:
+            # Entries recorded while this was loading stay the newest
+            recent = list(self.index)
+            self.index.clear()
+            self.index.extend(old + recent)
+            self.last_id = max([self.last_id] + [e.get("id", 0) for e in old])
+
+    def _open(self):
+        utils.ensure_dir(os.path.dirname(self.path))
+        self.file = open(self.path, "ab+")
+        # Start on a fresh line if the last write was cut short
+        if self.file.tell():
+            self.file.seek(-1, os.SEEK_END)
+            if self.file.read(1) != b"\n":
+                self.file.write(b"\n")
+
+    def _rotate(self):
+        self._sync()
+        self.file.close()
+        for n in range(self.keep - 1, 0, -1):
+            src = f"{self.path}.{n}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{n + 1}")
+        os.replace(self.path, self.path + ".1")
+        self._open()
+
+    def _sync(self):
+        if self.synced_id < self.written_id and self.file is not None:
+            self.file.flush()
+            os.fsync(self.file.fileno())
+        self.synced_id = self.written_id
+        self.synced_at = time.monotonic()
+
+    def _run(self):
+        self._load()
+        self.loaded.set()
+        while True:
+            with self.cond:
+                if not self.pending and self.running and not self.sync_requested:
+                    # Wake for new entries, or when an fsync falls due
+                    unsynced = self.synced_id < self.written_id
+                    self.cond.wait(self.fsync_interval if unsynced else None)
+                batch = list(self.pending)
+                self.pending.clear()
+                sync_now, self.sync_requested = self.sync_requested, False
+                running = self.running
+            try:
+                if batch:
+                    if self.file is None:
+                        self._open()
+                    data = b"".join(json.dumps(e, separators=(",", ":")).encode() + b"\n"
+                                    for e in batch)
+                    # To the OS now (a crash loses nothing), to the card at the next fsync
+                    self.file.write(data)
+                    self.file.flush()
+                    self.written_id = batch[-1]["id"]
+                    if self.file.tell() > self.max_bytes:
+                        self._rotate()
+                if (sync_now or not running
+                        or time.monotonic() - self.synced_at >= self.fsync_interval):
+                    self._sync()
+            except OSError as e:
+                # This batch is lost; reopen the file for the next one
+                print(f"History write failed: {e}")
+                if self.file is not None:
+                    try:
+                        self.file.close()
+                    except OSError:
+                        pass
+                    self.file = None
+                if batch:
+                    self.written_id = batch[-1]["id"]
+                self.synced_id = self.written_id
+            with self.cond:
+                self.cond.notify_all()      # wake flush()
+            if not running:
+                break
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+_history = None
+_history_lock = threading.Lock()
+
+
+def get_history():
+    """The process-wide session history (writer starts on first use)"""
+    global _history
+    with _history_lock:
+        if _history is None:
+            _history = HistoryLog().start()
+            atexit.register(_history.close)
+        return _history
+
+
+def record(kind, text, **extra):
+    """Shortcut for get_history().record()"""
+    return get_history().record(kind, text, **extra)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search the BRIDGE session history")
+    parser.add_argument("--search", default="")
+    parser.add_argument("--kind", choices=KINDS)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    log = HistoryLog()
+    log._load()
+    log.loaded.set()
+    for entry in reversed(log.search(args.search, args.kind, args.limit)):
+        stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(entry["t"]))
+        print(f"{entry['id']:6d}  {stamp}  {entry['k']:9s}  {entry['x']}")
+
+
+if __name__ == "__main__":
+    main()
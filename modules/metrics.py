@@ -0,0 +1,250 @@
+# modules/metrics.py
+"""
+Lightweight in-process metrics: per-stage timings in fixed-size ring
+buffers, counters and gauges.
+
+Off by default. While disabled every call returns after one global
+check, so instrumentation can stay in hot loops:
+
+    t0 = metrics.clock()
+    frame = cap.read()
+    metrics.record_since("camera_read", t0)
+
+    metrics.count("predictions")
+    metrics.gauge("tts_queue", len(pending))
+    metrics.gauge_fn("braille_queue_cells", output.pending_cells)  # sampled on snapshot
+
+Enable with BRIDGE_METRICS=1 (or BRIDGE_DEBUG=1), or metrics.enable()
+at runtime (the GUI's F11 overlay does). While enabled, a snapshot is
+appended to output/metrics.jsonl every LOG_INTERVAL seconds; the log
+rolls over to metrics.jsonl.1 past LOG_MAX_KB.
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+from collections import deque
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from modules import utils
+
+RING_SIZE = 256              # samples kept per stage
+LOG_PATH = utils.abs_path("output", "metrics.jsonl")
+LOG_INTERVAL = 10.0          # seconds between snapshots in the log
+LOG_MAX_KB = 512
+
+# The pipeline stages the overlay lists first, in pipeline order
+STAGES = ("camera_read", "mediapipe", "prediction", "audio_capture", "vosk_decode",
+          "gif_decode", "sign_first_frame", "serial_write", "tts_first_audio")
+
+_enabled = bool(os.environ.get("BRIDGE_METRICS") or os.environ.get("BRIDGE_DEBUG"))
+_lock = threading.Lock()
+_stages = {}                 # name -> Stage
+_counters = {}               # name -> int
+_gauges = {}                 # name -> last value
+_gauge_fns = {}              # name -> callable sampled by snapshot()
+_logger = None
+
+
+class Stage:
+    """Recent durations of one stage (ms) plus lifetime totals"""
+
+    def __init__(self, size=RING_SIZE):
+        self.samples = deque(maxlen=size)
+        self.count = 0
+        self.total_ms = 0.0
+
+    def add(self, ms):
+        self.samples.append(ms)
+        self.count += 1
+        self.total_ms += ms
+
+    def summary(self):
+        ordered = sorted(self.samples)
+        n = len(ordered)
+        if not n:
+            return {"count": self.count}
+        return {
+            "count": self.count,
+            "last_ms": round(self.samples[-1], 2),
+            "p50_ms": round(ordered[n // 2], 2),
+            "p95_ms": round(ordered[min(n - 1, int(n * 0.95))], 2),
+            "max_ms": round(ordered[-1], 2),
+            "mean_ms": round(self.total_ms / self.count, 2),
+        }
+
+
+# -----------------------------
+# RECORDING (cheap when disabled)
+# -----------------------------
+def enabled():
+    return _enabled
+
+
+def clock():
+    """Start time for record_since(); 0.0 while disabled"""
+    return time.perf_counter() if _enabled else 0.0
+
+
+def record_since(stage, start):
+    """Record the time since a clock() reading"""
+    if not _enabled or not start:
+        return
+    record(stage, (time.perf_counter() - start) * 1000)
+
+
+def record(stage, ms):
+    """Record one duration in milliseconds"""
+    if not _enabled:
+        return
+    with _lock:
+        entry = _stages.get(stage)
+        if entry is None:
+            entry = _stages[stage] = Stage()
+        entry.add(ms)
+
+
+def record_many(stage, samples_ms):
+    """Merge durations measured elsewhere (e.g. the sign child process)"""
+    if not _enabled:
+        return
+    for ms in samples_ms:
+        record(stage, ms)
+
+
+def count(name, n=1):
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def gauge(name, value):
+    if not _enabled:
+        return
+    _gauges[name] = value
+
+
+def gauge_fn(name, fn):
+    """Register a gauge read on every snapshot (queue depths, etc.)"""
+    _gauge_fns[name] = fn
+
+
+def remove_gauge_fn(name):
+    _gauge_fns.pop(name, None)
+
+
+def drain_samples():
+    """{stage: [ms, ...]} recorded since the last drain, then forget them"""
+    with _lock:
+        drained = {name: list(stage.samples) for name, stage in _stages.items()
+                   if stage.samples}
+        _stages.clear()
+    return drained
+
+
+# -----------------------------
+# SYSTEM GAUGES
+# -----------------------------
+def _read_first(path):
+    with open(path) as f:
+        return f.readline()
+
+
+def system_gauges():
+    """CPU temperature, load and memory from sysfs/procfs (Linux only)"""
+    values = {}
+    try:
+        values["cpu_temp_c"] = int(_read_first("/sys/class/thermal/thermal_zone0/temp")) / 1000
+    except (OSError, ValueError):
+        pass
+    try:
+        values["load_1m"] = round(os.getloadavg()[0], 2)
+    except OSError:
+        pass
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    values["mem_available_mb"] = int(line.split()[1]) // 1024
+                    break
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    values["rss_mb"] = int(line.split()[1]) // 1024
+                    break
+    except (OSError, ValueError):
+        pass
+    return values
+
+
+# -----------------------------
+# SNAPSHOT / LOG
+# -----------------------------
+def snapshot():
+    """Everything recorded so far, summarised, plus fresh gauge readings"""
+    gauges = dict(_gauges)
+    gauges.update(system_gauges())
+    for name, fn in list(_gauge_fns.items()):
+        try:
+            gauges[name] = fn()
+        except Exception:
+            pass
+    with _lock:
+        stages = {name: stage.summary() for name, stage in _stages.items()}
+        counters = dict(_counters)
+    return {"time": time.time(), "stages": stages, "counters": counters, "gauges": gauges}
+
+
+class MetricsLogger:
+    """Appends a snapshot to a JSON-lines file at a fixed interval"""
+
+    def __init__(self, path=LOG_PATH, interval=LOG_INTERVAL, max_kb=LOG_MAX_KB):
+        self.path = path
+        self.interval = interval
+        self.max_bytes = max_kb * 1024
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="metrics-log", daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stop_event.set()
+
+    def write(self):
+        utils.ensure_dir(os.path.dirname(self.path))
+        try:
+            if os.path.getsize(self.path) > self.max_bytes:
+                os.replace(self.path, self.path + ".1")
+        except OSError:
+            pass
+        with open(self.path, "a") as f:
+            f.write(json.dumps(snapshot(), separators=(",", ":")) + "\n")
+
+    def _run(self):
+        while not self.stop_event.wait(self.interval):
+            try:
+                self.write()
+            except OSError as e:
+                print(f"Metrics log warning: {e}")
+
+
+def enable(log=True):
+    """Start recording (and logging, unless log=False)"""
+    global _enabled, _logger
+    _enabled = True
+    if log and _logger is None:
+        _logger = MetricsLogger().start()
+
+
+def disable():
+    """Stop recording; what was recorded is kept for the next enable()"""
+    global _enabled, _logger
+    _enabled = False
+    if _logger is not None:
+        _logger.stop()
+        _logger = None
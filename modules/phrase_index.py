@@ -0,0 +1,413 @@
+# modules/phrase_index.py
+# Phrase index for Text→Sign / Speech→Sign, built from the actual
+# ISL_Gifs/ filenames instead of hand-maintained lists.
+
+import os
+import re
+import string
+import threading
+from collections import namedtuple
+
+from modules import utils
+
+GIF_DIR = utils.abs_path("ISL_Gifs")
+LETTER_DIRS = [utils.abs_path("letters"), GIF_DIR]
+LETTER_EXTS = (".jpg", ".jpeg", ".png", ".gif")
+
+# kind: "phrase" (GIF clip) or "letter" (fingerspelling image)
+# path is None when no image exists for a letter
+PlanItem = namedtuple("PlanItem", ["kind", "text", "path"])
+
+# Minimum score (0-1) for a fuzzy phrase match to be accepted
+FUZZY_THRESHOLD = 0.75
+
+# Slips in the ISL_Gifs/ file names -> the words as written and spoken.
+# Keys stay as the files have them (that is what lookups match against);
+# only the display text is corrected.
+FILE_SPELLING = {
+    "ahemdabad": "ahmedabad",
+    "banglore": "bangalore",
+    "cilinic": "clinic",
+    "dont": "don't",
+    "lets": "let's",
+    "tommorow": "tomorrow",
+    "whats": "what's",
+}
+
+_END = object()
+_PUNCT_RE = re.compile("[" + re.escape(string.punctuation.replace("'", "")) + "]")
+
+
+def normalize(text):
+    """
+    Canonical phrase key: lowercase, apostrophes dropped ("today's" ->
+    "todays"), other punctuation turned into spaces, whitespace collapsed.
+    """
+    text = text.lower().replace("'", "").replace("’", "")
+    text = _PUNCT_RE.sub(" ", text)
+    return " ".join(text.split())
+
+
+# Longest deletion neighbourhood kept per vocabulary word
+MAX_WORD_EDITS = 2
+
+# Phrases scored per fuzzy lookup, those sharing the most words with the
+# query first (bounds the tail once the index holds thousands of phrases)
+MAX_CANDIDATES = 12
+
+
+def display_text(phrase):
+    """Readable text for a phrase file stem, with FILE_SPELLING applied"""
+    return " ".join(FILE_SPELLING.get(word.lower(), word) for word in phrase.split())
+
+
+def edit_distance(a, b):
+    """
+    Edit distance between two sequences (strings or token tuples):
+    insert, delete, substitute and swap of adjacent items each cost 1,
+    so "tommorow" vs "tomorrow" is 1 and "odor" vs "door" is 1.
+    """
+    if a == b:
+        return 0
+    prev2 = None
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if (i > 1 and j > 1 and a[i - 1] == b[j - 2]
+                    and a[i - 2] == b[j - 1]):
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        prev2, prev = prev, cur
+    return prev[-1]
+
+
+def deletions(word, depth):
+    """
+    Every string reachable from `word` by deleting up to `depth`
+    characters (the word itself included).
+    """
+    found = {word}
+    frontier = {word}
+    for _ in range(depth):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        found |= frontier
+    return found
+
+
+class PhraseIndex:
+    """Token trie over phrase keys with longest-match segmentation"""
+
+    def __init__(self, gif_dir=GIF_DIR, letter_dirs=LETTER_DIRS,
+                 fuzzy_threshold=FUZZY_THRESHOLD):
+        self.phrases = {}      # key -> gif path
+        self.display = {}      # key -> text as written ("what is today's date")
+        self.trie = {}
+        self.letters = {}      # 'a' -> image path
+        self.max_tokens = 0
+        self.fuzzy_threshold = fuzzy_threshold
+        self.words = set()
+        self.word_variants = {}   # deletion variant -> words (spelling slips)
+        self.phrase_variants = {} # token-deletion variant -> phrase keys
+        self._corrections = {}
+        self._pair_costs = {}
+        self._load_phrases(gif_dir)
+        self._load_letters(letter_dirs)
+
+    def _load_phrases(self, gif_dir):
+        if gif_dir is None:
+            return
+        if not os.path.isdir(gif_dir):
+            print(f"Phrase index: {gif_dir} not found")
+            return
+        for fname in sorted(os.listdir(gif_dir)):
+            stem, ext = os.path.splitext(fname)
+            if ext.lower() != ".gif":
+                continue
+            self.add(stem, os.path.join(gif_dir, fname))
+
+    def _load_letters(self, letter_dirs):
+        for ch in string.ascii_lowercase:
+            for folder in letter_dirs:
+                path = self._find_letter(folder, ch)
+                if path:
+                    self.letters[ch] = path
+                    break
+
+    @staticmethod
+    def _find_letter(folder, ch):
+        for name in (ch, ch.upper()):
+            for ext in LETTER_EXTS:
+                path = os.path.join(folder, name + ext)
+                if os.path.exists(path):
+                    return path
+        return None
+
+    def add(self, phrase, path):
+        """
+        Register a phrase clip. Duplicate keys keep the first path.
+        Returns the normalized key.
+        """
+        key = normalize(phrase)
+        if not key or key in self.phrases:
+            return key
+        self.phrases[key] = path
+        self.display[key] = display_text(phrase)
+
+        node = self.trie
+        tokens = key.split()
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node[_END] = key
+        self.max_tokens = max(self.max_tokens, len(tokens))
+
+        for variant in self._token_deletions(tokens):
+            self.phrase_variants.setdefault(variant, set()).add(key)
+        for token in set(tokens):
+            if token not in self.words:
+                self.words.add(token)
+                for variant in deletions(token, MAX_WORD_EDITS):
+                    self.word_variants.setdefault(variant, set()).add(token)
+        self._corrections.clear()
+        return key
+
+    def __contains__(self, phrase):
+        return normalize(phrase) in self.phrases
+
+    def __len__(self):
+        return len(self.phrases)
+
+    def texts(self):
+        """Every phrase as it is written and spoken (not the lookup keys)"""
+        return sorted(set(self.display.values()))
+
+    def lookup(self, phrase):
+        """GIF path for an exact (normalized) phrase, or None"""
+        return self.phrases.get(normalize(phrase))
+
+    def _longest_match(self, tokens, start):
+        """
+        Walk the trie from tokens[start]. Returns (key, end) of the
+        longest phrase found, or (None, start).
+        """
+        node = self.trie
+        best_key, best_end = None, start
+        i = start
+        while i < len(tokens):
+            node = node.get(tokens[i])
+            if node is None:
+                break
+            i += 1
+            if _END in node:
+                best_key, best_end = node[_END], i
+        return best_key, best_end
+
+    # -----------------------------
+    # FUZZY MATCHING
+    # -----------------------------
+    def _radius(self, length):
+        """Most edits a word of this length may need to pass threshold"""
+        return min(MAX_WORD_EDITS, int(length * (1 - self.fuzzy_threshold) + 1e-9))
+
+    def similar_words(self, word):
+        """
+        Vocabulary words near `word` as {word: edits}.
+
+        Symmetric-delete lookup: two words within k edits share a
+        deletion variant, so candidates come from a handful of hash
+        lookups no matter how large the vocabulary is.
+        """
+        cached = self._corrections.get(word)
+        if cached is not None:
+            return cached
+        radius = min(MAX_WORD_EDITS, max(1, len(word) // 4))
+        found = {}
+        candidates = set()
+        for variant in deletions(word, radius):
+            # Variants are stored MAX_WORD_EDITS deep; a word that needed
+            # more than `radius` deletions to reach this one is too far
+            # away, so skipping it loses nothing and keeps short words
+            # from pulling in hundreds of candidates
+            depth = radius + len(variant)
+            candidates.update(c for c in self.word_variants.get(variant, ())
+                              if len(c) <= depth)
+        for candidate in candidates:
+            d = edit_distance(word, candidate)
+            if d <= radius:
+                found[candidate] = d
+        if len(self._corrections) > 4096:
+            self._corrections.clear()
+        self._corrections[word] = found
+        return found
+
+    def correct_word(self, word):
+        """
+        Closest vocabulary word for a token if it is close enough to
+        pass the threshold, e.g. "tomorrow" -> "tommorow". Returns
+        (word, edits); unknown words come back unchanged.
+        """
+        if word in self.words:
+            return word, 0
+        near = [(d, w) for w, d in self.similar_words(word).items()
+                if d <= self._radius(max(len(w), len(word)))]
+        if not near:
+            return word, 0
+        d, best = min(near)
+        return best, d
+
+    def _correct_tokens(self, tokens):
+        return [self.correct_word(token)[0] for token in tokens]
+
+    def _token_cost(self, a, b):
+        if a == b:
+            return 0.0
+        cost = self._pair_costs.get((a, b))
+        if cost is None:
+            cost = edit_distance(a, b) / max(len(a), len(b))
+            if len(self._pair_costs) > 16384:
+                self._pair_costs.clear()
+            self._pair_costs[(a, b)] = cost
+        return cost
+
+    def _phrase_cost(self, query, phrase):
+        """
+        Token-level edit distance where a substitution costs the
+        normalized spelling distance of the two words (0-1) and a
+        missing or extra word costs 1.
+        """
+        prev = [float(j) for j in range(len(phrase) + 1)]
+        for i, q in enumerate(query, 1):
+            cur = [float(i)] + [0.0] * len(phrase)
+            for j, p in enumerate(phrase, 1):
+                cur[j] = min(prev[j] + 1, cur[j - 1] + 1,
+                             prev[j - 1] + self._token_cost(q, p))
+            prev = cur
+        return prev[-1]
+
+    def _token_deletions(self, tokens):
+        """
+        Token tuples left after deleting up to k words (k grows with
+        phrase length), never emptying the phrase. The same symmetric-
+        delete trick as for spelling, one level up: a phrase with one
+        word missing, extra or swapped shares a variant with the query.
+        """
+        k = min(MAX_WORD_EDITS, max(1, int(len(tokens) * (1 - self.fuzzy_threshold) + 1e-9)))
+        variants = {tuple(tokens)}
+        frontier = {tuple(tokens)}
+        for _ in range(k):
+            frontier = {v[:i] + v[i + 1:] for v in frontier if len(v) > 1
+                        for i in range(len(v))}
+            variants |= frontier
+        return variants
+
+    def best_match(self, text, threshold=None):
+        """
+        Best phrase for noisy text. Returns (key, score) with score in
+        0-1 (1.0 = exact), or (None, 0.0) if nothing reaches threshold.
+        """
+        threshold = self.fuzzy_threshold if threshold is None else threshold
+        tokens = normalize(text).split()
+        if not tokens:
+            return None, 0.0
+        key = " ".join(tokens)
+        if key in self.phrases:
+            return key, 1.0
+
+        # Candidates: phrases sharing a token-deletion variant with the
+        # query as heard, or with each unknown word swapped for its
+        # nearest vocabulary word. Both are hash lookups, so the cost
+        # does not grow with the number of phrases.
+        nearest = []
+        for token in tokens:
+            near = self.similar_words(token) if token not in self.words else {}
+            nearest.append(min(near, key=lambda w: (near[w], w)) if near else token)
+        candidates = set()
+        for query in {tuple(tokens), tuple(nearest)}:
+            for variant in self._token_deletions(query):
+                candidates |= self.phrase_variants.get(variant, set())
+
+        if len(candidates) > MAX_CANDIDATES:
+            # Words the query could have meant, spelling slips included
+            heard = set(tokens)
+            for token in tokens:
+                heard.update(self.similar_words(token))
+            candidates = sorted(candidates,
+                                key=lambda c: (-len(heard.intersection(c.split())),
+                                               abs(len(c.split()) - len(tokens)), c)
+                                )[:MAX_CANDIDATES]
+
+        best_key, best_score = None, 0.0
+        for candidate in sorted(candidates):
+            phrase = candidate.split()
+            longest = max(len(tokens), len(phrase))
+            # Each missing/extra word costs 1: skip hopeless candidates
+            if 1.0 - abs(len(tokens) - len(phrase)) / longest < max(threshold, best_score):
+                continue
+            cost = self._phrase_cost(tokens, phrase)
+            score = 1.0 - cost / longest
+            if score > best_score:
+                best_key, best_score = candidate, score
+        if best_score < threshold:
+            return None, 0.0
+        return best_key, best_score
+
+    def spell(self, word):
+        """Letter items for a word (non-letters are skipped)"""
+        return [PlanItem("letter", ch, self.letters.get(ch))
+                for ch in word if ch in string.ascii_lowercase]
+
+    def plan(self, text, fuzzy=True):
+        """
+        Segment a sentence into phrase clips plus spelled-out remainder,
+        in one left-to-right pass.
+
+        "good morning how are you" ->
+            [phrase "good morning", letters h-o-w, a-r-e, y-o-u]
+
+        With fuzzy=True, misspelled tokens are corrected against the
+        phrase vocabulary before segmenting, and each run of words that
+        would still be spelled out is tried as one approximate phrase
+        (e.g. an extra word from the recognizer). Exact matches around
+        such a run are kept.
+        """
+        tokens = normalize(text).split()
+        matched = self._correct_tokens(tokens) if fuzzy else tokens
+        items = []
+        spelled = []        # unmatched words waiting to be spelled
+        i = 0
+        while i < len(tokens):
+            key, end = self._longest_match(matched, i)
+            if key is not None:
+                items.extend(self._plan_leftover(spelled, fuzzy))
+                spelled = []
+                items.append(PlanItem("phrase", key, self.phrases[key]))
+                i = end
+            else:
+                spelled.append(tokens[i])
+                i += 1
+        items.extend(self._plan_leftover(spelled, fuzzy))
+        return items
+
+    def _plan_leftover(self, words, fuzzy):
+        """One approximate phrase for a run of unmatched words, else their letters"""
+        if not words:
+            return []
+        if fuzzy:
+            key, _ = self.best_match(" ".join(words))
+            if key is not None:
+                return [PlanItem("phrase", key, self.phrases[key])]
+        return [item for word in words for item in self.spell(word)]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index():
+    """Shared index, built on first use"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = PhraseIndex()
+        return _index
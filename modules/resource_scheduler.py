@@ -0,0 +1,356 @@
+# modules/resource_scheduler.py
+"""
+Thermal and load-aware budget for the heavy subsystems.
+
+A background thread reads the SoC temperature, CPU frequency and load
+from sysfs/procfs every few seconds and picks a level - normal, warm,
+hot or critical. Each level maps to a Budget that the camera pipeline,
+speech recognition and sign animation read:
+
+    budget = resource_scheduler.current_budget()
+    budget.camera_fps, budget.inference_scale, budget.prefetch, ...
+
+or subscribe to changes:
+
+    resource_scheduler.get_scheduler().subscribe(on_budget)
+
+The point is to shed load before the Pi 4's firmware throttles the
+whole SoC at 80-85 °C. Levels go up as soon as a threshold is crossed
+and come down only after the reading has stayed HYSTERESIS_C below it
+for COOLDOWN_S, so the budget does not flap. Every change is printed
+and appended to output/scheduler.jsonl with the readings behind it.
+
+Try it without a hot Pi (simulated heat ramp):
+    python3 -m modules.resource_scheduler --simulate ramp
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+from collections import deque
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from modules import metrics, utils
+
+POLL_INTERVAL = 2.0
+LOG_PATH = utils.abs_path("output", "scheduler.jsonl")
+
+LEVELS = ("normal", "warm", "hot", "critical")
+
+# Level entered at or above each temperature (°C)
+TEMP_THRESHOLDS = {"warm": 65.0, "hot": 72.0, "critical": 78.0}
+HYSTERESIS_C = 3.0
+COOLDOWN_S = 10.0
+
+# 1-minute load per core above which we are at least "warm"
+LOAD_PER_CORE_WARM = 0.9
+
+
+class Budget:
+    """What the heavy subsystems may use at one level"""
+
+    def __init__(self, level, camera_fps, inference_scale, asr_chunk_s,
+                 min_frame_ms, prefetch):
+        self.level = level
+        self.camera_fps = camera_fps             # sign camera frames per second
+        self.inference_scale = inference_scale   # MediaPipe input size factor
+        self.asr_chunk_s = asr_chunk_s           # seconds of audio per Vosk decode
+        self.min_frame_ms = min_frame_ms         # sign animation frame floor (0: none)
+        self.prefetch = prefetch                 # background clip/TTS pre-rendering
+
+    def as_dict(self):
+        return dict(self.__dict__)
+
+    def __repr__(self):
+        return f"Budget({self.as_dict()})"
+
+
+BUDGETS = {
+    "normal":   Budget("normal",   camera_fps=15, inference_scale=1.0,  asr_chunk_s=4,
+                       min_frame_ms=0,   prefetch=True),
+    "warm":     Budget("warm",     camera_fps=10, inference_scale=1.0,  asr_chunk_s=4,
+                       min_frame_ms=66,  prefetch=True),
+    "hot":      Budget("hot",      camera_fps=7,  inference_scale=0.75, asr_chunk_s=6,
+                       min_frame_ms=100, prefetch=False),
+    "critical": Budget("critical", camera_fps=4,  inference_scale=0.5,  asr_chunk_s=8,
+                       min_frame_ms=150, prefetch=False),
+}
+
+
+# -----------------------------
+# SENSORS
+# -----------------------------
+class Reading:
+    """One sample: temp_c, freq_mhz, max_freq_mhz, load_1m, cores, throttled"""
+
+    def __init__(self, temp_c=None, freq_mhz=None, max_freq_mhz=None, load_1m=0.0,
+                 cores=1, throttled=False):
+        self.temp_c = temp_c
+        self.freq_mhz = freq_mhz
+        self.max_freq_mhz = max_freq_mhz
+        self.load_1m = load_1m
+        self.cores = cores
+        self.throttled = throttled
+
+    def as_dict(self):
+        return dict(self.__dict__)
+
+
+class SysfsSensor:
+    """Readings from the running system (any field it cannot read is None)"""
+
+    TEMP_PATH = "/sys/class/thermal/thermal_zone0/temp"
+    FREQ_PATH = "/sys/devices/system/cpu/cpu0/cpufreq/scaling_cur_freq"
+    MAX_FREQ_PATH = "/sys/devices/system/cpu/cpu0/cpufreq/scaling_max_freq"
+
+    @staticmethod
+    def _read_int(path):
+        try:
+            with open(path) as f:
+                return int(f.read().strip())
+        except (OSError, ValueError):
+            return None
+
+    def read(self):
+        temp = self._read_int(self.TEMP_PATH)
+        freq = self._read_int(self.FREQ_PATH)
+        max_freq = self._read_int(self.MAX_FREQ_PATH)
+        try:
+            load = os.getloadavg()[0]
+        except OSError:
+            load = 0.0
+        reading = Reading(temp_c=temp / 1000 if temp is not None else None,
+                          freq_mhz=freq // 1000 if freq else None,
+                          max_freq_mhz=max_freq // 1000 if max_freq else None,
+                          load_1m=load, cores=os.cpu_count() or 1)
+        # Running well below the configured maximum under load means the
+        # firmware is already capping the clock
+        if reading.freq_mhz and reading.max_freq_mhz and load >= 1.0:
+            reading.throttled = reading.freq_mhz < 0.8 * reading.max_freq_mhz
+        return reading
+
+
+class SimulatedSensor:
+    """
+    Scripted readings for tests and demos: each read() returns the next
+    entry of `script` (dicts of Reading fields), repeating the last one.
+    set() overrides fields directly.
+    """
+
+    SCRIPTS = {
+        # Sustained load heating up, then cooling down again
+        "ramp": ([{"temp_c": 50 + 2 * i, "load_1m": 3.5} for i in range(16)]
+                 + [{"temp_c": 80 - 2 * i, "load_1m": 1.0} for i in range(16)]),
+        # Hovering right at a threshold: the budget must not flap
+        "flap": [{"temp_c": 72.4 if i % 2 else 71.6, "load_1m": 2.0} for i in range(20)],
+    }
+
+    def __init__(self, script=None, cores=4):
+        if isinstance(script, str):
+            script = self.SCRIPTS[script]
+        self.script = list(script or [{"temp_c": 45.0}])
+        self.index = 0
+        self.cores = cores
+        self.overrides = {}
+
+    def set(self, **fields):
+        self.overrides.update(fields)
+
+    def read(self):
+        fields = dict(self.script[min(self.index, len(self.script) - 1)])
+        self.index += 1
+        fields.update(self.overrides)
+        fields.setdefault("cores", self.cores)
+        return Reading(**fields)
+
+
+# -----------------------------
+# SCHEDULER
+# -----------------------------
+class ResourceScheduler:
+    """Turns sensor readings into a Budget, with hysteresis and a decision log"""
+
+    def __init__(self, sensor=None, interval=POLL_INTERVAL, log_path=LOG_PATH,
+                 clock=time.monotonic):
+        self.sensor = sensor or SysfsSensor()
+        self.interval = interval
+        self.log_path = log_path
+        self.clock = clock
+        self.level = "normal"
+        self.reading = None
+        self.below_since = None       # when readings first allowed a lower level
+        self.decisions = deque(maxlen=100)
+        self.subscribers = []
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    @property
+    def budget(self):
+        return BUDGETS[self.level]
+
+    def subscribe(self, callback):
+        """callback(budget) on every level change (scheduler thread)"""
+        with self.lock:
+            self.subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        with self.lock:
+            self.subscribers = [c for c in self.subscribers if c != callback]
+
+    def start(self):
+        if self.thread is not None:
+            return self
+        self.thread = threading.Thread(target=self._run, name="resource-scheduler",
+                                       daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stop_event.set()
+
+    def _run(self):
+        while True:
+            try:
+                self.step()
+            except Exception as e:
+                print(f"Resource scheduler warning: {e}")
+            if self.stop_event.wait(self.interval):
+                return
+
+    # -----------------------------
+    # DECISIONS
+    # -----------------------------
+    @staticmethod
+    def target_level(reading, hysteresis=0.0):
+        """
+        Level the reading calls for, and why. With hysteresis > 0 each
+        temperature threshold is lowered by that much (used to decide
+        whether it is safe to step down).
+        """
+        level, reason = "normal", "cool"
+        if reading.temp_c is not None:
+            for name in ("warm", "hot", "critical"):
+                if reading.temp_c >= TEMP_THRESHOLDS[name] - hysteresis:
+                    level, reason = name, f"temp {reading.temp_c:.1f} °C"
+        if reading.load_1m / max(1, reading.cores) >= LOAD_PER_CORE_WARM and level == "normal":
+            level, reason = "warm", f"load {reading.load_1m:.2f} on {reading.cores} cores"
+        if reading.throttled and LEVELS.index(level) < LEVELS.index("hot"):
+            level, reason = "hot", (f"clock capped at {reading.freq_mhz} of "
+                                    f"{reading.max_freq_mhz} MHz")
+        return level, reason
+
+    def step(self):
+        """Take one reading and apply it. Returns the current Budget."""
+        reading = self.sensor.read()
+        self.reading = reading
+        now = self.clock()
+
+        wanted, reason = self.target_level(reading)
+        current = LEVELS.index(self.level)
+        if LEVELS.index(wanted) > current:
+            # Heating up: shed load immediately
+            self.below_since = None
+            self._change(wanted, reason, reading)
+        elif LEVELS.index(wanted) < current:
+            # Cooling down: only once clear of the threshold for a while
+            held, _ = self.target_level(reading, hysteresis=HYSTERESIS_C)
+            if LEVELS.index(held) >= current:
+                self.below_since = None
+            elif self.below_since is None:
+                self.below_since = now
+            elif now - self.below_since >= COOLDOWN_S:
+                self.below_since = None
+                if reading.temp_c is not None:
+                    reason = f"cooled to {reading.temp_c:.1f} °C"
+                self._change(held, f"{reason} for {COOLDOWN_S:.0f} s", reading)
+        else:
+            self.below_since = None
+        metrics.gauge("thermal_level", LEVELS.index(self.level))
+        return self.budget
+
+    def _change(self, level, reason, reading):
+        previous, self.level = self.level, level
+        decision = {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "from": previous,
+            "to": level,
+            "reason": reason,
+            "reading": reading.as_dict(),
+            "budget": self.budget.as_dict(),
+        }
+        self.decisions.append(decision)
+        metrics.count("thermal_level_changes")
+        print(f"Resource budget: {previous} → {level} ({reason})")
+        if self.log_path:
+            try:
+                utils.ensure_dir(os.path.dirname(self.log_path))
+                with open(self.log_path, "a") as f:
+                    f.write(json.dumps(decision) + "\n")
+            except OSError as e:
+                print(f"Resource scheduler log warning: {e}")
+        with self.lock:
+            subscribers = list(self.subscribers)
+        for callback in subscribers:
+            try:
+                callback(self.budget)
+            except Exception as e:
+                print(f"Resource budget callback error: {e}")
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    """The process-wide scheduler (not polling until start())"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = ResourceScheduler()
+        return _scheduler
+
+
+def current_budget():
+    """The budget in force now ("normal" when no scheduler is running)"""
+    if _scheduler is None:
+        return BUDGETS["normal"]
+    return _scheduler.budget
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Thermal/load resource budget")
+    parser.add_argument("--simulate", choices=sorted(SimulatedSensor.SCRIPTS),
+                        help="replay a scripted sensor instead of reading sysfs")
+    parser.add_argument("--steps", type=int, default=40)
+    parser.add_argument("--interval", type=float, default=POLL_INTERVAL,
+                        help="seconds between readings (simulated time with --simulate)")
+    args = parser.parse_args()
+
+    if args.simulate:
+        # Simulated clock: no waiting between steps
+        now = [0.0]
+        scheduler = ResourceScheduler(SimulatedSensor(args.simulate), log_path=None,
+                                      clock=lambda: now[0])
+        for _ in range(args.steps):
+            budget = scheduler.step()
+            r = scheduler.reading
+            print(f"t={now[0]:5.0f}s  {r.temp_c:5.1f} °C  load {r.load_1m:.1f}  → {budget.level}")
+            now[0] += args.interval
+        print(f"{len(scheduler.decisions)} budget changes")
+        return
+
+    scheduler = ResourceScheduler(interval=args.interval)
+    for _ in range(args.steps):
+        budget = scheduler.step()
+        r = scheduler.reading
+        print(f"{r.temp_c} °C  {r.freq_mhz}/{r.max_freq_mhz} MHz  load {r.load_1m:.2f}  "
+              f"→ {budget.level}")
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
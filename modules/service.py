@@ -0,0 +1,749 @@
+# modules/service.py
+"""
+Headless service mode: the BRIDGE pipelines behind a local HTTP and
+WebSocket API, with no Tk window. Standard library only (asyncio).
+
+    python3 main.py --headless                 # 127.0.0.1:8765
+    python3 -m modules.service --port 9000 --synthetic-sign 30
+
+HTTP (JSON in, JSON out):
+    GET  /health             status, uptime, running tasks, clients
+    GET  /metrics            metrics.snapshot()
+    POST /sign/plan          {"text"} -> {"items": [{kind, text, path}]}
+    POST /speak              {"text", "wait"} -> TTS on the Pi's speaker
+    POST /braille            {"text", "wait"} -> queued on the braille cell
+    POST /speech_to_text     {"seconds"} -> {"text"} from the microphone
+    GET  /history            ?q=&kind=&limit= -> {"entries": [...]} newest first
+    POST /history/replay     {"id", "to": "speech" | "braille"}
+
+WebSocket (server -> client messages, JSON text frames):
+    /ws/sign                 {"type": "prediction", "label", "seq", "latency_ms"};
+                             with ?frames=1 also half-size JPEG previews as
+                             binary frames
+    /ws/speech               {"type": "partial" | "final", "text"} while connected
+
+If the camera or speech pipeline fails, clients get {"type": "error",
+"error"} and the socket is closed; reconnecting starts it again.
+
+Hardware is shared through the task executor's device slots
+(modules/tasks): there is one sign pipeline holding the camera, fanned
+out to every /ws/sign client, and one live recogniser holding a
+microphone slot, fanned out to every /ws/speech client. Each
+/speech_to_text request holds a microphone slot while it records. TTS and braille already serialise on their own
+worker threads. Blocking work never runs on the event loop.
+"""
+
+import os
+import sys
+import io
+import json
+import time
+import base64
+import signal
+import struct
+import asyncio
+import hashlib
+import argparse
+import itertools
+import threading
+from urllib.parse import urlsplit, parse_qs
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from modules import history, metrics, tasks, tracing, resource_scheduler
+
+HOST = "127.0.0.1"       # loopback only: the API has no authentication
+PORT = 8765
+MAX_HEADER = 16 * 1024
+MAX_BODY = 64 * 1024
+CLIENT_QUEUE = 32        # messages buffered per streaming client before the oldest is dropped
+FRAME_FPS = 8            # JPEG previews per second on /ws/sign?frames=1
+JPEG_QUALITY = 70
+ASR_BLOCK_TIMEOUT = 2.0
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+OP_TEXT, OP_BINARY, OP_CLOSE, OP_PING, OP_PONG = 0x1, 0x2, 0x8, 0x9, 0xA
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           409: "Conflict", 413: "Payload Too Large", 500: "Internal Server Error",
+           503: "Service Unavailable"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# -----------------------------
+# WEBSOCKET FRAMING (RFC 6455, shared with the load test client)
+# -----------------------------
+def ws_accept_key(key):
+    return base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+
+
+def ws_frame(opcode, payload, mask=False):
+    """One unfragmented frame. Clients must mask, servers must not."""
+    header = bytearray([0x80 | opcode])
+    length = len(payload)
+    mask_bit = 0x80 if mask else 0
+    if length < 126:
+        header.append(mask_bit | length)
+    elif length < 1 << 16:
+        header.append(mask_bit | 126)
+        header += struct.pack("!H", length)
+    else:
+        header.append(mask_bit | 127)
+        header += struct.pack("!Q", length)
+    if not mask:
+        return bytes(header) + payload
+    key = os.urandom(4)
+    masked = bytes(b ^ key[i % 4] for i, b in enumerate(payload))
+    return bytes(header) + key + masked
+
+
+async def ws_read_frame(reader, max_size=MAX_BODY):
+    """(opcode, payload) of the next message; continuation frames are joined"""
+    opcode = None
+    parts = []
+    while True:
+        b0, b1 = await reader.readexactly(2)
+        length = b1 & 0x7F
+        if length == 126:
+            length = struct.unpack("!H", await reader.readexactly(2))[0]
+        elif length == 127:
+            length = struct.unpack("!Q", await reader.readexactly(8))[0]
+        if length > max_size:
+            raise HTTPError(413, "WebSocket message too large")
+        key = await reader.readexactly(4) if b1 & 0x80 else None
+        payload = await reader.readexactly(length)
+        if key:
+            payload = bytes(b ^ key[i % 4] for i, b in enumerate(payload))
+        frame_op = b0 & 0x0F
+        if frame_op >= OP_CLOSE:
+            return frame_op, payload     # control frames are never fragmented
+        if frame_op:
+            opcode = frame_op
+        parts.append(payload)
+        if b0 & 0x80:
+            return opcode, b"".join(parts)
+
+
+class WebSocket:
+    """Server side of one upgraded connection"""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.closed = False
+        self.write_lock = asyncio.Lock()
+
+    async def send(self, message):
+        """str/dict -> text frame, bytes -> binary frame"""
+        if isinstance(message, bytes):
+            frame = ws_frame(OP_BINARY, message)
+        else:
+            if not isinstance(message, str):
+                message = json.dumps(message, separators=(",", ":"))
+            frame = ws_frame(OP_TEXT, message.encode())
+        async with self.write_lock:
+            self.writer.write(frame)
+            await self.writer.drain()
+
+    async def receive(self):
+        """Next text/binary payload, or None once the client has gone"""
+        while not self.closed:
+            try:
+                opcode, payload = await ws_read_frame(self.reader)
+            except (asyncio.IncompleteReadError, ConnectionError, HTTPError):
+                self.closed = True
+                return None
+            if opcode == OP_PING:
+                async with self.write_lock:
+                    self.writer.write(ws_frame(OP_PONG, payload))
+            elif opcode == OP_CLOSE:
+                await self.close()
+                return None
+            elif opcode in (OP_TEXT, OP_BINARY):
+                return payload
+        return None
+
+    async def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            async with self.write_lock:
+                self.writer.write(ws_frame(OP_CLOSE, struct.pack("!H", 1000)))
+                await self.writer.drain()
+        except ConnectionError:
+            pass
+
+
+# -----------------------------
+# THREAD -> EVENT LOOP BRIDGES
+# -----------------------------
+def wait_handle(handle):
+    """Future that resolves when a TaskHandle ends"""
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def done(h):
+        loop.call_soon_threadsafe(lambda: future.done() or future.set_result(h))
+
+    handle.add_done_callback(done)
+    return future
+
+
+class Outbox:
+    """
+    Bounded per-client message queue fed from any thread. When a slow
+    client falls behind, the oldest messages are dropped, never the
+    producer blocked.
+    """
+
+    CLOSE = object()     # queued by close(): pump() stops after what came before
+
+    def __init__(self, loop, size=CLIENT_QUEUE):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=size)
+        self.dropped = 0
+
+    def put(self, message):
+        """Thread-safe"""
+        try:
+            self.loop.call_soon_threadsafe(self._put, message)
+        except RuntimeError:
+            pass        # the event loop has shut down
+
+    def _put(self, message):
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(message)
+
+    def close(self):
+        """Thread-safe: end the stream once the queued messages are sent"""
+        self.put(self.CLOSE)
+
+    async def pump(self, ws):
+        """Send queued messages until close() or the socket fails"""
+        while True:
+            message = await self.queue.get()
+            if message is self.CLOSE:
+                return
+            try:
+                await ws.send(message)
+            except ConnectionError:
+                return
+
+
+def encode_jpeg(frame, quality=JPEG_QUALITY):
+    """BGR frame -> half-size JPEG bytes (the GUI preview's scale)"""
+    from PIL import Image
+    buf = io.BytesIO()
+    Image.fromarray(frame[::2, ::2, ::-1].copy()).save(buf, "JPEG", quality=quality)
+    return buf.getvalue()
+
+
+# -----------------------------
+# HUBS (one device, many clients)
+# -----------------------------
+class Hub:
+    """
+    Runs one pipeline task (holding its device slot) while at least one
+    client is subscribed, and fans its messages out to every
+    subscriber's Outbox. Subclasses set task/devices and define _run.
+
+    If the task fails (no camera, no speech model), every subscriber
+    gets an "error" message and its stream is closed; the next client
+    to subscribe starts the task again.
+    """
+
+    task = None
+    devices = ()
+
+    def __init__(self, executor):
+        self.executor = executor
+        self.subscribers = {}     # Outbox -> per-client option
+        self.lock = threading.Lock()
+        self.handle = None
+
+    def subscribe(self, outbox, option=False):
+        started = None
+        with self.lock:
+            self.subscribers[outbox] = option
+            # A pipeline still winding down restarts itself in _ended
+            if self.handle is None or not self.handle.active():
+                started = self._start()
+        if started is not None:
+            started.add_done_callback(self._ended)
+
+    def _start(self):
+        """
+        Submit the pipeline task (lock held). The caller adds the _ended
+        callback after releasing the lock: for a task that has already
+        finished it runs at once, and it takes the lock itself.
+        """
+        self.handle = self.executor.submit(self.task, self._run, devices=self.devices)
+        return self.handle
+
+    def _ended(self, handle):
+        started = None
+        closed = []
+        with self.lock:
+            if handle is not self.handle:
+                return
+            if handle.cancelled():
+                # Cancelled by the last unsubscribe, but someone came back
+                if self.subscribers:
+                    started = self._start()
+            else:
+                # Failed (or gave up): end every stream rather than leave
+                # clients connected to nothing
+                closed, self.subscribers = list(self.subscribers), {}
+        for outbox in closed:
+            if handle.error is not None:
+                outbox.put({"type": "error", "error": str(handle.error)})
+            outbox.close()
+        if started is not None:
+            started.add_done_callback(self._ended)
+
+    def unsubscribe(self, outbox):
+        with self.lock:
+            self.subscribers.pop(outbox, None)
+            if not self.subscribers and self.handle is not None:
+                self.handle.cancel()
+
+    def _publish(self, message, option_only=False):
+        with self.lock:
+            targets = [o for o, opt in self.subscribers.items() if opt or not option_only]
+        for outbox in targets:
+            outbox.put(message)
+
+    def _run(self, handle):
+        raise NotImplementedError
+
+
+class SignHub(Hub):
+    """
+    The sign pipeline as the "service_sign" task, holding the camera.
+    Subscribers get predictions; those subscribed with frames=True also
+    get preview frames.
+    """
+
+    task = "service_sign"
+    devices = ("camera",)
+
+    def __init__(self, executor, options=None):
+        super().__init__(executor)
+        self.options = dict(options or {})
+
+    def _on_prediction(self, message):
+        trace = message["trace"]
+        self._publish({"type": "prediction", "label": message["label"], "seq": message["seq"],
+                       "latency_ms": round((time.time() - message["captured_at"]) * 1000, 1)})
+        trace.step("send").finish()
+        if message["new_sign"]:
+            history.record("sign", message["label"], src="service")
+
+    def _on_state(self, state, detail):
+        self._publish({"type": "state", "state": state})
+
+    def _run(self, handle):
+        from modules import sign_process
+        pipeline = sign_process.SignProcess(on_prediction=self._on_prediction,
+                                            on_state=self._on_state, **self.options)
+        pipeline.start()
+        seq = -1
+        try:
+            while not handle.sleep(1.0 / FRAME_FPS):
+                if pipeline.state == "failed":
+                    raise RuntimeError(pipeline.last_error or "camera keeps crashing")
+                with self.lock:
+                    want_frames = any(self.subscribers.values())
+                if not want_frames:
+                    continue
+                seq, frame = pipeline.latest_frame(seq)
+                if frame is not None:
+                    self._publish(encode_jpeg(frame), option_only=True)
+        finally:
+            pipeline.stop()
+
+
+class SpeechHub(Hub):
+    """
+    One live recogniser as the "service_asr" task, holding a microphone
+    slot, shared by every /ws/speech client. Each final transcript is
+    recorded in the history once, however many clients hear it.
+    """
+
+    task = "service_asr"
+    devices = ("mic",)
+
+    def _run(self, handle):
+        from modules import audio_input
+        from modules import speech_to_text_vosk as stt
+        recognizer = stt.new_recognizer()
+        with audio_input.get_manager().subscribe(self.task) as mic:
+            last_partial = ""
+            trace = None
+            while not handle.cancelled():
+                # Longer chunks (fewer decodes) when the Pi runs hot
+                chunk_s = resource_scheduler.current_budget().asr_chunk_s
+                needed = int(chunk_s * audio_input.SAMPLE_RATE) * 2
+                audio = b""
+                while len(audio) < needed and not handle.cancelled():
+                    block = mic.read(timeout=ASR_BLOCK_TIMEOUT)
+                    if block is None:
+                        raise RuntimeError("Microphone stream stalled")
+                    audio += block
+                trace = trace or tracing.start("service_speech_stream")
+                trace.step("capture")
+                t0 = metrics.clock()
+                if recognizer.AcceptWaveform(audio):
+                    text = json.loads(recognizer.Result()).get("text", "")
+                    metrics.record_since("vosk_decode", t0)
+                    if text:
+                        self._publish({"type": "final", "text": text})
+                        history.record("speech", text, src="service")
+                        trace.step("recognize").finish()
+                        trace = None
+                    last_partial = ""
+                else:
+                    text = json.loads(recognizer.PartialResult()).get("partial", "")
+                    metrics.record_since("vosk_decode", t0)
+                    if text and text != last_partial:
+                        self._publish({"type": "partial", "text": text})
+                        last_partial = text
+
+
+# -----------------------------
+# SERVICE
+# -----------------------------
+class Service:
+    """The HTTP/WebSocket front end; one per process"""
+
+    def __init__(self, host=HOST, port=PORT, executor=None, sign_options=None):
+        self.host = host
+        self.port = port
+        self.executor = executor or tasks.get_executor()
+        self.sign_hub = SignHub(self.executor, sign_options)
+        self.speech_hub = SpeechHub(self.executor)
+        self.server = None
+        self.started = time.time()
+        self.clients = 0
+        self.requests = 0
+        self.ids = itertools.count(1)
+        self.routes = {
+            ("GET", "/health"): self.health,
+            ("GET", "/metrics"): self.metrics,
+            ("POST", "/sign/plan"): self.sign_plan,
+            ("POST", "/speak"): self.speak,
+            ("POST", "/braille"): self.braille,
+            ("POST", "/speech_to_text"): self.speech_to_text,
+            ("GET", "/history"): self.history_search,
+            ("POST", "/history/replay"): self.history_replay,
+        }
+        self.sockets = {
+            "/ws/sign": self.ws_sign,
+            "/ws/speech": self.ws_speech,
+        }
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._connection, self.host, self.port,
+                                                 limit=MAX_HEADER)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    # -----------------------------
+    # HTTP PLUMBING
+    # -----------------------------
+    async def _connection(self, reader, writer):
+        self.clients += 1
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except HTTPError as e:
+                    await self._respond(writer, e.status, {"error": str(e)}, keep_alive=False)
+                    return
+                if request is None:
+                    return
+                method, path, query, headers, body = request
+                self.requests += 1
+                if headers.get("upgrade", "").lower() == "websocket":
+                    await self._upgrade(reader, writer, path, query, headers)
+                    return
+                status, payload = await self._dispatch(method, path, query, body)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.clients -= 1
+            writer.close()
+
+    async def _read_request(self, reader):
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError:
+            return None
+        except asyncio.LimitOverrunError:
+            raise HTTPError(413, "Headers too large")
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, _ = lines[0].split(" ", 2)
+        except ValueError:
+            raise HTTPError(400, "Malformed request line")
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            raise HTTPError(400, "Bad Content-Length")
+        if length < 0:
+            raise HTTPError(400, "Bad Content-Length")
+        if length > MAX_BODY:
+            raise HTTPError(413, "Body too large")
+        body = await reader.readexactly(length) if length else b""
+        url = urlsplit(target)
+        return method.upper(), url.path, parse_qs(url.query), headers, body
+
+    async def _dispatch(self, method, path, query, body):
+        handler = self.routes.get((method, path))
+        if handler is None:
+            if any(p == path for _, p in self.routes):
+                return 405, {"error": f"{method} not allowed on {path}"}
+            return 404, {"error": f"No route {path}"}
+        try:
+            data = json.loads(body) if body else {}
+            if not isinstance(data, dict):
+                raise ValueError("body must be a JSON object")
+        except ValueError as e:
+            return 400, {"error": f"Bad JSON: {e}"}
+        # Query parameters count as fields too (GET routes have no body)
+        for name, values in query.items():
+            data.setdefault(name, values[-1])
+        try:
+            return 200, await handler(data)
+        except HTTPError as e:
+            return e.status, {"error": str(e)}
+        except Exception as e:
+            print(f"Service error on {path}: {e}")
+            return 500, {"error": str(e)}
+
+    @staticmethod
+    async def _respond(writer, status, payload, keep_alive=True):
+        body = json.dumps(payload, separators=(",", ":")).encode()
+        head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode() + body)
+        await writer.drain()
+
+    async def _upgrade(self, reader, writer, path, query, headers):
+        handler = self.sockets.get(path)
+        key = headers.get("sec-websocket-key")
+        if handler is None or not key:
+            await self._respond(writer, 404 if handler is None else 400,
+                                {"error": f"No WebSocket at {path}"}, keep_alive=False)
+            return
+        writer.write((f"HTTP/1.1 101 Switching Protocols\r\n"
+                      f"Upgrade: websocket\r\nConnection: Upgrade\r\n"
+                      f"Sec-WebSocket-Accept: {ws_accept_key(key)}\r\n\r\n").encode())
+        await writer.drain()
+        ws = WebSocket(reader, writer)
+        try:
+            await handler(ws, query)
+        finally:
+            await ws.close()
+
+    @staticmethod
+    def _text(data):
+        text = str(data.get("text", "")).strip()
+        if not text:
+            raise HTTPError(400, "text is required")
+        return text
+
+    # -----------------------------
+    # HTTP ROUTES
+    # -----------------------------
+    async def health(self, data):
+        with self.executor.lock:
+            handles = list(self.executor.handles.items())
+        running = {name: h.status for name, h in handles if h.active()}
+        return {"status": "ok", "uptime_s": round(time.time() - self.started, 1),
+                "clients": self.clients, "requests": self.requests, "tasks": running,
+                "budget": resource_scheduler.current_budget().level}
+
+    async def metrics(self, data):
+        return metrics.snapshot()
+
+    async def sign_plan(self, data):
+        from modules import phrase_index
+        text = self._text(data)
+        trace = tracing.start("service_text_to_sign")
+        # The index is built on first use (a directory scan): off the loop
+        plan = await asyncio.to_thread(phrase_index.get_index().plan, text)
+        trace.step("lookup").finish()
+        history.record("text_sign", text, src="service")
+        return {"items": [{"kind": i.kind, "text": i.text, "path": i.path} for i in plan]}
+
+    async def speak(self, data):
+        from modules import text_to_speech
+        text = self._text(data)
+        utt = text_to_speech.get_worker().say(text, trace=tracing.start("service_text_to_speech"))
+        history.record("spoken", text, src="service")
+        if data.get("wait"):
+            await asyncio.to_thread(utt.wait, float(data.get("timeout", 60)))
+        return {"id": utt.id, "status": utt.status, "source": utt.source,
+                "first_audio_ms": utt.first_audio_ms}
+
+    async def braille(self, data):
+        from modules import text_to_braille
+        text = self._text(data)
+        trace = tracing.start("service_text_to_braille")
+        try:
+            # send() may wait for room under the "block" overflow policy
+            job = await asyncio.to_thread(text_to_braille.get_output().send, text, None, trace)
+        except RuntimeError as e:
+            raise HTTPError(503, str(e))
+        history.record("braille", text, src="service")
+        if data.get("wait"):
+            await asyncio.to_thread(job.wait, float(data.get("timeout", 120)))
+        return {"id": job.id, "status": job.status, "cells": job.total, "acked": job.acked}
+
+    async def speech_to_text(self, data):
+        seconds = float(data.get("seconds", 5))
+        if not 0 < seconds <= 30:
+            raise HTTPError(400, "seconds must be in (0, 30]")
+        trace = tracing.start("service_speech_to_text")
+
+        def run(handle):
+            from modules import speech_to_text_vosk as stt
+            stt.load_model()
+            audio = stt.record(duration=seconds)
+            trace.step("capture")
+            return stt.transcribe_bytes(audio)
+
+        handle = self.executor.submit(f"service_stt_{next(self.ids)}", run, devices=("mic",))
+        # One name per request: drop the handle once it is done
+        handle.add_done_callback(lambda h: self.executor.forget(h.name, h))
+        await wait_handle(handle)
+        if handle.error is not None:
+            trace.finish("failed")
+            raise HTTPError(503, str(handle.error))
+        trace.step("recognize").finish()
+        history.record("speech", handle.result, src="service")
+        return {"text": handle.result}
+
+    async def history_search(self, data):
+        try:
+            limit = int(data.get("limit", 50))
+        except ValueError:
+            raise HTTPError(400, "limit must be a number")
+        kind = data.get("kind") or None
+        if kind is not None and kind not in history.KINDS:
+            raise HTTPError(400, f"kind must be one of {', '.join(history.KINDS)}")
+        # search() may wait for the log to be read back on first use
+        entries = await asyncio.to_thread(history.get_history().search,
+                                          str(data.get("q", "")), kind, limit)
+        return {"entries": entries}
+
+    async def history_replay(self, data):
+        target = data.get("to")
+        if target not in ("speech", "braille"):
+            raise HTTPError(400, "to must be 'speech' or 'braille'")
+        try:
+            entry_id = int(data.get("id"))
+        except (TypeError, ValueError):
+            raise HTTPError(400, "id is required")
+        try:
+            result = await asyncio.to_thread(history.get_history().replay, entry_id, target)
+        except KeyError as e:
+            raise HTTPError(404, str(e.args[0]))
+        except RuntimeError as e:
+            raise HTTPError(503, str(e))
+        return {"id": entry_id, "to": target, "status": result.status}
+
+    # -----------------------------
+    # WEBSOCKET ROUTES
+    # -----------------------------
+    async def ws_sign(self, ws, query):
+        await self._stream(ws, self.sign_hub, query.get("frames", ["0"])[0] == "1")
+
+    async def ws_speech(self, ws, query):
+        await self._stream(ws, self.speech_hub)
+
+    async def _stream(self, ws, hub, option=False):
+        """Relay a hub to one client until either side ends the stream"""
+        outbox = Outbox(asyncio.get_running_loop())
+        hub.subscribe(outbox, option)
+        pump = asyncio.create_task(outbox.pump(ws))
+        # Nothing to read from clients; this only notices them leaving
+        closed = asyncio.create_task(self._drain(ws))
+        try:
+            await asyncio.wait([pump, closed], return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            hub.unsubscribe(outbox)
+            pump.cancel()
+            closed.cancel()
+
+    @staticmethod
+    async def _drain(ws):
+        while await ws.receive() is not None:
+            pass
+
+
+# -----------------------------
+# ENTRY POINT
+# -----------------------------
+async def serve(host=HOST, port=PORT, sign_options=None):
+    service = await Service(host, port, sign_options=sign_options).start()
+    print(f"BRIDGE service on http://{service.host}:{service.port}")
+    stopped = asyncio.Event()
+    try:
+        # systemd stops services with SIGTERM: shut down cleanly so
+        # queued history and settings are written
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stopped.set)
+    except (NotImplementedError, RuntimeError):
+        pass
+    try:
+        await stopped.wait()
+    finally:
+        await service.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="BRIDGE headless service (HTTP + WebSocket)")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--synthetic-sign", type=float, metavar="MS",
+                        help="generated frames and a stand-in model taking MS per frame "
+                             "instead of the camera (testing without hardware)")
+    args = parser.parse_args(argv)
+
+    sign_options = {"synthetic_ms": args.synthetic_sign} if args.synthetic_sign else None
+    resource_scheduler.get_scheduler().start()
+    try:
+        asyncio.run(serve(args.host, args.port, sign_options))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        tasks.get_executor().shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,417 @@
+# modules/sign_player.py
+# Tk widgets for sign clip playback (shared by the GUI and text_to_sign_isl.py)
+
+import time
+import queue
+import itertools
+import threading
+import tkinter as tk
+from collections import deque
+from PIL import Image, ImageTk
+
+from modules import frame_cache, metrics, resource_scheduler
+
+# Frames decoded ahead of playback by the streaming worker
+LOOKAHEAD = 4
+
+_END = object()
+
+
+class ImageLabel(tk.Label):
+    """
+    Label that plays a sign clip.
+
+    Cached clips play straight from the frame cache. Otherwise frame 0
+    is shown as soon as it is decoded while a worker thread decodes the
+    rest a few frames ahead; frames already shown are dropped unless
+    the clip is being cached.
+    """
+
+    def load(self, path, key=None, cache=True, on_first_frame=None,
+             loop=True, speed=1.0, on_done=None):
+        """
+        Play the clip at `path`. `key` is the cache key (the phrase);
+        defaults to the path. With cache=False the decoded frames are
+        never kept, so a looping clip is re-decoded each pass.
+        With loop=False the clip plays once and then calls on_done().
+        speed > 1 plays faster.
+        """
+        self.stop()
+        self.key = key or path
+        self.path = path
+        self.cache = cache
+        self.on_first_frame = on_first_frame
+        self.loop = loop
+        self.speed = speed
+        self.on_done = on_done
+        self.first_frame_ms = None
+        self.load_started = time.perf_counter()
+
+        _, delay = frame_cache.clip_info(self.key, path)
+        self._pace(delay)
+
+        clip = frame_cache.get_cache().peek(self.key)
+        if clip is not None:
+            self._play_cached(clip)
+        else:
+            self._start_stream()
+
+    def stop(self):
+        """Cancel playback and any decoding in progress"""
+        cancel = getattr(self, "cancel", None)
+        if cancel is not None:
+            cancel.set()
+        job = getattr(self, "job", None)
+        if job is not None:
+            self.after_cancel(job)
+        self.job = None
+        self.frames = []
+        self.photos = []
+
+    def destroy(self):
+        self.stop()
+        super().destroy()
+
+    def _scaled(self, delay):
+        return max(10, int(delay / self.speed))
+
+    def _pace(self, delay):
+        """
+        Frame delay and stride for a clip's own delay. Under the thermal
+        budget, frames are skipped rather than the sign slowed down.
+        """
+        self.delay = self._scaled(delay)
+        min_frame_ms = resource_scheduler.current_budget().min_frame_ms
+        self.stride = 1
+        if min_frame_ms and self.delay < min_frame_ms:
+            self.stride = -(-min_frame_ms // self.delay)
+            self.delay *= self.stride
+
+    def _finished(self):
+        self.job = None
+        if self.on_done:
+            self.on_done()
+
+    def _first_frame_shown(self):
+        if self.first_frame_ms is None:
+            self.first_frame_ms = (time.perf_counter() - self.load_started) * 1000
+            metrics.record("sign_first_frame", self.first_frame_ms)
+            if self.on_first_frame:
+                self.on_first_frame(self.first_frame_ms)
+
+    # -----------------------------
+    # CACHED PLAYBACK
+    # -----------------------------
+    def _play_cached(self, clip):
+        self.frames = clip.frames
+        self.photos = [None] * len(self.frames)
+        self._pace(clip.delay)
+        self.loc = 0
+        self.show(0)
+        self._first_frame_shown()
+        if len(self.frames) > 1 or not self.loop:
+            self.job = self.after(self.delay, self.next_frame)
+
+    def show(self, i):
+        # PhotoImages are made on the Tk thread, on first display
+        if self.photos[i] is None:
+            self.photos[i] = ImageTk.PhotoImage(self.frames[i])
+        self.config(image=self.photos[i])
+
+    def next_frame(self):
+        if self.frames:
+            if self.loc + self.stride >= len(self.frames) and not self.loop:
+                self._finished()
+                return
+            self.loc = (self.loc + self.stride) % len(self.frames)
+            self.show(self.loc)
+            self.job = self.after(self.delay, self.next_frame)
+
+    # -----------------------------
+    # STREAMING PLAYBACK
+    # -----------------------------
+    def _start_stream(self):
+        self.cancel = threading.Event()
+        self.pending = queue.Queue(maxsize=LOOKAHEAD)
+        self.decoded = 0
+        threading.Thread(target=self._decode,
+                         args=(self.key, self.path, self.cache, self.pending, self.cancel),
+                         daemon=True).start()
+        self._pump()
+
+    @staticmethod
+    def _decode(key, path, cache, pending, cancel):
+        """Worker: decode frames into the bounded queue, cache the whole clip"""
+        kept = []
+        delay = 100
+        try:
+            for frame, delay in frame_cache.iter_frames(key, path):
+                if cache:
+                    kept.append(frame)
+                while not cancel.is_set():
+                    try:
+                        pending.put(frame, timeout=0.1)
+                        break
+                    except queue.Full:
+                        pass
+                if cancel.is_set():
+                    return
+            if cache and kept:
+                nbytes = sum(frame_cache.frame_bytes(f) for f in kept)
+                frame_cache.get_cache().put(key, frame_cache.Clip(kept, delay, nbytes))
+        except Exception as e:
+            print(f"Sign decode error ({key}): {e}")
+        finally:
+            while not cancel.is_set():
+                try:
+                    pending.put(_END, timeout=0.1)
+                    break
+                except queue.Full:
+                    pass
+
+    def _pump(self):
+        """Tk side: show the next decoded frame, or wait a moment for it"""
+        while True:
+            try:
+                item = self.pending.get_nowait()
+            except queue.Empty:
+                self.job = self.after(5, self._pump)
+                return
+            if item is _END:
+                break
+            # Keep every stride-th frame (frame 0 always)
+            self.decoded += 1
+            if (self.decoded - 1) % self.stride == 0:
+                break
+
+        if item is _END:
+            self.cancel.set()
+            if not self.loop:
+                self._finished()
+                return
+            if self.decoded <= 1:
+                return   # still image: keep it on screen
+            clip = frame_cache.get_cache().peek(self.key, count=False) if self.cache else None
+            if clip is not None:
+                self.job = self.after(self.delay, lambda: self._play_cached(clip))
+            else:
+                self.job = self.after(self.delay, self._start_stream)
+            return
+
+        # Only the frame on screen is referenced; earlier ones are freed
+        self.photo = ImageTk.PhotoImage(item)
+        self.config(image=self.photo)
+        self._first_frame_shown()
+        self.job = self.after(self.delay, self._pump)
+
+
+class LetterAtlas:
+    """
+    Fingerspelling images for A-Z, decoded once and scaled to display
+    size. load() does the decoding and may run on any thread; photo()
+    turns a letter into a Tk image on first use (Tk thread only) and
+    keeps it, so spelling a word only re-points a label.
+    """
+
+    def __init__(self, letters, size=frame_cache.DISPLAY_SIZE):
+        self.letters = dict(letters)   # 'a' -> image path
+        self.size = size
+        self.images = {}               # 'a' -> PIL image
+        self.photos = {}               # 'a' -> PhotoImage
+        self.lock = threading.Lock()
+        self.loaded = False
+
+    def load(self):
+        """Decode every letter image (idempotent)"""
+        with self.lock:
+            if self.loaded:
+                return
+            for ch, path in self.letters.items():
+                try:
+                    im = Image.open(path)
+                    im.draft("RGB", self.size)   # JPEG: decode at reduced scale
+                    im = im.convert("RGB")
+                    im.thumbnail(self.size, Image.Resampling.BILINEAR)
+                    self.images[ch] = im
+                except Exception as e:
+                    print(f"Letter image unavailable ({ch}): {e}")
+            self.loaded = True
+
+    def __contains__(self, ch):
+        return ch in self.letters
+
+    def photo(self, ch):
+        """Tk image for a letter, or None if there is no image for it"""
+        photo = self.photos.get(ch)
+        if photo is None:
+            self.load()
+            image = self.images.get(ch)
+            if image is None:
+                return None
+            photo = self.photos[ch] = ImageTk.PhotoImage(image)
+        return photo
+
+
+_atlas = None
+_atlas_lock = threading.Lock()
+
+
+def get_atlas():
+    """Shared letter atlas over the phrase index's letter images"""
+    global _atlas
+    with _atlas_lock:
+        if _atlas is None:
+            from modules import phrase_index
+            _atlas = LetterAtlas(phrase_index.get_index().letters)
+        return _atlas
+
+
+class SignPlaybackSurface(tk.Frame):
+    """
+    One persistent playback area embedded in a page. Takes a queue of
+    plan items (phrase_index.PlanItem: phrase clips and letters) and
+    plays them back-to-back, prefetching the next clip into the frame
+    cache while the current one plays. Letters come from the shared
+    LetterAtlas.
+
+    submit()/clear() may be called from any thread; playback itself
+    runs on the Tk thread. A trace passed to submit() gets a "queue"
+    step when its first item starts and a "first_frame" step when that
+    item is on screen, then is finished; cleared before then, it is
+    finished as "dropped".
+    """
+
+    # How long a fingerspelled letter stays up at speed 1.0
+    LETTER_HOLD_MS = 900
+
+    def __init__(self, parent, speed=1.0, width=480, height=270, **kwargs):
+        kwargs.setdefault("bg", parent.cget("bg"))
+        super().__init__(parent, **kwargs)
+        self.speed = speed
+        self.items = deque()
+        self.inbox = queue.Queue()
+        self.current = None
+        self.hold_job = None
+        self.traces = {}          # play number -> trace of that submit
+        self.plays = itertools.count()
+        self.atlas = get_atlas()
+        self.idle = threading.Event()
+        self.idle.set()
+
+        self.caption = tk.Label(self, text="", font=("Arial", 12, "bold"),
+                                bg=self.cget("bg"), fg="#FF1493")
+        self.caption.pack()
+        self.screen = tk.Frame(self, width=width, height=height, bg="white")
+        self.screen.pack()
+        self.screen.pack_propagate(False)
+        self.label = ImageLabel(self.screen, bg="white", font=("Arial", 72, "bold"))
+        self.label.pack(expand=True)
+
+        self._poll()
+
+    # -----------------------------
+    # PUBLIC API
+    # -----------------------------
+    def submit(self, items, replace=False, trace=None):
+        """Queue plan items for playback (thread-safe)"""
+        self.idle.clear()
+        self.inbox.put((list(items), replace, trace))
+
+    def clear(self):
+        """Drop everything queued and stop the current clip (thread-safe)"""
+        self.inbox.put(([], True, None))
+
+    def set_speed(self, speed):
+        self.speed = speed
+
+    def wait_idle(self, timeout=None):
+        """Block (worker threads only) until the queue has played out"""
+        return self.idle.wait(timeout)
+
+    # -----------------------------
+    # TK SIDE
+    # -----------------------------
+    def _poll(self):
+        try:
+            while True:
+                items, replace, trace = self.inbox.get_nowait()
+                if replace:
+                    for dropped in self.traces.values():
+                        dropped.finish("dropped")
+                    self.traces.clear()
+                    self.items.clear()
+                    self.label.stop()
+                    if self.hold_job is not None:
+                        self.after_cancel(self.hold_job)
+                        self.hold_job = None
+                    self.current = None
+                # Items are queued as (play number, item); the trace is
+                # picked up when the first item of its play starts
+                play = next(self.plays)
+                if trace is not None:
+                    if items:
+                        self.traces[play] = trace
+                    else:
+                        trace.finish("empty")
+                self.items.extend((play, item) for item in items)
+        except queue.Empty:
+            pass
+
+        if self.current is None:
+            if self.items:
+                self._play_next()
+            elif not self.idle.is_set():
+                self.caption.config(text="")
+                self.idle.set()
+        self.after(50, self._poll)
+
+    def _play_next(self):
+        play, item = self.items.popleft()
+        self.current = item
+        trace = self.traces.pop(play, None)
+        if trace is not None:
+            trace.step("queue")
+        self._prefetch()
+
+        if item.kind == "phrase":
+            self.caption.config(text=item.text)
+            self.label.config(text="")
+            self.label.load(item.path, key=item.text, loop=False,
+                            speed=self.speed, on_done=self._item_done,
+                            on_first_frame=self._trace_shown(trace))
+        else:
+            # Letters come from the preloaded atlas: only the label changes.
+            # Each is held for LETTER_HOLD_MS / speed.
+            self.caption.config(text=item.text.upper())
+            self.label.stop()
+            photo = self.atlas.photo(item.text)
+            if photo is not None:
+                self.label.config(image=photo, text="")
+            else:
+                # No image for this letter: show the letter itself
+                self.label.config(image="", text=item.text.upper())
+            self.hold_job = self.after(int(self.LETTER_HOLD_MS / self.speed),
+                                       self._item_done)
+            if trace is not None:
+                trace.step("first_frame").finish()
+
+    @staticmethod
+    def _trace_shown(trace):
+        """on_first_frame callback closing a trace, or None"""
+        if trace is None:
+            return None
+        return lambda ms: trace.step("first_frame").finish()
+
+    def _item_done(self):
+        self.hold_job = None
+        self.current = None
+
+    def _prefetch(self):
+        """Warm the frame cache with the next phrase clip in the background"""
+        upcoming = next((i for _, i in self.items if i.kind == "phrase"), None)
+        if upcoming is None or upcoming.text in frame_cache.get_cache():
+            return
+        if not resource_scheduler.current_budget().prefetch:
+            return
+        threading.Thread(target=frame_cache.get_cache().get,
+                         args=(upcoming.text, upcoming.path), daemon=True).start()
@@ -0,0 +1,543 @@
+# modules/sign_process.py
+"""
+Sign → Text in a child process.
+
+Capture, MediaPipe and the sign classifier run in their own process so
+they never hold the Tk process's GIL. Annotated frames come back
+through a shared-memory ring buffer (FrameRing): the child copies each
+frame into the next slot and the GUI reads the newest one, with no
+pickling per frame. Predictions and once-a-second metrics are small
+dicts on a multiprocessing queue.
+
+SignProcess supervises the child and restarts it with backoff if it
+dies, so a crash in native camera or MediaPipe code costs a second of
+video instead of the app.
+
+    proc = SignProcess(on_prediction=lambda msg: print(msg["label"]))
+    proc.start()
+    seq, frame = proc.latest_frame()
+    proc.stop()
+
+Set BRIDGE_SIGN_MODE=thread to fall back to the old in-process loop
+(sign_to_text.run with its OpenCV window).
+"""
+
+import os
+import sys
+import time
+import queue
+import threading
+import multiprocessing as mp
+from multiprocessing import shared_memory
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from modules import metrics, resource_scheduler, tracing, utils
+
+MODE_ENV = "BRIDGE_SIGN_MODE"    # "process" (default) or "thread"
+
+SETTINGS_KEY = "camera"          # settings section: index, fps
+CAMERA_INDEX = 0                 # defaults when the settings have none
+CAMERA_FPS = 15
+FRAME_SHAPE = (480, 640, 3)      # height, width, BGR
+RING_SLOTS = 4
+
+METRICS_INTERVAL = 1.0           # seconds between metrics messages
+STABLE_FRAMES = 3                # frames a new label (or no hand) must hold before it is reported
+RESTART_BACKOFF = (0.5, 1.0, 2.0, 5.0, 10.0)
+MAX_RESTARTS = 5                 # in a row; a child that ran HEALTHY_AFTER s resets the count
+HEALTHY_AFTER = 30.0
+STOP_TIMEOUT = 3.0
+
+
+def mode():
+    """"process" or "thread", from BRIDGE_SIGN_MODE"""
+    return "thread" if os.environ.get(MODE_ENV, "").lower() == "thread" else "process"
+
+
+# -----------------------------
+# SHARED-MEMORY FRAME RING
+# -----------------------------
+class FrameRing:
+    """
+    Fixed-size frames in one shared-memory block:
+
+        int64 header[0]          sequence number of the newest frame (-1: none)
+        int64 header[1 + i]      sequence number held by slot i (-1: being written)
+        uint8 frames[slots, h, w, 3]
+
+    One writer, any number of readers. The writer marks a slot -1,
+    copies the frame in, then stamps the slot and publishes the
+    sequence number. A reader copies the newest slot and checks the
+    stamp again afterwards, so a frame overwritten mid-copy is skipped
+    rather than shown torn.
+    """
+
+    def __init__(self, name=None, slots=RING_SLOTS, shape=FRAME_SHAPE):
+        self.slots = slots
+        self.shape = tuple(shape)
+        header_bytes = 8 * (1 + slots)
+        frame_bytes = int(np.prod(self.shape))
+        self.owner = name is None
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True,
+                                                  size=header_bytes + slots * frame_bytes)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.header = np.ndarray((1 + slots,), dtype=np.int64, buffer=self.shm.buf)
+        self.frames = np.ndarray((slots,) + self.shape, dtype=np.uint8,
+                                 buffer=self.shm.buf, offset=header_bytes)
+        if self.owner:
+            self.header[:] = -1
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def latest_seq(self):
+        return int(self.header[0])
+
+    def write(self, frame):
+        """Publish a frame (must match the ring's shape). Returns its sequence number."""
+        seq = int(self.header[0]) + 1
+        slot = seq % self.slots
+        self.header[1 + slot] = -1
+        self.frames[slot] = frame
+        self.header[1 + slot] = seq
+        self.header[0] = seq
+        return seq
+
+    def read(self, after=-1):
+        """
+        (seq, copy of the newest frame), or (seq, None) if there is no
+        frame newer than `after` or it was overwritten while copying.
+        """
+        seq = int(self.header[0])
+        if seq < 0 or seq <= after:
+            return seq, None
+        slot = seq % self.slots
+        if self.header[1 + slot] != seq:
+            return seq, None
+        frame = self.frames[slot].copy()
+        if self.header[1 + slot] != seq:
+            return seq, None
+        return seq, frame
+
+    def close(self):
+        # The numpy views must go before the mapping can be closed
+        self.header = self.frames = None
+        self.shm.close()
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+# -----------------------------
+# PIPELINE (child process, or a thread in "thread" mode)
+# -----------------------------
+def _camera_pipeline(options):
+    """(read_frame, recognize, release) for the real camera + sign model"""
+    import cv2
+    from modules import sign_to_text
+
+    sign_to_text.load()
+    height, width, _ = options["shape"]
+    cap = cv2.VideoCapture(options["camera_index"])
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+    cap.set(cv2.CAP_PROP_FPS, options["fps"])
+    if not cap.isOpened():
+        raise RuntimeError(f"Camera {options['camera_index']} could not be opened")
+
+    def read_frame():
+        ret, frame = cap.read()
+        if not ret:
+            return None
+        if frame.shape != options["shape"]:
+            frame = cv2.resize(frame, (width, height))
+        return frame
+
+    return read_frame, sign_to_text.recognize, cap.release
+
+
+def _synthetic_pipeline(options):
+    """
+    Camera-free stand-in for benchmarks: generated frames and a
+    pure-Python "model" that holds the GIL for synthetic_ms per frame,
+    like feature extraction and sklearn do between native calls.
+    """
+    frame = np.zeros(options["shape"], dtype=np.uint8)
+    counter = [0]
+
+    def read_frame():
+        counter[0] += 1
+        frame[:, :, 0] = counter[0] % 256
+        return frame
+
+    def recognize(image, scale=1.0):
+        # Work shrinks with the pixel count, like MediaPipe's
+        deadline = time.perf_counter() + options["synthetic_ms"] * scale * scale / 1000
+        n = 0
+        while time.perf_counter() < deadline:
+            n += 1
+        return "ABC"[counter[0] // 30 % 3]
+
+    return read_frame, recognize, lambda: None
+
+
+def run_pipeline(ring, send, stop, options, limits):
+    """
+    Capture → recognize → ring loop until stop is set. Calls
+    send({"type": "prediction", ...}) when the recognized sign changes
+    and the new label (or no hand, None) has held for STABLE_FRAMES
+    frames, so a hand entering or leaving the frame does not flicker,
+    and send({"type": "metrics", ...}) every METRICS_INTERVAL seconds.
+    With options["metrics"] the metrics message also carries the
+    per-stage samples recorded since the last one. Predictions carry
+    wall-clock times for when the frame was captured, read and
+    recognized, so the parent can trace them.
+    limits is [fps, inference scale], re-read every frame so the
+    resource budget can change them while running.
+    """
+    if options.get("metrics"):
+        metrics.enable(log=False)
+    if options.get("synthetic_ms"):
+        read_frame, recognize, release = _synthetic_pipeline(options)
+    else:
+        read_frame, recognize, release = _camera_pipeline(options)
+
+    send({"type": "ready", "pid": os.getpid()})
+    last_label = None
+    candidate = None        # label seen on the last frame(s) but not reported yet
+    candidate_frames = 0
+    candidate_times = None  # capture/read/recognize times of its first frame
+    frames = 0
+    infer_ms = []
+    window_start = time.perf_counter()
+    crash_after = options.get("crash_after")
+    try:
+        while not stop.is_set():
+            started = time.perf_counter()
+            captured_at = time.time()
+            frame = read_frame()
+            read_at = time.time()
+            metrics.record_since("camera_read", started)
+            if frame is None:
+                raise RuntimeError("camera returned no frame")
+
+            fps, scale = limits[0], limits[1]
+            label = recognize(frame, scale)
+            recognized_at = time.time()
+            infer_ms.append((time.perf_counter() - started) * 1000)
+            seq = ring.write(frame)
+            frames += 1
+
+            if label == last_label:
+                candidate, candidate_frames = None, 0
+            else:
+                if label != candidate:
+                    candidate, candidate_frames = label, 0
+                    candidate_times = (captured_at, read_at, recognized_at)
+                candidate_frames += 1
+                if candidate_frames >= STABLE_FRAMES:
+                    # Timed from the first frame showing it, so traces include the wait
+                    last_label, candidate, candidate_frames = label, None, 0
+                    send({"type": "prediction", "label": label, "seq": seq,
+                          "time": time.time(), "captured_at": candidate_times[0],
+                          "read_at": candidate_times[1], "recognized_at": candidate_times[2]})
+
+            now = time.perf_counter()
+            if now - window_start >= METRICS_INTERVAL:
+                message = {"type": "metrics", "fps": round(frames / (now - window_start), 1),
+                           "infer_ms": round(sum(infer_ms) / len(infer_ms), 1),
+                           "infer_max_ms": round(max(infer_ms), 1), "seq": seq}
+                if options.get("metrics"):
+                    message["stages"] = metrics.drain_samples()
+                send(message)
+                frames = 0
+                infer_ms = []
+                window_start = now
+
+            if crash_after is not None and seq >= crash_after:
+                os._exit(3)    # fault injection for the supervisor benchmark
+
+            # Pace to the camera rate; a slow model simply runs flat out
+            remaining = 1.0 / fps - (time.perf_counter() - started)
+            if remaining > 0:
+                stop.wait(remaining)
+    finally:
+        release()
+
+
+def _child_main(ring_name, events, stop, options, limits):
+    """Entry point of the child process"""
+    ring = FrameRing(ring_name, options["slots"], options["shape"])
+
+    def send(message):
+        try:
+            events.put_nowait(message)
+        except queue.Full:
+            pass    # the GUI is behind; the next message carries newer news
+
+    try:
+        run_pipeline(ring, send, stop, options, limits)
+    except Exception as e:
+        try:
+            events.put({"type": "error", "error": str(e)}, timeout=1)
+        except queue.Full:
+            pass
+        raise
+    finally:
+        ring.close()
+
+
+# -----------------------------
+# SUPERVISOR (GUI process)
+# -----------------------------
+class SignProcess:
+    """
+    Runs the pipeline in a supervised child process.
+
+    Callbacks run on the supervisor thread (post to the UI queue from
+    them): on_prediction(msg), on_metrics(msg), on_state(state, detail)
+    where state is "running", "restarting", "failed" or "stopped".
+    A prediction's msg["trace"] has run through capture, recognize and
+    ipc; on_prediction adds its own output step and finishes it.
+    msg["new_sign"] is True for a label (not None) other than the last
+    one flagged, i.e. when a sign belongs in the history.
+
+    camera_index and fps default to the "camera" settings. A new fps in
+    the settings applies at once; a new camera on the next start().
+    """
+
+    def __init__(self, on_prediction=None, on_metrics=None, on_state=None,
+                 camera_index=None, fps=None, shape=FRAME_SHAPE,
+                 slots=RING_SLOTS, synthetic_ms=0, crash_after=None,
+                 max_restarts=MAX_RESTARTS):
+        self.on_prediction = on_prediction
+        self.on_metrics = on_metrics
+        self.on_state = on_state
+        camera = utils.get_settings().section(SETTINGS_KEY)
+        if camera_index is None:
+            camera_index = camera.get("index", CAMERA_INDEX)
+        if fps is None:
+            fps = camera.get("fps", CAMERA_FPS)
+        self.options = {
+            "camera_index": camera_index,
+            "fps": fps,
+            "shape": tuple(shape),
+            "slots": slots,
+            "synthetic_ms": synthetic_ms,
+            "crash_after": crash_after,
+        }
+        self.max_restarts = max_restarts
+        # spawn, not fork: the child must not inherit Tk or the GUI's threads
+        self.ctx = mp.get_context("spawn")
+        # [fps, inference scale] shared with the child, set from the resource budget
+        self.limits = self.ctx.Array("d", [fps, 1.0], lock=False)
+        self.ring = None
+        self.events = None
+        self.proc = None
+        self.stop_event = None
+        self.supervisor = None
+        self.stopping = threading.Event()
+        self.state = "stopped"
+        self.restarts = 0
+        self.started_at = None
+        self.last_label = None
+        self.last_sign = None
+        self.last_metrics = None
+        self.last_error = None
+
+    def start(self):
+        if self.supervisor is not None:
+            return self
+        self.ring = FrameRing(slots=self.options["slots"], shape=self.options["shape"])
+        self.events = self.ctx.Queue(maxsize=256)
+        self.stopping.clear()
+        self._follow_budget(True)
+        self._spawn()
+        self.supervisor = threading.Thread(target=self._supervise, name="sign-supervisor",
+                                           daemon=True)
+        self.supervisor.start()
+        return self
+
+    def alive(self):
+        return self.proc is not None and self.proc.is_alive()
+
+    def set_budget(self, budget):
+        """Apply a resource budget: never faster than the requested fps"""
+        self.limits[0] = min(self.options["fps"], budget.camera_fps)
+        self.limits[1] = budget.inference_scale
+
+    def apply_settings(self, values):
+        """Camera settings changed: take the new fps (within the budget)"""
+        self.options["fps"] = values.get("fps", CAMERA_FPS)
+        self.set_budget(resource_scheduler.current_budget())
+
+    def _follow_budget(self, follow):
+        scheduler = resource_scheduler.get_scheduler()
+        settings = utils.get_settings()
+        if follow:
+            self.set_budget(resource_scheduler.current_budget())
+            scheduler.subscribe(self.set_budget)
+            settings.subscribe(SETTINGS_KEY, self.apply_settings)
+        else:
+            scheduler.unsubscribe(self.set_budget)
+            settings.unsubscribe(SETTINGS_KEY, self.apply_settings)
+
+    def latest_frame(self, after=-1):
+        """(seq, BGR frame copy or None) - see FrameRing.read"""
+        if self.ring is None:
+            return -1, None
+        return self.ring.read(after)
+
+    def stop(self, timeout=STOP_TIMEOUT):
+        if self.supervisor is None:
+            return
+        self.stopping.set()
+        self.stop_event.set()
+        self.proc.join(timeout)
+        if self.proc.is_alive():
+            self.proc.terminate()
+            self.proc.join(1.0)
+        self.supervisor.join(timeout)
+        self.supervisor = None
+        self._follow_budget(False)
+        self.events.close()
+        self.ring.close()
+        self.ring = None
+        self._set_state("stopped")
+
+    def _spawn(self):
+        # Stage timings are only collected in the child while metrics are on here
+        self.options["metrics"] = metrics.enabled()
+        self.stop_event = self.ctx.Event()
+        self.proc = self.ctx.Process(target=_child_main, name="bridge-sign", daemon=True,
+                                     args=(self.ring.name, self.events, self.stop_event,
+                                           self.options, self.limits))
+        self.proc.start()
+        self.started_at = time.perf_counter()
+        self._set_state("running", self.proc.pid)
+
+    def _set_state(self, state, detail=None):
+        self.state = state
+        if self.on_state:
+            try:
+                self.on_state(state, detail)
+            except Exception as e:
+                print(f"Sign process state callback error: {e}")
+
+    def _dispatch(self, message):
+        kind = message.get("type")
+        callback = None
+        if kind == "prediction":
+            self.last_label = message["label"]
+            message["new_sign"] = (message["label"] is not None
+                                   and message["label"] != self.last_sign)
+            if message["new_sign"]:
+                self.last_sign = message["label"]
+            trace = tracing.start("sign_to_text", at=message["captured_at"])
+            trace.step("capture", message["read_at"])
+            trace.step("recognize", message["recognized_at"])
+            message["trace"] = trace.step("ipc")
+            callback = self.on_prediction
+            if callback is None:
+                trace.finish()
+        elif kind == "metrics":
+            self.last_metrics = message
+            metrics.gauge("sign_fps", message["fps"])
+            for stage, samples in message.get("stages", {}).items():
+                metrics.record_many(stage, samples)
+            callback = self.on_metrics
+        elif kind == "error":
+            self.last_error = message["error"]
+            print(f"Sign process error: {self.last_error}")
+        if callback:
+            try:
+                callback(message)
+            except Exception as e:
+                print(f"Sign process callback error: {e}")
+
+    def _supervise(self):
+        while not self.stopping.is_set():
+            try:
+                self._dispatch(self.events.get(timeout=0.1))
+                continue
+            except queue.Empty:
+                pass
+            except (EOFError, OSError):
+                break
+
+            if self.proc.is_alive() or self.stopping.is_set():
+                continue
+
+            # The child died on its own: restart it with backoff
+            code = self.proc.exitcode
+            if time.perf_counter() - self.started_at > HEALTHY_AFTER:
+                self.restarts = 0
+            if self.restarts >= self.max_restarts:
+                print(f"Sign process exited ({code}); giving up after "
+                      f"{self.restarts} restarts")
+                self._set_state("failed", self.last_error or f"exit code {code}")
+                return
+            delay = RESTART_BACKOFF[min(self.restarts, len(RESTART_BACKOFF) - 1)]
+            self.restarts += 1
+            print(f"Sign process exited ({code}); restarting in {delay:.1f} s")
+            self._set_state("restarting", code)
+            if self.stopping.wait(delay):
+                return
+            self.options["crash_after"] = None    # injected faults fire once
+            self._spawn()
+
+
+class SignThread(SignProcess):
+    """
+    The same pipeline on a thread inside this process, with the same
+    interface as SignProcess (the benchmark's baseline). No supervision:
+    an exception ends it.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.limits = [self.options["fps"], 1.0]
+        self.thread = None
+        self.stop_event = threading.Event()
+
+    def start(self):
+        if self.thread is not None:
+            return self
+        self.ring = FrameRing(slots=self.options["slots"], shape=self.options["shape"])
+        self.stop_event.clear()
+        self._follow_budget(True)
+        self.thread = threading.Thread(target=self._run, name="sign-pipeline", daemon=True)
+        self.thread.start()
+        return self
+
+    def alive(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def stop(self, timeout=STOP_TIMEOUT):
+        if self.thread is None:
+            return
+        self.stop_event.set()
+        self.thread.join(timeout)
+        self.thread = None
+        self._follow_budget(False)
+        self.ring.close()
+        self.ring = None
+        self._set_state("stopped")
+
+    def _run(self):
+        self._set_state("running", os.getpid())
+        try:
+            # Messages are delivered straight from the pipeline thread
+            run_pipeline(self.ring, self._dispatch, self.stop_event, self.options,
+                         self.limits)
+        except Exception as e:
+            self.last_error = str(e)
+            print(f"Sign pipeline error: {e}")
+            self._set_state("failed", self.last_error)
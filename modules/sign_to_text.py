@@ -3,10 +3,12 @@
 
 import os
 import pickle
+import threading
 import cv2
-import mediapipe as mp
 import numpy as np
 
+from modules import metrics, utils
+
 # ------------------------------
 # ONLY CHANGE: Correct model path
 # ------------------------------
@@ -16,16 +18,34 @@ MODEL_PATH = os.path.join(
     "model.p"
 )
 
-model_dict = pickle.load(open(MODEL_PATH, 'rb'))
-model = model_dict['model']
+# Loaded by load() on first use (or by the GUI's startup warm-up), not at
+# import: unpickling the model and importing MediaPipe take seconds on a Pi
+model = None
+hands = None
+mp_hands = None
+mp_drawing = None
+mp_drawing_styles = None
+_load_lock = threading.Lock()
+
+
+def load():
+    """Load the sign model and MediaPipe Hands once"""
+    global model, hands, mp_hands, mp_drawing, mp_drawing_styles
+    with _load_lock:
+        if model is not None:
+            return model
+        import mediapipe as mp
 
-cap = cv2.VideoCapture(0)
+        with open(MODEL_PATH, 'rb') as f:
+            model_dict = pickle.load(f)
 
-mp_hands = mp.solutions.hands
-mp_drawing = mp.solutions.drawing_utils
-mp_drawing_styles = mp.solutions.drawing_styles
+        mp_hands = mp.solutions.hands
+        mp_drawing = mp.solutions.drawing_utils
+        mp_drawing_styles = mp.solutions.drawing_styles
 
-hands = mp_hands.Hands(static_image_mode=True, min_detection_confidence=0.3)
+        hands = mp_hands.Hands(static_image_mode=True, min_detection_confidence=0.3)
+        model = model_dict['model']
+        return model
 
 labels_dict = {0: 'A', 1: 'B', 2: 'C', 3: 'D', 4: 'E', 5: 'F', 6: 'G', 7: 'H',
                8: 'I', 9: 'J', 10: 'K', 11: 'L', 12: 'M', 13: 'N', 14: 'O',
@@ -33,62 +53,102 @@ labels_dict = {0: 'A', 1: 'B', 2: 'C', 3: 'D', 4: 'E', 5: 'F', 6: 'G', 7: 'H',
                22: 'W', 23: 'X', 24: 'Y', 25: 'Z', 26: 'Hello', 27: 'Done',
                28: 'Thank You', 29: 'I Love you', 30: 'Sorry', 31: 'Please', 32: 'You are welcome.'}
 
-def run():  # <-- ONLY addition so main.py can call it
-    while True:
-
-        data_aux = []
-        x_ = []
-        y_ = []
-
+def recognize(frame, scale=1.0):
+    """
+    Find the hand in one BGR frame, predict its sign and draw the
+    landmarks and label onto the frame. Returns the label, or None when
+    no sign was recognized. scale < 1 runs MediaPipe on a smaller copy
+    (the thermal budget's inference_scale); landmarks are normalized, so
+    the drawing is unaffected.
+    """
+    data_aux = []
+    x_ = []
+    y_ = []
+
+    H, W, _ = frame.shape
+
+    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    if scale < 1.0:
+        frame_rgb = cv2.resize(frame_rgb, None, fx=scale, fy=scale,
+                               interpolation=cv2.INTER_AREA)
+
+    t0 = metrics.clock()
+    results = hands.process(frame_rgb)
+    metrics.record_since("mediapipe", t0)
+    if not results.multi_hand_landmarks:
+        return None
+
+    for hand_landmarks in results.multi_hand_landmarks:
+        mp_drawing.draw_landmarks(
+            frame,
+            hand_landmarks,
+            mp_hands.HAND_CONNECTIONS,
+            mp_drawing_styles.get_default_hand_landmarks_style(),
+            mp_drawing_styles.get_default_hand_connections_style())
+
+    for hand_landmarks in results.multi_hand_landmarks:
+        for i in range(len(hand_landmarks.landmark)):
+            x = hand_landmarks.landmark[i].x
+            y = hand_landmarks.landmark[i].y
+
+            x_.append(x)
+            y_.append(y)
+
+        for i in range(len(hand_landmarks.landmark)):
+            x = hand_landmarks.landmark[i].x
+            y = hand_landmarks.landmark[i].y
+            data_aux.append(x - min(x_))
+            data_aux.append(y - min(y_))
+
+    x1 = int(min(x_) * W) - 10
+    y1 = int(min(y_) * H) - 10
+
+    x2 = int(max(x_) * W) - 10
+    y2 = int(max(y_) * H) - 10
+
+    t0 = metrics.clock()
+    try:
+        prediction = model.predict([np.asarray(data_aux)])
+    except Exception:
+        # e.g. two hands in view: more features than the model was trained on
+        metrics.count("prediction_errors")
+        return None
+    metrics.record_since("prediction", t0)
+
+    predicted_character = labels_dict[int(prediction[0])]
+
+    cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 0, 0), 4)
+    cv2.putText(frame, predicted_character, (x1, y1 - 10),
+                cv2.FONT_HERSHEY_SIMPLEX, 1.3, (0, 0, 0), 3,
+                cv2.LINE_AA)
+    return predicted_character
+
+
+def run(should_stop=None):  # <-- ONLY addition so main.py can call it
+    """
+    In-process camera loop with its own OpenCV window (press Q to stop).
+    should_stop() is checked every frame so a caller can end it too.
+    The GUI normally uses sign_process instead, which keeps this work
+    out of the Tk process.
+    """
+    load()
+    cap = cv2.VideoCapture(utils.get_settings().get("camera", "index", 0))
+    last_character = None
+    while should_stop is None or not should_stop():
+
+        t0 = metrics.clock()
         ret, frame = cap.read()
+        metrics.record_since("camera_read", t0)
+        if not ret:
+            print("Error: camera returned no frame")
+            break
 
-        H, W, _ = frame.shape
-
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-
-        results = hands.process(frame_rgb)
-        if results.multi_hand_landmarks:
-            for hand_landmarks in results.multi_hand_landmarks:
-                mp_drawing.draw_landmarks(
-                    frame,
-                    hand_landmarks,
-                    mp_hands.HAND_CONNECTIONS,
-                    mp_drawing_styles.get_default_hand_landmarks_style(),
-                    mp_drawing_styles.get_default_hand_connections_style())
-
-            for hand_landmarks in results.multi_hand_landmarks:
-                for i in range(len(hand_landmarks.landmark)):
-                    x = hand_landmarks.landmark[i].x
-                    y = hand_landmarks.landmark[i].y
-
-                    x_.append(x)
-                    y_.append(y)
-
-                for i in range(len(hand_landmarks.landmark)):
-                    x = hand_landmarks.landmark[i].x
-                    y = hand_landmarks.landmark[i].y
-                    data_aux.append(x - min(x_))
-                    data_aux.append(y - min(y_))
-
-            x1 = int(min(x_) * W) - 10
-            y1 = int(min(y_) * H) - 10
-
-            x2 = int(max(x_) * W) - 10
-            y2 = int(max(y_) * H) - 10
-
-        try:
-            prediction = model.predict([np.asarray(data_aux)])
-
-            predicted_character = labels_dict[int(prediction[0])]
+        # Printing every frame slows the loop on the Pi console; only
+        # report changes
+        predicted_character = recognize(frame)
+        if predicted_character and predicted_character != last_character:
             print("Predicted character : ", predicted_character)
-
-            cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 0, 0), 4)
-            cv2.putText(frame, predicted_character, (x1, y1 - 10),
-                        cv2.FONT_HERSHEY_SIMPLEX, 1.3, (0, 0, 0), 3,
-                        cv2.LINE_AA)
-
-        except Exception as e:
-            print("Error:", e)
+        last_character = predicted_character
 
         cv2.imshow('frame', frame)
 
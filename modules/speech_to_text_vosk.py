@@ -1,31 +1,88 @@
 # modules/speech_to_text_vosk.py
-import os, json, sounddevice as sd
+import os, json
 from vosk import Model, KaldiRecognizer
 
+from modules import metrics
+
 MODEL_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "models/vosk-model")
-MIC_DEVICE = 1  # update this if needed (use `arecord -l`)
+SAMPLE_RATE = 16000
 
-def listen_and_transcribe(duration=5):
-    if not os.path.exists(MODEL_PATH):
-        raise FileNotFoundError("Vosk model missing in models/vosk-model/")
-    model = Model(MODEL_PATH)
-    rec = KaldiRecognizer(model, 16000)
-    fs = 16000
+_model = None
+
+
+def load_model():
+    """
+    Load the Vosk model once and share it between recognizers.
+    Loading takes several seconds on the Pi, so every caller
+    (GUI, benchmark, CLI) should go through here.
+    """
+    global _model
+    if _model is None:
+        if not os.path.exists(MODEL_PATH):
+            raise FileNotFoundError("Vosk model missing in models/vosk-model/")
+        _model = Model(MODEL_PATH)
+    return _model
 
-    print("🎙 Listening... Speak now.")
-    recording = sd.rec(int(duration * fs),
-                       samplerate=fs,
-                       channels=1,
-                       dtype="int16",
-                       device=MIC_DEVICE)
-    sd.wait()
-    data = recording.tobytes()
 
+def new_recognizer():
+    """
+    Fresh recognizer on the shared model (recognizers keep state
+    between utterances, so use one per utterance or stream).
+    """
+    return KaldiRecognizer(load_model(), SAMPLE_RATE)
+
+
+def _result_text(raw):
+    return json.loads(raw).get("text", "")
+
+
+def transcribe_bytes(data, rec=None):
+    """
+    Batch path: feed a whole 16 kHz int16 mono buffer at once.
+    Returns the lowercase transcript.
+    """
+    rec = rec or new_recognizer()
+    parts = []
+    t0 = metrics.clock()
     if rec.AcceptWaveform(data):
-        res = json.loads(rec.Result())
-    else:
-        res = json.loads(rec.FinalResult())
+        parts.append(_result_text(rec.Result()))
+    parts.append(_result_text(rec.FinalResult()))
+    metrics.record_since("vosk_decode", t0)
+    return " ".join(p for p in parts if p).lower().strip()
+
+
+def transcribe_stream(chunks, rec=None):
+    """
+    Streaming path: feed audio chunk by chunk as it would arrive
+    from the microphone. Returns the lowercase transcript.
+    """
+    rec = rec or new_recognizer()
+    parts = []
+    for chunk in chunks:
+        t0 = metrics.clock()
+        if rec.AcceptWaveform(chunk):
+            parts.append(_result_text(rec.Result()))
+        metrics.record_since("vosk_decode", t0)
+    parts.append(_result_text(rec.FinalResult()))
+    return " ".join(p for p in parts if p).lower().strip()
+
+
+def record(duration=5):
+    """
+    Record `duration` seconds from the shared microphone stream
+    (device is chosen and persisted by modules/audio_input.py).
+    """
+    from modules import audio_input
+
+    return audio_input.get_manager().record(duration, name="speech_to_text")
+
+
+def listen_and_transcribe(duration=5):
+    load_model()
+
+    print("🎙 Listening... Speak now.")
+    data = record(duration)
 
-    text = res.get("text", "")
+    text = transcribe_bytes(data)
     print(f"🧾 Recognized (offline): {text}")
-    return text.lower().strip()
+    return text
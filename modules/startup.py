@@ -0,0 +1,160 @@
+# modules/startup.py
+"""
+Startup timeline and deferred warm-up.
+
+The GUI records what it does between process start and the first idle
+moment after the home screen is drawn (time-to-interactive), then warms
+up the heavy subsystems one at a time, highest priority first, on a
+background task. When the warm-up is done the whole timeline is written
+to output/startup_timeline.json and one summary line is appended to
+output/startup_history.jsonl so boot times can be compared over builds.
+
+    from modules import startup
+    timeline = startup.get_timeline()
+    with timeline.span("mascot"):
+        ...
+    timeline.mark("interactive")
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+from contextlib import contextmanager
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from modules import utils
+
+REPORT_PATH = utils.abs_path("output", "startup_timeline.json")
+HISTORY_PATH = utils.abs_path("output", "startup_history.jsonl")
+
+
+def process_age():
+    """
+    Seconds since this process was started by the OS, so the time the
+    interpreter spent before our first line runs is counted too. Falls
+    back to 0 where /proc is unavailable.
+    """
+    try:
+        with open("/proc/self/stat") as f:
+            # Field 22 (after the parenthesised command) is the start time
+            # in clock ticks since boot
+            fields = f.read().rsplit(")", 1)[1].split()
+        started = int(fields[19]) / os.sysconf("SC_CLK_TCK")
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return max(0.0, uptime - started)
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+
+class Timeline:
+    """Marks and spans in ms since process start"""
+
+    def __init__(self):
+        self.origin = time.perf_counter() - process_age()
+        self.events = []
+        self.lock = threading.Lock()
+
+    def now_ms(self):
+        return (time.perf_counter() - self.origin) * 1000
+
+    def mark(self, name):
+        """Record an instant (e.g. "home_shown")"""
+        at = round(self.now_ms(), 1)
+        with self.lock:
+            self.events.append({"name": name, "at_ms": at,
+                                "thread": threading.current_thread().name})
+        return at
+
+    @contextmanager
+    def span(self, name):
+        """Record how long the enclosed block took, and whether it failed"""
+        start = self.now_ms()
+        event = {"name": name, "at_ms": round(start, 1),
+                 "thread": threading.current_thread().name}
+        try:
+            yield event
+        except Exception as e:
+            event["error"] = str(e)
+            raise
+        finally:
+            event["duration_ms"] = round(self.now_ms() - start, 1)
+            with self.lock:
+                self.events.append(event)
+
+    def find(self, name):
+        with self.lock:
+            for event in self.events:
+                if event["name"] == name:
+                    return event
+        return None
+
+    def report(self):
+        with self.lock:
+            events = sorted(self.events, key=lambda e: e["at_ms"])
+        interactive = self.find("interactive")
+        warmed = self.find("warm_up_done")
+        return {
+            "time_to_interactive_ms": interactive["at_ms"] if interactive else None,
+            "warm_up_done_ms": warmed["at_ms"] if warmed else None,
+            "events": events,
+        }
+
+    def write(self, path=REPORT_PATH, history_path=HISTORY_PATH):
+        """Write the full timeline and append its summary to the history"""
+        report = self.report()
+        utils.ensure_dir(os.path.dirname(path))
+        utils.save_json(path, report)
+        if history_path:
+            summary = {
+                "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "time_to_interactive_ms": report["time_to_interactive_ms"],
+                "warm_up_done_ms": report["warm_up_done_ms"],
+                "failed": [e["name"] for e in report["events"] if "error" in e],
+            }
+            with open(history_path, "a") as f:
+                f.write(json.dumps(summary) + "\n")
+        return report
+
+
+class WarmUp:
+    """
+    Subsystems to load after the UI is up. Steps run one at a time,
+    lowest priority number first, so the most likely next action is
+    ready soonest and the Tk thread never competes with more than one
+    loader. A failing step is logged and skipped.
+    """
+
+    def __init__(self, timeline):
+        self.timeline = timeline
+        self.steps = []
+
+    def add(self, name, fn, priority=50):
+        self.steps.append((priority, len(self.steps), name, fn))
+
+    def run(self, handle=None):
+        """Run every step; fits TaskExecutor.submit (stops on cancel)"""
+        for _, _, name, fn in sorted(self.steps):
+            if handle is not None and handle.cancelled():
+                break
+            try:
+                with self.timeline.span("warm:" + name):
+                    fn()
+            except Exception as e:
+                print(f"Warm-up {name} failed: {e}")
+        self.timeline.mark("warm_up_done")
+
+
+_timeline = None
+_timeline_lock = threading.Lock()
+
+
+def get_timeline():
+    """The process-wide startup timeline"""
+    global _timeline
+    with _timeline_lock:
+        if _timeline is None:
+            _timeline = Timeline()
+        return _timeline
@@ -0,0 +1,202 @@
+# modules/tasks.py
+# Central task executor: a bounded worker pool, one handle per running
+# feature (status + cooperative cancel), and per-device slots so
+# features that share hardware wait for each other while the rest run
+# side by side.
+
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+MAX_WORKERS = 4
+
+# How many tasks may hold each device at once. The microphone is fanned
+# out by audio_input, so several listeners can share it; the camera
+# cannot be shared. Unlisted devices allow one holder.
+DEVICE_SLOTS = {
+    "mic": 4,
+    "camera": 1,
+}
+
+
+class TaskHandle:
+    """One submitted feature run: status, result and cooperative cancel"""
+
+    def __init__(self, name, devices):
+        self.name = name
+        self.devices = tuple(sorted(devices))
+        self.status = "queued"      # queued, waiting, running, done, failed, cancelled
+        self.result = None
+        self.error = None
+        self.submitted_at = time.perf_counter()
+        self.started_at = None
+        self.finished_at = None
+        self._cancel = threading.Event()
+        self._done = threading.Event()
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    def cancel(self):
+        """Ask the task to stop; it sees cancelled() and returns"""
+        self._cancel.set()
+
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def active(self):
+        return not self._done.is_set()
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+    def sleep(self, seconds):
+        """Sleep that wakes early on cancel. Returns True if cancelled."""
+        return self._cancel.wait(seconds)
+
+    def add_done_callback(self, callback):
+        """callback(handle) runs on the worker thread once the task ends"""
+        with self._lock:
+            if not self._done.is_set():
+                self._callbacks.append(callback)
+                return
+        callback(self)
+
+    def _finish(self, status):
+        self.status = status
+        self.finished_at = time.perf_counter()
+        with self._lock:
+            self._done.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback(self)
+            except Exception as e:
+                print(f"Task callback error ({self.name}): {e}")
+
+
+class TaskExecutor:
+    """
+    Runs feature tasks on a bounded pool. Each task is a function
+    fn(handle, *args) that should check handle.cancelled() regularly.
+    Only one task per name runs at a time.
+    """
+
+    def __init__(self, max_workers=MAX_WORKERS, device_slots=DEVICE_SLOTS):
+        self.pool = ThreadPoolExecutor(max_workers=max_workers,
+                                       thread_name_prefix="bridge-task")
+        self.device_slots = dict(device_slots)
+        self.devices = {}
+        self.handles = {}
+        self.lock = threading.Lock()
+
+    def _device(self, name):
+        with self.lock:
+            sem = self.devices.get(name)
+            if sem is None:
+                sem = self.devices[name] = threading.BoundedSemaphore(
+                    self.device_slots.get(name, 1))
+            return sem
+
+    def get(self, name):
+        """Latest handle for a feature, or None"""
+        with self.lock:
+            return self.handles.get(name)
+
+    def forget(self, name, handle=None):
+        """
+        Drop the finished handle of a one-off task (e.g. one per request)
+        so handles does not grow without bound. With `handle`, only that
+        handle is dropped, not a newer run under the same name.
+        """
+        with self.lock:
+            current = self.handles.get(name)
+            if current is not None and not current.active() and handle in (None, current):
+                del self.handles[name]
+
+    def running(self, name):
+        handle = self.get(name)
+        return handle is not None and handle.active()
+
+    def submit(self, name, fn, *args, devices=(), **kwargs):
+        """
+        Start feature `name`. Raises RuntimeError if it is already
+        running. Returns its TaskHandle.
+        """
+        with self.lock:
+            current = self.handles.get(name)
+            if current is not None and current.active():
+                raise RuntimeError(f"{name} is already running")
+            handle = self.handles[name] = TaskHandle(name, devices)
+        self.pool.submit(self._run, handle, fn, args, kwargs)
+        return handle
+
+    def cancel(self, name):
+        handle = self.get(name)
+        if handle is not None:
+            handle.cancel()
+        return handle
+
+    def cancel_all(self):
+        with self.lock:
+            handles = list(self.handles.values())
+        for handle in handles:
+            handle.cancel()
+
+    def _acquire(self, handle):
+        """Take every device slot the task needs, in a fixed order"""
+        held = []
+        for device in handle.devices:
+            sem = self._device(device)
+            if not sem.acquire(blocking=False):
+                handle.status = "waiting"
+                while not sem.acquire(timeout=0.1):
+                    if handle.cancelled():
+                        self._release(held)
+                        return None
+            held.append(sem)
+        return held
+
+    @staticmethod
+    def _release(held):
+        for sem in reversed(held):
+            sem.release()
+
+    def _run(self, handle, fn, args, kwargs):
+        held = self._acquire(handle)
+        if held is None:
+            handle._finish("cancelled")
+            return
+        status = "done"
+        try:
+            if handle.cancelled():
+                status = "cancelled"
+            else:
+                handle.status = "running"
+                handle.started_at = time.perf_counter()
+                handle.result = fn(handle, *args, **kwargs)
+                if handle.cancelled():
+                    status = "cancelled"
+        except Exception as e:
+            handle.error = e
+            status = "failed"
+            print(f"Task {handle.name} failed: {e}")
+        finally:
+            self._release(held)
+            handle._finish(status)
+
+    def shutdown(self, wait=False):
+        self.cancel_all()
+        self.pool.shutdown(wait=wait)
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """The process-wide task executor"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = TaskExecutor()
+        return _executor
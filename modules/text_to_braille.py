@@ -1,23 +1,500 @@
-import serial
+# modules/text_to_braille.py
+# Braille cell output: one long-lived serial connection to the Arduino,
+# auto-detected, cached in the profile and reopened after an unplug,
+# fed by a single writer thread from a bounded queue.
+#
+# Flow control: the Arduino answers every cell it has put on the
+# solenoids (after the reader pressed the advance button) with one ACK
+# byte (0x06). The writer keeps at most WINDOW unacknowledged cells in
+# flight, so the Pi knows how far the user has read and never floods
+# the Arduino's serial buffer. A message ends with "\n". If a window
+# goes unacknowledged for ACK_TIMEOUT seconds, a device that has never
+# sent an ACK is taken to be stock firmware and written to without flow
+# control from then on; one that has sent ACKs before fails the job.
+#
+# The stock Arduino sketch takes plain ASCII letters and sends no ACKs,
+# so PROTOCOL = "text" (without flow control) is the default. Firmware
+# that takes cells translated on the Pi (braille_translate), one byte
+# each (0x40 | dot pattern), and ACKs them is opted into with
+# "protocol": "binary" in the "braille" settings.
+
+import os
+import glob
+import fnmatch
+import itertools
+import threading
 import time
+from collections import deque
+
+import serial
 
-# Auto-detect port on Raspberry Pi
-PORT = "/dev/ttyACM0"   # may become /dev/ttyUSB0 on your Pi
+from modules import metrics, tracing, utils
+from modules.braille_translate import BrailleTranslator
+
+PORT_PATTERNS = ["/dev/ttyACM*", "/dev/ttyUSB*"]
 BAUD = 9600
+RESET_DELAY = 2.0        # the Arduino reboots when the port is opened
 
-def send_to_braille(text):
-    try:
-        arduino = serial.Serial(PORT, BAUD, timeout=1)
-        time.sleep(2)  # wait for Arduino reset
-        print("Connected to Arduino")
+# USB vendor IDs of Arduino boards and the usual USB-serial bridges,
+# tried before any other serial port
+ARDUINO_VIDS = {0x2341, 0x2A03, 0x1A86, 0x0403, 0x10C4}
+
+PROFILE_KEY = "braille"          # settings section: port, baud, protocol, grade, flow_control
+
+# Set to a port path to skip detection, e.g. the virtual device's
+PORT_ENV = "BRIDGE_BRAILLE_PORT"
+
+PROTOCOL = "text"        # "text" (ASCII, stock firmware) or "binary" (one byte per cell)
+GRADE = 2                # binary only: 1 letter by letter, 2 contracted
+
+ACK = b"\x06"
+WINDOW = 4               # cells sent ahead of the one being read
+ACK_TIMEOUT = 30.0       # seconds a window may wait for its next ACK
+QUEUE_CELLS = 512        # outbound buffer, in cells, across queued messages
+
+# What send() does when the buffer is full:
+#   "reject"       raise RuntimeError, queue unchanged
+#   "drop_oldest"  discard the oldest waiting messages to make room
+#                  (raise if even that would not be enough)
+#   "block"        wait (up to block_timeout) for the reader to catch up
+OVERFLOW_POLICIES = ("reject", "drop_oldest", "block")
+
+
+class BrailleDevice:
+    """Owns the serial port to the braille cell"""
+
+    def __init__(self, port=None, baud=BAUD, reset_delay=RESET_DELAY):
+        self.fixed_port = port     # skip detection (tests, virtual device)
+        self.port = port
+        self.baud = baud
+        self.reset_delay = reset_delay
+        self.serial = None
+        self.connects = 0
+        self.lock = threading.RLock()
+
+    # -----------------------------
+    # PORT DETECTION
+    # -----------------------------
+    def candidate_ports(self):
+        """
+        Ports to try, best first: the one saved in the profile, then
+        Arduino-like USB devices, then anything else matching
+        PORT_PATTERNS.
+        """
+        ports = []
+        try:
+            from serial.tools import list_ports
+            found = sorted(list_ports.comports(), key=lambda p: p.vid not in ARDUINO_VIDS)
+            ports = [p.device for p in found
+                     if any(fnmatch.fnmatch(p.device, pat) for pat in PORT_PATTERNS)]
+        except Exception:
+            pass
+        for pattern in PORT_PATTERNS:
+            ports += [p for p in sorted(glob.glob(pattern)) if p not in ports]
 
+        saved = utils.get_settings().get(PROFILE_KEY, "port")
+        if saved in ports:
+            ports.remove(saved)
+            ports.insert(0, saved)
+        return ports
+
+    def save_port(self):
+        utils.get_settings().set(PROFILE_KEY, port=self.port)
+
+    def _on_settings(self, values):
+        """Port or baud changed in the settings: reopen on the next write"""
+        port = values.get("port")
+        baud = values.get("baud", BAUD)
+        with self.lock:
+            if self.fixed_port or (port in (None, self.port) and baud == self.baud):
+                return
+            self.baud = baud
+            if port:
+                self.port = port
+            self.close()
+
+    # -----------------------------
+    # CONNECTION
+    # -----------------------------
+    def connected(self):
+        return self.serial is not None and self.serial.is_open
+
+    def connect(self):
+        """
+        Open the port once and wait out the Arduino reset. Later calls
+        are no-ops while the port stays open.
+        """
+        with self.lock:
+            if self.connected():
+                return
+            ports = [self.fixed_port] if self.fixed_port else self.candidate_ports()
+            if not ports:
+                raise RuntimeError("No braille device found on " + ", ".join(PORT_PATTERNS))
+
+            errors = []
+            for port in ports:
+                try:
+                    conn = serial.Serial(port, self.baud, timeout=1, write_timeout=2)
+                except (serial.SerialException, OSError) as e:
+                    errors.append(f"{port}: {e}")
+                    continue
+                time.sleep(self.reset_delay)
+                conn.reset_input_buffer()
+                self.serial = conn
+                self.connects += 1
+                self.port = port
+                if not self.fixed_port:
+                    self.save_port()
+                print(f"⠃ Braille device: {port}")
+                return
+            raise RuntimeError("Could not open braille device: " + "; ".join(errors))
+
+    def close(self):
+        with self.lock:
+            if self.serial is not None:
+                try:
+                    self.serial.close()
+                except Exception:
+                    pass
+                self.serial = None
+
+    def write(self, data):
+        """
+        Write bytes, reconnecting once if the device was unplugged or
+        reset since the last write.
+        """
+        with self.lock:
+            for attempt in (1, 2):
+                try:
+                    self.connect()
+                    t0 = metrics.clock()
+                    self.serial.write(data)
+                    self.serial.flush()
+                    metrics.record_since("serial_write", t0)
+                    return len(data)
+                except (serial.SerialException, OSError) as e:
+                    self.close()
+                    if attempt == 2:
+                        raise RuntimeError(f"Braille device lost: {e}") from e
+                    print(f"Braille device lost ({e}), reconnecting...")
+
+    def read(self, timeout):
+        """
+        Bytes the device has sent back, waiting up to `timeout` seconds
+        for the first one. b"" on timeout or when not connected.
+        """
+        with self.lock:
+            if not self.connected():
+                return b""
+            try:
+                self.serial.timeout = timeout
+                data = self.serial.read(1)
+                if data and self.serial.in_waiting:
+                    data += self.serial.read(self.serial.in_waiting)
+                return data
+            except (serial.SerialException, OSError) as e:
+                print(f"Braille device lost ({e})")
+                self.close()
+                return b""
+
+    def send_text(self, text):
         text = text.lower().strip()
         print(f"Sending: {text}")
+        return self.write((text + "\n").encode())
+
+
+class BrailleJob:
+    """One queued message and how far the reader has got through it"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, text, cells, on_progress=None, trace=None):
+        self.id = next(self._ids)
+        self.text = text
+        self.cells = cells          # list of bytes, one per cell
+        self.total = len(cells)
+        self.sent = 0
+        self.acked = 0
+        self.released = 0           # cells no longer counted against the buffer
+        self.status = "queued"      # queued, sending, done, dropped, cancelled, failed
+        self.on_progress = on_progress
+        self.trace = trace or tracing.NULL_TRACE
+        self.done = threading.Event()
+        self.done_at = None         # perf_counter() when the job ended
+
+    def wait(self, timeout=None):
+        return self.done.wait(timeout)
 
-        arduino.write((text + "\n").encode())
-        time.sleep(0.5)
+    def _report(self):
+        if self.on_progress:
+            try:
+                self.on_progress(self)
+            except Exception as e:
+                print(f"Braille progress callback error: {e}")
 
-        arduino.close()
+    def _finish(self, status):
+        self.status = status
+        self.done_at = time.perf_counter()
+        if status == "done":
+            self.trace.step("output")
+        self.trace.finish("ok" if status == "done" else status)
+        self.done.set()
+        self._report()
 
+
+class BrailleOutput:
+    """
+    Bounded outbound queue in front of a BrailleDevice, served by one
+    writer thread. Messages go out in order; only the writer touches
+    the serial port, so sends from different pages cannot interleave.
+    """
+
+    def __init__(self, device, window=WINDOW, max_cells=QUEUE_CELLS,
+                 overflow="reject", flow_control=True, block_timeout=30.0,
+                 protocol=PROTOCOL, grade=GRADE, ack_timeout=ACK_TIMEOUT):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}")
+        if protocol not in ("binary", "text"):
+            raise ValueError("protocol must be 'binary' or 'text'")
+        self.device = device
+        self.protocol = protocol
+        self.translator = BrailleTranslator(grade)
+        self.window = window
+        self.max_cells = max_cells
+        self.overflow = overflow
+        self.flow_control = flow_control   # False: firmware without ACKs
+        self.ack_timeout = ack_timeout
+        self.acks_seen = False             # the device has ACKed at least once
+        self.block_timeout = block_timeout
+        self.jobs = deque()
+        self.current = None
+        self.queued_cells = 0
+        self.dropped = 0
+        self.cond = threading.Condition()
+        self.thread = None
+        self.running = False
+
+    # -----------------------------
+    # PUBLIC API
+    # -----------------------------
+    def encode(self, text):
+        """Wire bytes for a message, one entry per cell"""
+        if self.protocol == "binary":
+            data = self.translator.encode(text.strip())
+        else:
+            data = text.lower().strip().encode("ascii", "replace")
+        return [data[i:i + 1] for i in range(len(data))]
+
+    def send(self, text, on_progress=None, trace=None):
+        """
+        Queue a message. on_progress(job) is called from the writer
+        thread as cells are acknowledged and when the job ends. A trace
+        gets "encode", "queue", "first_cell" and "output" steps and is
+        finished with the job. Returns the BrailleJob.
+        """
+        job = BrailleJob(text, self.encode(text), on_progress, trace)
+        job.trace.step("encode")
+        if job.total > self.max_cells:
+            raise RuntimeError(f"Message is {job.total} cells, buffer holds {self.max_cells}")
+
+        dropped = []
+        with self.cond:
+            if self.queued_cells + job.total > self.max_cells:
+                if self.overflow == "reject":
+                    raise RuntimeError("Braille buffer full")
+                if self.overflow == "drop_oldest":
+                    waiting = sum(old.total - old.released for old in self.jobs)
+                    if self.queued_cells - waiting + job.total > self.max_cells:
+                        # Dropping every waiting message would not make room
+                        # beside the one being read
+                        raise RuntimeError("Braille buffer full")
+                    while self.queued_cells + job.total > self.max_cells:
+                        old = self.jobs.popleft()
+                        self._release(old, old.total)
+                        self.dropped += 1
+                        dropped.append(old)
+                elif not self.cond.wait_for(
+                        lambda: self.queued_cells + job.total <= self.max_cells,
+                        timeout=self.block_timeout):
+                    raise RuntimeError("Braille buffer full (timed out waiting)")
+            self.jobs.append(job)
+            self.queued_cells += job.total
+            self.cond.notify_all()
+        for old in dropped:
+            old._finish("dropped")
+        self.start()
+        return job
+
+    def cancel_all(self):
+        """Drop every waiting message and stop the one being sent"""
+        with self.cond:
+            waiting = list(self.jobs)
+            self.jobs.clear()
+            for job in waiting:
+                self._release(job, job.total)
+            if self.current is not None:
+                self.current.status = "cancelled"
+            self.cond.notify_all()
+        for job in waiting:
+            job._finish("cancelled")
+
+    def pending_cells(self):
+        """Cells queued or in flight that the reader has not reached"""
+        with self.cond:
+            return self.queued_cells
+
+    def start(self):
+        with self.cond:
+            if self.running:
+                return
+            self.running = True
+        self.thread = threading.Thread(target=self._run, name="braille-writer", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        with self.cond:
+            self.running = False
+            self.cond.notify_all()
+        if self.thread is not None:
+            self.thread.join(timeout=2)
+
+    # -----------------------------
+    # WRITER THREAD
+    # -----------------------------
+    def _release(self, job, cells):
+        """Stop counting `cells` of a job against the buffer (lock held)"""
+        cells = min(cells, job.total - job.released)
+        job.released += cells
+        self.queued_cells -= cells
+        self.cond.notify_all()
+
+    def _next_job(self):
+        with self.cond:
+            self.cond.wait_for(lambda: self.jobs or not self.running, timeout=0.5)
+            if not self.jobs:
+                return None
+            self.current = self.jobs.popleft()
+            self.current.status = "sending"
+            return self.current
+
+    def _run(self):
+        while self.running:
+            job = self._next_job()
+            if job is None:
+                continue
+            job.trace.step("queue")
+            try:
+                self._send_job(job)
+            except Exception as e:
+                print("Braille error:", e)
+                job.status = "failed"
+            with self.cond:
+                self._release(job, job.total)
+                self.current = None
+            job._finish(job.status if job.status != "sending" else "done")
+
+    def _send_unacked(self, job):
+        """Write the rest of a job in one go (firmware without ACKs)"""
+        self.device.write(b"".join(job.cells[job.acked:]) + b"\n")
+        job.sent = job.acked = job.total
+
+    def _send_job(self, job):
+        if not self.flow_control:
+            self._send_unacked(job)
+            return
+
+        connects = self.device.connects
+        deadline = time.monotonic() + self.ack_timeout
+        while job.acked < job.total and job.status == "sending" and self.running:
+            # A reconnect means the Arduino rebooted and lost what was in flight
+            if self.device.connects != connects:
+                connects = self.device.connects
+                job.sent = job.acked
+                deadline = time.monotonic() + self.ack_timeout
+            while job.sent < job.total and job.sent - job.acked < self.window:
+                self.device.write(job.cells[job.sent])
+                job.sent += 1
+                if job.sent == job.total:
+                    self.device.write(b"\n")
+
+            acks = self.device.read(timeout=0.2).count(ACK)
+            if acks:
+                self.acks_seen = True
+                deadline = time.monotonic() + self.ack_timeout
+                acks = min(acks, job.sent - job.acked)
+                job.acked += acks
+                if job.acked == acks:
+                    job.trace.step("first_cell")
+                with self.cond:
+                    self._release(job, acks)
+                job._report()
+            elif not self.device.connected():
+                # Unplugged: keep retrying until it is back or we are cancelled
+                deadline = time.monotonic() + self.ack_timeout
+                try:
+                    self.device.connect()
+                except Exception as e:
+                    print(f"Braille reconnect failed: {e}")
+                    time.sleep(1.0)
+            elif time.monotonic() > deadline:
+                if self.acks_seen:
+                    print(f"Braille: no ACK for {self.ack_timeout:g} s, giving up on message")
+                    job.status = "failed"
+                    break
+                # Never heard an ACK: firmware without flow control
+                print("Braille: device sends no ACKs, turning flow control off")
+                self.flow_control = False
+                if job.sent < job.total:
+                    self.device.write(b"".join(job.cells[job.sent:]) + b"\n")
+                job.sent = job.acked = job.total
+                return
+
+        if job.status in ("cancelled", "failed") and 0 < job.sent < job.total:
+            self.device.write(b"\n")   # end the half-sent message
+
+
+_device = None
+_device_lock = threading.Lock()
+
+
+def get_device():
+    """The process-wide braille device"""
+    global _device
+    with _device_lock:
+        if _device is None:
+            settings = utils.get_settings()
+            _device = BrailleDevice(port=os.environ.get(PORT_ENV) or None,
+                                    baud=settings.get(PROFILE_KEY, "baud", BAUD))
+            settings.subscribe(PROFILE_KEY, _device._on_settings)
+        return _device
+
+
+_output = None
+_output_lock = threading.Lock()
+
+
+def get_output():
+    """The process-wide braille output queue"""
+    global _output
+    with _output_lock:
+        if _output is None:
+            settings = utils.get_settings()
+            protocol = settings.get(PROFILE_KEY, "protocol", PROTOCOL)
+            # The original ASCII firmware never ACKs
+            flow_control = settings.get(PROFILE_KEY, "flow_control", protocol == "binary")
+            _output = BrailleOutput(get_device(), protocol=protocol,
+                                    grade=settings.get(PROFILE_KEY, "grade", GRADE),
+                                    flow_control=bool(flow_control),
+                                    ack_timeout=settings.get(PROFILE_KEY, "ack_timeout",
+                                                             ACK_TIMEOUT))
+            metrics.gauge_fn("braille_queue_cells", _output.pending_cells)
+        return _output
+
+
+def send_to_braille(text, on_progress=None):
+    """Queue text for the braille cell. Returns the BrailleJob, or None on error."""
+    try:
+        return get_output().send(text, on_progress)
     except Exception as e:
         print("Braille error:", e)
+        return None
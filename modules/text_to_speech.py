@@ -1,25 +1,388 @@
-import pyttsx3
+# modules/text_to_speech.py
+# Offline Text → Speech: one worker thread owns the pyttsx3 engine and
+# speaks a queue of utterances, so the engine is started once and new
+# text can be queued (or interrupt) while something is playing.
+# Utterances already in the WAV cache (tts_cache) are played straight
+# through pygame.mixer; new ones are spoken live and rendered into the
+# cache afterwards, while the worker is idle.
 
-# Initialize offline TTS engine
-engine = pyttsx3.init()
+import os
+import sys
+import time
+import itertools
+import threading
+from collections import deque
 
-# Optional: Tune the voice
-engine.setProperty("rate", 150)      # speaking speed
-engine.setProperty("volume", 1.0)    # max volume
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from modules import metrics, resource_scheduler, tracing, utils
 
+SETTINGS_KEY = "tts"     # settings section: rate, volume, voice
+DEFAULT_RATE = 150       # speaking speed (words per minute)
+DEFAULT_VOLUME = 1.0
+RENDER_TIMEOUT = 15.0    # seconds before a cache render is given up on
 
-def speak_text(text):
+# Recent first-audio latencies (ms, queued -> engine started speaking), newest last
+first_audio_ms = deque(maxlen=100)
+
+
+class Utterance:
+    """One queued piece of text and what happened to it"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, text, rate=None, voice=None, on_done=None, trace=None):
+        self.id = next(self._ids)
+        self.name = f"utt-{self.id}"
+        self.text = text
+        self.rate = rate
+        self.voice = voice
+        self.on_done = on_done
+        self.status = "queued"        # queued, speaking, done, skipped, failed
+        self.source = None            # "cache" (WAV replay) or "engine" (live)
+        self.queued_at = time.perf_counter()
+        self.first_audio_ms = None
+        self.trace = trace or tracing.NULL_TRACE
+        self.done = threading.Event()
+
+    def wait(self, timeout=None):
+        return self.done.wait(timeout)
+
+    def _first_audio(self):
+        self.first_audio_ms = (time.perf_counter() - self.queued_at) * 1000
+        first_audio_ms.append(self.first_audio_ms)
+        metrics.record("tts_first_audio", self.first_audio_ms)
+        self.trace.step("first_audio")
+
+    def _finish(self, status):
+        self.status = status
+        if status == "done":
+            self.trace.step("speak")
+        self.trace.finish("ok" if status == "done" else status)
+        self.done.set()
+        if self.on_done:
+            try:
+                self.on_done(self)
+            except Exception as e:
+                print(f"TTS done callback error: {e}")
+
+
+class SpeechWorker:
+    """
+    Owns the TTS engine on its own thread. pyttsx3 engines must be used
+    from the thread that created them, so everything engine-related
+    (init, properties, say, stop) happens in _run; other threads only
+    touch the queue and flags.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, volume=DEFAULT_VOLUME, cache=None, voice=None):
+        self.rate = rate
+        self.volume = volume
+        self.voice = voice            # default pyttsx3 voice id (None: the engine's)
+        self.cache = cache
+        self.pending = deque()
+        self.current = None
+        self.channel = None           # mixer channel of a cached replay
+        self.sound = None
+        self.renders = deque()        # (text, voice, rate) waiting to be cached
+        self.rendering = None
+        self.renders_idle = threading.Event()
+        self.renders_idle.set()
+        self.skip_requested = False
+        self.cond = threading.Condition()
+        self.thread = None
+        self.running = False
+        self.ready = threading.Event()
+        self.init_ms = None
+        self.error = None
+
+    # -----------------------------
+    # PUBLIC API
+    # -----------------------------
+    def start(self):
+        with self.cond:
+            if self.running:
+                return
+            self.running = True
+        self.thread = threading.Thread(target=self._run, name="tts-worker", daemon=True)
+        self.thread.start()
+
+    def say(self, text, rate=None, voice=None, on_done=None, interrupt=False, trace=None):
+        """
+        Queue text. rate/voice apply to this utterance only (voice is a
+        pyttsx3 voice id). on_done(utterance) runs on the worker thread.
+        interrupt=True drops everything queued or playing first.
+        A trace gets "first_audio" and "speak" steps and is finished
+        with the utterance. Returns the Utterance.
+        """
+        utt = Utterance(text, rate, voice or self.voice, on_done, trace)
+        if interrupt:
+            self.interrupt()
+        with self.cond:
+            self.pending.append(utt)
+            self.cond.notify_all()
+        self.start()
+        return utt
+
+    def skip(self):
+        """Stop the utterance being spoken; the queue carries on"""
+        with self.cond:
+            if self.current is not None:
+                self.skip_requested = True
+            self.cond.notify_all()
+
+    def interrupt(self):
+        """Drop the queue and stop the current utterance"""
+        with self.cond:
+            dropped = list(self.pending)
+            self.pending.clear()
+        for utt in dropped:
+            utt._finish("skipped")
+        self.skip()
+
+    def apply_settings(self, values):
+        """New defaults from the settings; used from the next utterance on"""
+        self.rate = values.get("rate", DEFAULT_RATE)
+        self.volume = values.get("volume", DEFAULT_VOLUME)
+        self.voice = values.get("voice")
+
+    def busy(self):
+        with self.cond:
+            return self.current is not None or bool(self.pending)
+
+    def prewarm(self, phrases, voice=None, rate=None):
+        """
+        Render phrases into the cache in the background (only while
+        nothing is being spoken). Returns how many were queued.
+        """
+        if self.cache is None:
+            return 0
+        rate = rate or self.rate
+        voice = voice or self.voice
+        queued = 0
+        with self.cond:
+            for text in phrases:
+                if (text, voice, rate) not in self.cache:
+                    self.renders.append((text, voice, rate))
+                    queued += 1
+            if queued:
+                self.renders_idle.clear()
+            self.cond.notify_all()
+        self.start()
+        return queued
+
+    def wait_renders(self, timeout=None):
+        """Block until every queued cache render has finished"""
+        return self.renders_idle.wait(timeout)
+
+    def voices(self):
+        """[(id, name), ...] once the engine is up"""
+        self.ready.wait(10)
+        return list(getattr(self, "_voices", []))
+
+    def stop(self):
+        self.interrupt()
+        with self.cond:
+            self.running = False
+            self.cond.notify_all()
+
+    # -----------------------------
+    # WORKER THREAD
+    # -----------------------------
+    def _on_start(self, name):
+        utt = self.current
+        if utt is not None and utt.name == name and utt.first_audio_ms is None:
+            utt._first_audio()
+
+    def _on_finish(self, name, completed):
+        render = self.rendering
+        if render is not None and render[3] == name:
+            text, voice, rate, _, tmp_path = render
+            self.rendering = None
+            try:
+                self.cache.put(text, voice, rate, tmp_path)
+            except OSError as e:
+                print(f"TTS cache write failed: {e}")
+            return
+        utt = self.current
+        if utt is not None and utt.name == name:
+            with self.cond:
+                self.current = None
+            utt._finish("done" if completed else "skipped")
+            if completed and self.cache is not None and utt.source == "engine":
+                with self.cond:
+                    self.renders.append((utt.text, utt.voice, utt.rate or self.rate))
+                    self.renders_idle.clear()
+
+    @staticmethod
+    def _mixer():
+        """The app's pygame mixer (initialised here if the GUI has not)"""
+        try:
+            import pygame
+            if not pygame.mixer.get_init():
+                pygame.mixer.init()
+            return pygame.mixer
+        except Exception:
+            return None
+
+    def _play_cached(self, utt):
+        """Start a cached WAV. False if it is not cached or cannot be played."""
+        mixer = self._mixer() if self.cache is not None else None
+        if mixer is None:
+            return False
+        path = self.cache.lookup(utt.text, utt.voice, utt.rate or self.rate)
+        if path is None:
+            return False
+        try:
+            self.sound = mixer.Sound(path)     # keep it alive while it plays
+            self.channel = self.sound.play()
+        except Exception as e:
+            print(f"TTS cache replay failed: {e}")
+            return False
+        utt.source = "cache"
+        utt._first_audio()
+        return True
+
+    def _start_render(self, engine, default_voice):
+        text, voice, rate = self.renders.popleft()
+        if (text, voice, rate) in self.cache:
+            return
+        name = f"render-{next(Utterance._ids)}"
+        tmp_path = self.cache.temp_path(text, voice, rate)
+        self.rendering = (text, voice, rate, name, tmp_path)
+        self.render_started = time.perf_counter()
+        engine.setProperty("rate", rate)
+        engine.setProperty("voice", voice or default_voice)
+        engine.save_to_file(text, tmp_path, name)
+
+    def _run(self):
+        start = time.perf_counter()
+        try:
+            import pyttsx3
+            engine = pyttsx3.init()
+            engine.setProperty("volume", self.volume)
+            self._voices = [(v.id, v.name) for v in engine.getProperty("voices")]
+            default_voice = engine.getProperty("voice")
+            engine.connect("started-utterance", self._on_start)
+            engine.connect("finished-utterance", self._on_finish)
+            engine.startLoop(False)
+        except Exception as e:
+            self.error = e
+            print(f"TTS engine unavailable: {e}")
+            with self.cond:
+                self.running = False
+                failed = list(self.pending)
+                self.pending.clear()
+            for utt in failed:
+                utt._finish("failed")
+            self.ready.set()
+            return
+        self.init_ms = (time.perf_counter() - start) * 1000
+        self.ready.set()
+
+        try:
+            while self.running:
+                with self.cond:
+                    if self.current is None and not self.pending and not self.renders:
+                        self.cond.wait(0.1)
+                    skip, self.skip_requested = self.skip_requested, False
+                    utt = None
+                    if self.current is None and self.rendering is None and self.pending:
+                        utt = self.current = self.pending.popleft()
+
+                if skip and self.channel is not None:
+                    self.channel.stop()
+                elif skip:
+                    skipped = self.current
+                    engine.stop()
+                    engine.iterate()
+                    # Not every driver reports a stopped utterance as finished
+                    if skipped is not None and self.current is skipped:
+                        with self.cond:
+                            self.current = None
+                        skipped._finish("skipped")
+
+                if utt is not None:
+                    utt.status = "speaking"
+                    print(f"🔊 Speaking: {utt.text}")
+                    if not self._play_cached(utt):
+                        utt.source = "engine"
+                        engine.setProperty("rate", utt.rate or self.rate)
+                        engine.setProperty("volume", self.volume)
+                        engine.setProperty("voice", utt.voice or default_voice)
+                        engine.say(utt.text, utt.name)
+
+                # A cached replay ends when its mixer channel goes quiet
+                if self.channel is not None and not self.channel.get_busy():
+                    replayed = self.current
+                    self.channel = self.sound = None
+                    with self.cond:
+                        self.current = None
+                    replayed._finish("skipped" if skip else "done")
+
+                # A driver that never reports the render finished must not
+                # hold up speech
+                if (self.rendering is not None
+                        and time.perf_counter() - self.render_started > RENDER_TIMEOUT):
+                    print(f"TTS cache render timed out: {self.rendering[0]}")
+                    tmp_path = self.rendering[4]
+                    self.rendering = None
+                    try:
+                        os.remove(tmp_path)
+                    except OSError:
+                        pass    # never written, or still held by the driver
+
+                # Fill the cache only while nothing is waiting to be said,
+                # and not while the resource budget has paused prefetching
+                if (self.current is None and self.rendering is None
+                        and not self.pending and self.renders
+                        and resource_scheduler.current_budget().prefetch):
+                    self._start_render(engine, default_voice)
+                if not self.renders and self.rendering is None:
+                    self.renders_idle.set()
+
+                engine.iterate()
+                if self.current is not None or self.rendering is not None:
+                    time.sleep(0.01)
+        finally:
+            engine.endLoop()
+
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def get_worker():
+    """The process-wide TTS worker (engine starts on first use)"""
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            from modules import tts_cache
+            settings = utils.get_settings()
+            _worker = SpeechWorker(cache=tts_cache.get_cache())
+            _worker.apply_settings(settings.section(SETTINGS_KEY))
+            settings.subscribe(SETTINGS_KEY, _worker.apply_settings)
+            _worker.start()
+            metrics.gauge_fn("tts_queue", lambda: len(_worker.pending))
+        return _worker
+
+
+def speak_text(text, wait=True, **kwargs):
     """
-    Offline Text → Speech using pyttsx3  
+    Offline Text → Speech using pyttsx3
     Works on Windows & Raspberry Pi.
+    Queues the text on the shared worker; with wait=True (the old
+    behaviour) blocks until it has been spoken.
     """
     if not text or text.strip() == "":
-        return
+        return None
 
-    print(f"🔊 Speaking: {text}")
-    engine.say(text)
-    engine.runAndWait()
+    utt = get_worker().say(text, **kwargs)
+    if wait:
+        utt.wait()
+    return utt
 
 
 if __name__ == "__main__":
-    speak_text("Text to speech module is working.")
+    utt = speak_text("Text to speech module is working.")
+    print(f"Engine start: {get_worker().init_ms:.0f} ms, "
+          f"first audio: {utt.first_audio_ms or 0:.0f} ms")
@@ -0,0 +1,308 @@
+# modules/tracing.py
+"""
+End-to-end latency traces for one user interaction.
+
+A trace is started when an interaction starts (a chunk of speech, a
+button press, a camera frame) and handed along with the work through
+capture, recognition, lookup, decode and output. Each stage closes a
+span with step(), which runs from the end of the previous step to now:
+
+    trace = tracing.start("speech_to_sign")
+    data = mic.record(4);              trace.step("capture")
+    text = recognize(data);            trace.step("recognize")
+    plan = index.plan(text);           trace.step("lookup")
+    surface.submit(plan, trace=trace)  # "queue", "first_frame", then finish()
+
+Finished traces are queued and appended to output/traces.jsonl by one
+background writer thread, so finish() (often called on the Tk thread)
+never touches the disk. One compact line each:
+
+    {"id": "9f1c2a7b", "p": "speech_to_sign", "t": 1700000000.123,
+     "ms": 4391.2, "st": "ok", "s": [["capture", 0.0, 4002.1], ...]}
+
+where each span is [name, start offset ms, duration ms]. Times are
+wall-clock (time.time()) so spans from the sign child process line up.
+Set BRIDGE_TRACE=0 to turn tracing off, or BRIDGE_TRACE_PATH to write
+somewhere else.
+
+Summary (p50/p95 end to end per pipeline, and the slowest stage):
+    python3 -m modules.tracing
+    python3 -m modules.tracing --file some/traces.jsonl --last 200
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+import argparse
+import threading
+from collections import deque
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from modules import utils
+
+# BRIDGE_TRACE_PATH points the log elsewhere (load tests, scratch runs)
+TRACE_PATH = os.environ.get("BRIDGE_TRACE_PATH") or utils.abs_path("output", "traces.jsonl")
+TRACE_MAX_KB = 1024          # rolled over to traces.jsonl.1 past this
+MAX_PENDING = 1000           # queued traces before the oldest are dropped (disk gone)
+
+_enabled = os.environ.get("BRIDGE_TRACE", "1") != "0"
+
+
+class Trace:
+    """Spans of one interaction through one pipeline"""
+
+    def __init__(self, pipeline, at=None):
+        self.id = os.urandom(4).hex()
+        self.pipeline = pipeline
+        self.start = time.time() if at is None else at
+        self.last = self.start
+        self.spans = []
+        self.status = None
+        self.lock = threading.Lock()
+
+    def step(self, name, at=None):
+        """Close a span from the previous step (or the start) to `at`/now"""
+        now = time.time() if at is None else at
+        with self.lock:
+            if self.status is None:
+                self.spans.append((name, self.last, now))
+                self.last = now
+        return self
+
+    def span(self, name, start, end=None):
+        """Record a span with explicit times (may overlap other spans)"""
+        with self.lock:
+            if self.status is None:
+                self.spans.append((name, start, time.time() if end is None else end))
+        return self
+
+    def finish(self, status="ok"):
+        """End the trace and write it. Later calls are ignored."""
+        with self.lock:
+            if self.status is not None:
+                return
+            self.status = status
+            end = self.last
+        get_writer().put(self.as_record(end))
+
+    @property
+    def finished(self):
+        return self.status is not None
+
+    def as_record(self, end):
+        return {
+            "id": self.id,
+            "p": self.pipeline,
+            "t": round(self.start, 3),
+            "ms": round((end - self.start) * 1000, 1),
+            "st": self.status,
+            "s": [[name, round((s - self.start) * 1000, 1), round((e - s) * 1000, 1)]
+                  for name, s, e in self.spans],
+        }
+
+
+class _NullTrace:
+    """Stand-in when tracing is off: every call is a no-op"""
+
+    id = None
+    pipeline = None
+    finished = True
+
+    def step(self, name, at=None):
+        return self
+
+    def span(self, name, start, end=None):
+        return self
+
+    def finish(self, status="ok"):
+        pass
+
+
+NULL_TRACE = _NullTrace()
+
+
+def start(pipeline, at=None):
+    """Begin a trace (at: time.time() the interaction started, default now)"""
+    if not _enabled:
+        return NULL_TRACE
+    return Trace(pipeline, at)
+
+
+class TraceWriter:
+    """Background appender for finished traces"""
+
+    def __init__(self, path=None, max_kb=TRACE_MAX_KB):
+        self.path = path or TRACE_PATH
+        self.max_bytes = max_kb * 1024
+        self.pending = deque()
+        self.dropped = 0
+        self.cond = threading.Condition()
+        self.running = False
+        self.busy = False
+        self.thread = None
+
+    def start(self):
+        with self.cond:
+            if self.running:
+                return self
+            self.running = True
+        self.thread = threading.Thread(target=self._run, name="trace-writer", daemon=True)
+        self.thread.start()
+        return self
+
+    def put(self, record):
+        """Queue one record (never blocks on I/O)"""
+        with self.cond:
+            if len(self.pending) >= MAX_PENDING:
+                self.pending.popleft()
+                self.dropped += 1
+            self.pending.append(record)
+            self.cond.notify_all()
+
+    def flush(self, timeout=5.0):
+        """Block until everything queued so far is written"""
+        with self.cond:
+            return self.cond.wait_for(lambda: not (self.pending or self.busy) or not self.running,
+                                      timeout)
+
+    def close(self):
+        self.flush()
+        with self.cond:
+            self.running = False
+            self.cond.notify_all()
+        if self.thread is not None:
+            self.thread.join(timeout=2)
+
+    def _write(self, records):
+        data = "".join(json.dumps(r, separators=(",", ":")) + "\n" for r in records)
+        try:
+            utils.ensure_dir(os.path.dirname(self.path))
+            try:
+                if os.path.getsize(self.path) > self.max_bytes:
+                    os.replace(self.path, self.path + ".1")
+            except OSError:
+                pass
+            with open(self.path, "a") as f:
+                f.write(data)
+        except OSError as e:
+            print(f"Trace write warning: {e}")
+
+    def _run(self):
+        while True:
+            with self.cond:
+                self.cond.wait_for(lambda: self.pending or not self.running)
+                batch = list(self.pending)
+                self.pending.clear()
+                self.busy = bool(batch)
+                running = self.running
+            if batch:
+                self._write(batch)
+            with self.cond:
+                self.busy = False
+                self.cond.notify_all()      # wake flush()
+            if not running:
+                break
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_writer():
+    """The process-wide trace writer (starts on first use)"""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = TraceWriter().start()
+            atexit.register(_writer.close)
+        return _writer
+
+
+# -----------------------------
+# SUMMARY
+# -----------------------------
+def load(path=TRACE_PATH, last=None):
+    """Trace records from a file (and its rolled-over predecessor)"""
+    records = []
+    for name in (path + ".1", path):
+        try:
+            with open(name) as f:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        pass    # torn last line after a power cut
+        except OSError:
+            pass
+    return records[-last:] if last else records
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    k = (len(ordered) - 1) * pct / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def summarize(records):
+    """
+    {pipeline: {count, failed, p50_ms, p95_ms, stages: {name: {p50_ms,
+    p95_ms}}, slowest_stage}} over completed ("ok") traces. The slowest
+    stage is the one with the largest median.
+    """
+    by_pipeline = {}
+    for rec in records:
+        by_pipeline.setdefault(rec["p"], []).append(rec)
+
+    summary = {}
+    for pipeline, recs in sorted(by_pipeline.items()):
+        ok = [r for r in recs if r.get("st") == "ok"]
+        stages = {}
+        for rec in ok:
+            for name, _, dur in rec["s"]:
+                stages.setdefault(name, []).append(dur)
+        stage_stats = {name: {"p50_ms": round(_percentile(d, 50), 1),
+                              "p95_ms": round(_percentile(d, 95), 1)}
+                       for name, d in stages.items()}
+        totals = [r["ms"] for r in ok]
+        summary[pipeline] = {
+            "count": len(ok),
+            "failed": len(recs) - len(ok),
+            "p50_ms": round(_percentile(totals, 50), 1),
+            "p95_ms": round(_percentile(totals, 95), 1),
+            "stages": stage_stats,
+            "slowest_stage": max(stage_stats, key=lambda n: stage_stats[n]["p50_ms"])
+                             if stage_stats else None,
+        }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end latency per pipeline")
+    parser.add_argument("--file", default=TRACE_PATH)
+    parser.add_argument("--last", type=int, help="only the newest N traces")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args()
+
+    summary = summarize(load(args.file, args.last))
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+    if not summary:
+        print(f"No traces in {args.file}")
+        return
+    for pipeline, s in summary.items():
+        print(f"{pipeline}: {s['count']} traces ({s['failed']} not completed)  "
+              f"p50 {s['p50_ms']:.0f} ms  p95 {s['p95_ms']:.0f} ms  "
+              f"slowest stage: {s['slowest_stage']}")
+        for name, st in s["stages"].items():
+            print(f"    {name:12s} p50 {st['p50_ms']:8.1f} ms   p95 {st['p95_ms']:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+# modules/tts_cache.py
+"""
+On-disk cache of synthesized speech.
+
+Each utterance is rendered once to TTS_Cache/<key>.wav, keyed by the
+normalized text, voice and rate, and replayed on later requests
+through pygame.mixer instead of being synthesized again. Recency is
+the file's mtime (touched on every hit), so the LRU order survives
+restarts without an index file. The least recently used files are
+deleted when the cache grows past its quota.
+
+Pre-warm with the ISL phrase vocabulary, or inspect / clear:
+    python3 -m modules.tts_cache prewarm
+    python3 -m modules.tts_cache stats
+    python3 -m modules.tts_cache clear
+"""
+
+import os
+import sys
+import hashlib
+import argparse
+import threading
+from collections import OrderedDict
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from modules import utils
+
+CACHE_DIR = utils.abs_path("TTS_Cache")
+QUOTA_MB = 64
+
+
+def normalize(text):
+    """Cache key text: case and spacing do not change what is said"""
+    return " ".join(text.lower().split())
+
+
+class TTSCache:
+    """LRU of rendered WAV files under a disk quota"""
+
+    def __init__(self, cache_dir=CACHE_DIR, quota_bytes=QUOTA_MB * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.quota_bytes = quota_bytes
+        self.files = OrderedDict()    # key -> size, oldest first
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+        self._scan()
+
+    def _scan(self):
+        utils.ensure_dir(self.cache_dir)
+        entries = []
+        for fname in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, fname)
+            if fname.endswith(".wav.tmp"):
+                # A render abandoned by a crash or timeout
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                continue
+            if not fname.endswith(".wav"):
+                continue
+            st = os.stat(path)
+            entries.append((st.st_mtime, fname[:-4], st.st_size))
+        for _, key, size in sorted(entries):
+            self.files[key] = size
+            self.bytes += size
+
+    @staticmethod
+    def key(text, voice=None, rate=None):
+        raw = f"{normalize(text)}|{voice or ''}|{rate or ''}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def path_for(self, key):
+        return os.path.join(self.cache_dir, key + ".wav")
+
+    def lookup(self, text, voice=None, rate=None):
+        """Path of the cached WAV, or None. A hit becomes most recent."""
+        key = self.key(text, voice, rate)
+        with self.lock:
+            if key not in self.files:
+                self.misses += 1
+                return None
+            path = self.path_for(key)
+            try:
+                os.utime(path)
+            except OSError:
+                # Deleted behind our back
+                self.bytes -= self.files.pop(key)
+                self.misses += 1
+                return None
+            self.files.move_to_end(key)
+            self.hits += 1
+            return path
+
+    def __contains__(self, item):
+        text, voice, rate = item
+        with self.lock:
+            return self.key(text, voice, rate) in self.files
+
+    def temp_path(self, text, voice=None, rate=None):
+        """Where to render a new entry before put() moves it into place"""
+        return self.path_for(self.key(text, voice, rate)) + ".tmp"
+
+    def put(self, text, voice, rate, rendered_path):
+        """
+        Adopt a freshly rendered WAV, then evict least recently used
+        entries until the cache fits its quota. Empty or oversized
+        renders are discarded.
+        """
+        key = self.key(text, voice, rate)
+        size = os.path.getsize(rendered_path) if os.path.exists(rendered_path) else 0
+        if size == 0 or size > self.quota_bytes:
+            if os.path.exists(rendered_path):
+                os.remove(rendered_path)
+            return None
+        path = self.path_for(key)
+        os.replace(rendered_path, path)
+        with self.lock:
+            self.bytes -= self.files.pop(key, 0)
+            self.files[key] = size
+            self.bytes += size
+            while self.bytes > self.quota_bytes and len(self.files) > 1:
+                old, old_size = self.files.popitem(last=False)
+                self.bytes -= old_size
+                self.evictions += 1
+                try:
+                    os.remove(self.path_for(old))
+                except OSError:
+                    pass
+        return path
+
+    def clear(self):
+        with self.lock:
+            for key in self.files:
+                try:
+                    os.remove(self.path_for(key))
+                except OSError:
+                    pass
+            self.files.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self.lock:
+            return {
+                "entries": len(self.files),
+                "bytes": self.bytes,
+                "quota_bytes": self.quota_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """Shared speech cache"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = TTSCache()
+        return _cache
+
+
+def vocabulary():
+    """
+    Phrases worth pre-rendering: the ISL phrase list as it is written,
+    not the normalized file-name keys ("tomorrow", not "tommorow")
+    """
+    from modules import phrase_index
+    return phrase_index.get_index().texts()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthesized speech cache")
+    parser.add_argument("command", choices=["prewarm", "stats", "clear"])
+    parser.add_argument("--phrases", help="text file, one phrase per line "
+                                          "(default: the ISL phrase vocabulary)")
+    args = parser.parse_args()
+
+    cache = get_cache()
+    if args.command == "clear":
+        cache.clear()
+    elif args.command == "prewarm":
+        from modules import text_to_speech
+        if args.phrases:
+            with open(args.phrases) as f:
+                phrases = [line.strip() for line in f if line.strip()]
+        else:
+            phrases = vocabulary()
+        worker = text_to_speech.get_worker()
+        queued = worker.prewarm(phrases)
+        print(f"Rendering {queued} of {len(phrases)} phrases...")
+        worker.wait_renders()
+    stats = cache.stats()
+    print(f"{stats['entries']} entries, {stats['bytes'] / 1e6:.1f} MB "
+          f"of {stats['quota_bytes'] / 1e6:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,8 @@
 import os
 import json
+import atexit
+import tempfile
+import threading
 
 # Get project base directory dynamically
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))
@@ -16,21 +19,44 @@ def abs_path(*paths):
 def load_json(path):
     """
     Safely load JSON file and return content as dict.
-    Returns {} if file missing or corrupted.
+    Returns {} if file missing, empty or corrupted.
     """
     try:
         with open(path, "r") as f:
             return json.load(f)
-    except:
+    except (OSError, ValueError):
         return {}
 
 
 def save_json(path, data):
     """
-    Safely save a dictionary to JSON file.
+    Save a dictionary to JSON file atomically: the data is written to a
+    temp file next to it, fsynced and renamed over the old file, so a
+    power cut leaves either the old or the new version, never half.
     """
-    with open(path, "w") as f:
-        json.dump(data, f, indent=4)
+    folder = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=folder)
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    try:
+        # Make the rename itself durable
+        dir_fd = os.open(folder, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    except OSError:
+        pass
 
 
 def ensure_dir(path):
@@ -39,3 +65,172 @@ def ensure_dir(path):
     """
     if not os.path.exists(path):
         os.makedirs(path)
+
+
+# -----------------------------
+# SETTINGS STORE
+# -----------------------------
+SETTINGS_PATH = abs_path("USER_PROFILE.json")
+WRITE_DELAY = 1.0        # seconds a change waits for others before the file is written
+
+
+class Settings:
+    """
+    Sections of a JSON settings file (USER_PROFILE.json), kept parsed in
+    memory:
+
+        settings = utils.get_settings()
+        fps = settings.get("camera", "fps", 15)
+        settings.set("braille", port="/dev/ttyACM0")
+        settings.subscribe("tts", lambda values: ...)
+
+    Reads are served from the cache, which is reloaded when the file's
+    mtime or size changes (someone edited it). Changes are written
+    atomically (save_json) after WRITE_DELAY seconds, so a burst of
+    set() calls costs one write. Subscribers get the section's new
+    values (a dict) whenever it changes, from set() or from an edit
+    on disk; they run on the thread that noticed the change.
+
+    A corrupt file is reported and left alone: the last good values
+    stay in use and it is only replaced on the next set().
+    """
+
+    def __init__(self, path=SETTINGS_PATH, delay=WRITE_DELAY):
+        self.path = path
+        self.delay = delay
+        self.data = {}
+        self.stamp = None        # (mtime_ns, size) of the file last read or written
+        self.dirty = set()       # sections changed since the last write
+        self.timer = None
+        self.subscribers = {}    # section -> [callback]
+        self.lock = threading.RLock()
+        self._reload()
+
+    # -----------------------------
+    # READING
+    # -----------------------------
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def _reload(self):
+        """Re-read the file if it changed on disk. Returns changed sections."""
+        stamp = self._stat()
+        if stamp == self.stamp:
+            return set()
+        self.stamp = stamp
+        if stamp is None or stamp[1] == 0:
+            fresh = {}
+        else:
+            try:
+                with open(self.path, "r") as f:
+                    fresh = json.load(f)
+                if not isinstance(fresh, dict):
+                    raise ValueError("top level is not an object")
+            except (OSError, ValueError) as e:
+                print(f"Settings warning: {self.path} unreadable ({e}), keeping last values")
+                return set()
+        # Changes not written yet win over the file
+        for section in self.dirty:
+            if section in self.data:
+                fresh[section] = self.data[section]
+        changed = {name for name in set(fresh) | set(self.data)
+                   if fresh.get(name) != self.data.get(name)}
+        self.data = fresh
+        return changed
+
+    def check(self):
+        """Pick up edits made to the file by someone else"""
+        with self.lock:
+            changed = self._reload()
+        self._notify(changed)
+
+    def section(self, name):
+        """A copy of one section ({} if it is missing)"""
+        self.check()
+        with self.lock:
+            values = self.data.get(name)
+            return dict(values) if isinstance(values, dict) else {}
+
+    def get(self, section, key, default=None):
+        """One value of a section"""
+        return self.section(section).get(key, default)
+
+    # -----------------------------
+    # WRITING
+    # -----------------------------
+    def set(self, section, **values):
+        """Update keys of a section; the file is written shortly after"""
+        self.check()
+        with self.lock:
+            current = self.data.get(section)
+            current = dict(current) if isinstance(current, dict) else {}
+            updated = dict(current, **values)
+            if updated == current:
+                return
+            self.data[section] = updated
+            self.dirty.add(section)
+            if self.timer is None:
+                self.timer = threading.Timer(self.delay, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+        self._notify({section})
+
+    def flush(self):
+        """Write pending changes now"""
+        with self.lock:
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+            if not self.dirty:
+                return
+            try:
+                ensure_dir(os.path.dirname(os.path.abspath(self.path)))
+                save_json(self.path, self.data)
+            except OSError as e:
+                print(f"Settings write failed: {e}")
+                return
+            self.dirty.clear()
+            self.stamp = self._stat()
+
+    # -----------------------------
+    # SUBSCRIPTIONS
+    # -----------------------------
+    def subscribe(self, section, callback):
+        """callback(values) whenever the section changes"""
+        with self.lock:
+            self.subscribers.setdefault(section, []).append(callback)
+
+    def unsubscribe(self, section, callback):
+        with self.lock:
+            callbacks = self.subscribers.get(section, [])
+            self.subscribers[section] = [c for c in callbacks if c != callback]
+
+    def _notify(self, sections):
+        for section in sections:
+            with self.lock:
+                callbacks = list(self.subscribers.get(section, []))
+                values = self.data.get(section)
+            values = dict(values) if isinstance(values, dict) else {}
+            for callback in callbacks:
+                try:
+                    callback(values)
+                except Exception as e:
+                    print(f"Settings callback error ({section}): {e}")
+
+
+_settings = None
+_settings_lock = threading.Lock()
+
+
+def get_settings():
+    """The process-wide settings store (USER_PROFILE.json)"""
+    global _settings
+    with _settings_lock:
+        if _settings is None:
+            _settings = Settings()
+            atexit.register(_settings.flush)
+        return _settings
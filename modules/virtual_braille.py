@@ -0,0 +1,219 @@
+# modules/virtual_braille.py
+"""
+Software stand-in for the Arduino braille cell, on a pseudo-terminal.
+
+It behaves like the firmware as far as the Pi can tell:
+  - after a (re)plug it ignores input for `reset_delay` seconds while
+    the "bootloader" runs
+  - incoming cell bytes go into a 64-byte serial buffer (extra bytes
+    are dropped, as on the real board)
+  - each cell is raised for `cell_ms`, then it waits for the advance
+    button and answers with one ACK byte (0x06)
+  - "\\n" ends a message
+
+The button is pressed automatically after `read_ms` (a number, or a
+callable taking the cell index, to script reading speed), or by hand
+with press() when auto_advance is off. unplug()/replug() simulate a
+cable pull.
+
+The device is reached through a stable symlink (`port`), so the braille
+module opens it exactly like /dev/ttyACM0:
+
+    dev = VirtualBrailleDevice(reset_delay=0.1).start()
+    BRIDGE_BRAILLE_PORT=<dev.port>    # or BrailleDevice(port=dev.port)
+
+Run standalone (prints cells as Unicode braille):
+    python3 -m modules.virtual_braille --read-ms 300
+"""
+
+import os
+import sys
+import pty
+import tty
+import time
+import select
+import tempfile
+import argparse
+import threading
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from modules.braille_translate import CELL_FLAG, to_unicode
+
+ACK = b"\x06"
+SERIAL_BUFFER = 64
+
+
+class VirtualBrailleDevice:
+    """Emulated braille firmware behind a pty"""
+
+    def __init__(self, reset_delay=2.0, cell_ms=30, read_ms=0, auto_advance=True,
+                 protocol="binary", port=None, verbose=False):
+        self.reset_delay = reset_delay
+        self.cell_ms = cell_ms
+        self.read_ms = read_ms
+        self.auto_advance = auto_advance
+        self.protocol = protocol
+        self.port = port or os.path.join(tempfile.gettempdir(),
+                                         f"bridge-braille-{os.getpid()}-{id(self):x}")
+        self.verbose = verbose
+
+        self.master = None
+        self.slave = None
+        self.buffer = bytearray()
+        self.shown = []          # (timestamp, cell) for every cell displayed
+        self.messages = []       # completed messages, as lists of cells
+        self.current = []
+        self.overflows = 0
+        self.plugs = 0
+        self.ready_at = 0.0
+        self.button = threading.Event()
+        self.lock = threading.Lock()
+        self.running = False
+        self.thread = None
+
+    # -----------------------------
+    # CONTROL
+    # -----------------------------
+    def start(self):
+        self.running = True
+        self.replug()
+        self.thread = threading.Thread(target=self._run, name="virtual-braille", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join(timeout=2)
+        self.unplug()
+        if os.path.islink(self.port):
+            os.unlink(self.port)
+
+    def unplug(self):
+        """Pull the cable: the port disappears and open handles fail"""
+        with self.lock:
+            for fd in (self.master, self.slave):
+                if fd is not None:
+                    os.close(fd)
+            self.master = self.slave = None
+            self.buffer.clear()
+            self.current = []
+
+    def replug(self):
+        """Plug back in (or power on): a fresh pty behind the same path, then a reset"""
+        self.unplug()
+        with self.lock:
+            self.master, self.slave = pty.openpty()
+            tty.setraw(self.master)
+            tty.setraw(self.slave)
+            tmp = self.port + ".new"
+            if os.path.lexists(tmp):
+                os.unlink(tmp)
+            os.symlink(os.ttyname(self.slave), tmp)
+            os.replace(tmp, self.port)
+            self.plugs += 1
+            self.ready_at = time.monotonic() + self.reset_delay
+
+    def press(self):
+        """Press the advance button once"""
+        self.button.set()
+
+    # -----------------------------
+    # FIRMWARE LOOP
+    # -----------------------------
+    def _is_cell(self, b):
+        if self.protocol == "binary":
+            return b & 0xC0 == CELL_FLAG
+        return b != 0x0A and b != 0x0D
+
+    def _read_ms(self):
+        if callable(self.read_ms):
+            return self.read_ms(len(self.shown))
+        return self.read_ms
+
+    def _receive(self, timeout):
+        master = self.master
+        if master is None:
+            time.sleep(timeout)
+            return
+        try:
+            ready, _, _ = select.select([master], [], [], timeout)
+            if not ready:
+                return
+            data = os.read(master, 256)
+        except OSError:
+            time.sleep(timeout)    # unplugged mid-read, or nobody has the port open
+            return
+        if time.monotonic() < self.ready_at:
+            return                  # still in the bootloader
+        for b in data:
+            if len(self.buffer) >= SERIAL_BUFFER:
+                self.overflows += 1
+            else:
+                self.buffer.append(b)
+
+    def _run(self):
+        while self.running:
+            if not self.buffer:
+                self._receive(0.05)
+                continue
+
+            b = self.buffer.pop(0)
+            if b == 0x0A:
+                self.messages.append(self.current)
+                self.current = []
+                if self.verbose:
+                    print()
+                continue
+            if not self._is_cell(b):
+                continue
+
+            cell = b & 0x3F if self.protocol == "binary" else b
+            time.sleep(self.cell_ms / 1000.0)          # solenoids settle
+            self.shown.append((time.monotonic(), cell))
+            self.current.append(cell)
+            if self.verbose:
+                print(to_unicode([cell]) if self.protocol == "binary" else chr(cell),
+                      end="", flush=True)
+
+            # Wait for the reader, still taking bytes into the buffer
+            if self.auto_advance:
+                deadline = time.monotonic() + self._read_ms() / 1000.0
+                while self.running and time.monotonic() < deadline:
+                    self._receive(min(0.05, max(0.0, deadline - time.monotonic())))
+            else:
+                while self.running and not self.button.is_set():
+                    self._receive(0.05)
+                self.button.clear()
+
+            with self.lock:
+                if self.master is not None:
+                    try:
+                        os.write(self.master, ACK)
+                    except OSError:
+                        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Virtual braille cell on a pty")
+    parser.add_argument("--reset-delay", type=float, default=2.0)
+    parser.add_argument("--cell-ms", type=float, default=30)
+    parser.add_argument("--read-ms", type=float, default=300)
+    parser.add_argument("--protocol", choices=["binary", "text"], default="binary")
+    args = parser.parse_args()
+
+    dev = VirtualBrailleDevice(args.reset_delay, args.cell_ms, args.read_ms,
+                               protocol=args.protocol, verbose=True).start()
+    print(f"Virtual braille cell on {dev.port}")
+    print(f"Run the GUI with BRIDGE_BRAILLE_PORT={dev.port}  (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        dev.stop()
+
+
+if __name__ == "__main__":
+    main()